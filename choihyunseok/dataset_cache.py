@@ -0,0 +1,341 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import cv2
+import numpy as np
+import yaml
+
+# 학습 데이터 전처리 캐시 (Preprocess Once, Stream Many)
+#
+# train.py는 매 epoch마다 JPEG 디코딩 + 리사이즈를 다시 수행합니다.
+# CPU 학습 환경에서는 이 부분이 epoch 시간의 대부분을 차지하므로,
+# custom_data.yaml의 train/val 이미지를 한 번만 디코딩해서
+# uint8 memmap 파일(images.u8)에 고정 크기 슬롯으로 저장해 둡니다.
+#
+#   <dataset path>/.cache_store/<split>/
+#       images.u8      : (N, imgsz, imgsz, 3) uint8, 남는 영역은 회색(114) 패딩
+#       arrays.npz     : shapes / labels / segments (압축 배열)
+#       manifest.json  : 콘텐츠 해시 + 메타 정보 (해시가 다르면 다시 생성)
+#
+# 슬롯 안에는 "긴 변을 imgsz로 맞춘" 이미지가 좌상단에 들어가고, 나머지는 패딩입니다.
+# (2..txt에서 설명한 레터박스의 '비율 유지 축소' 단계까지를 미리 해두는 것)
+# 실제 레터박스/증강은 기존처럼 ultralytics 변환 파이프라인이 수행합니다.
+
+IMG_FORMATS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+PAD_VALUE = 114  # ultralytics 레터박스와 같은 회색
+STORE_VERSION = 2  # 2: 박스 전용 라벨을 폴리곤으로 바꾸지 않음
+
+
+# 1. custom_data.yaml 에서 split별 이미지 목록 찾기
+def resolve_split_images(data_yaml: str, split: str) -> list[str]:
+    with open(data_yaml, "r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f)
+
+    root = Path(cfg.get("path") or ".")
+    if not root.is_absolute():
+        root = (Path(data_yaml).parent / root).resolve()
+
+    split_dir = root / cfg[split]
+    files = [str(p) for p in sorted(split_dir.rglob("*")) if p.suffix.lower() in IMG_FORMATS]
+    return files
+
+
+def label_path_for(img_path: str) -> str:
+    # ultralytics 규칙: .../images/... -> .../labels/...txt
+    sa, sb = f"{os.sep}images{os.sep}", f"{os.sep}labels{os.sep}"
+    return sb.join(img_path.rsplit(sa, 1)).rsplit(".", 1)[0] + ".txt"
+
+
+def store_dir_for(data_yaml: str, split: str) -> Path:
+    with open(data_yaml, "r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f)
+    root = Path(cfg.get("path") or ".")
+    if not root.is_absolute():
+        root = (Path(data_yaml).parent / root).resolve()
+    return root / ".cache_store" / split
+
+
+# 2. 콘텐츠 해시 (이미지/라벨 파일의 실제 바이트 기준)
+def content_hash(img_files: list[str], imgsz: int) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"v{STORE_VERSION}|imgsz={imgsz}".encode())
+    for img in img_files:
+        for path in (img, label_path_for(img)):
+            h.update(path.encode("utf-8"))
+            if not os.path.exists(path):
+                h.update(b"<missing>")
+                continue
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+    return h.hexdigest()
+
+
+# 3. 이미지 1장 디코딩 + 긴 변 리사이즈
+def load_resized(path: str, imgsz: int):
+    im = cv2.imread(path)  # BGR
+    if im is None:
+        raise FileNotFoundError(f"Image Not Found {path}")
+    h0, w0 = im.shape[:2]
+    r = imgsz / max(h0, w0)
+    if r != 1:
+        w, h = min(round(w0 * r), imgsz), min(round(h0 * r), imgsz)
+        im = cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR)
+    return im, (h0, w0)
+
+
+def read_label_file(path: str):
+    # 세그멘테이션 라벨: "cls x1 y1 x2 y2 ..." / 박스 라벨: "cls cx cy w h" (정규화 좌표)
+    # ultralytics(verify_image_label)와 같은 규칙: 한 줄이라도 폴리곤이면 모든 줄을 폴리곤으로,
+    # 아니면 박스만 있는 파일로 보고 폴리곤은 비워 둠 (사각형 폴리곤을 만들어 내지 않음)
+    classes, boxes, polys = [], [], []
+    if not os.path.exists(path):
+        return classes, boxes, polys
+    with open(path, "r", encoding="utf-8") as f:
+        rows = [line.split() for line in f]
+    rows = [parts for parts in rows if len(parts) >= 5]
+    is_segment = any(len(parts) > 5 for parts in rows)
+    for parts in rows:
+        cls = int(float(parts[0]))
+        coords = np.asarray(parts[1:], dtype=np.float32)
+        if is_segment:
+            pts = coords.reshape(-1, 2)
+            x1, y1 = pts.min(0)
+            x2, y2 = pts.max(0)
+            box = [(x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1]
+        else:
+            box = coords.tolist()
+            pts = np.zeros((0, 2), dtype=np.float32)
+        classes.append(cls)
+        boxes.append(box)
+        polys.append(pts)
+    return classes, boxes, polys
+
+
+# 4. 캐시 스토어 생성
+def build_store(data_yaml: str, split: str, imgsz: int = 640, workers: int = 8, force: bool = False) -> Path:
+    img_files = resolve_split_images(data_yaml, split)
+    if not img_files:
+        raise FileNotFoundError(f"{split} 이미지가 없습니다: {data_yaml}")
+
+    out = store_dir_for(data_yaml, split)
+    digest = content_hash(img_files, imgsz)
+    manifest_path = out / "manifest.json"
+
+    if not force and manifest_path.exists():
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("hash") == digest:
+            print(f"✅ [{split}] 캐시 재사용: {out} ({manifest['count']}장)")
+            return out
+        print(f"♻️ [{split}] 데이터가 변경되어 캐시를 다시 만듭니다.")
+
+    out.mkdir(parents=True, exist_ok=True)
+    n = len(img_files)
+    t0 = time.time()
+
+    # 이미지 memmap (임시 파일에 쓰고 완료 후 교체 -> 중간에 죽어도 깨진 캐시가 남지 않음)
+    tmp_images = out / "images.u8.tmp"
+    images = np.lib.format.open_memmap(tmp_images, mode="w+", dtype=np.uint8, shape=(n, imgsz, imgsz, 3))
+    shapes = np.zeros((n, 4), dtype=np.int32)  # h0, w0, h, w
+
+    def _work(i):
+        im, (h0, w0) = load_resized(img_files[i], imgsz)
+        h, w = im.shape[:2]
+        slot = images[i]
+        slot[:h, :w] = im
+        slot[h:, :] = PAD_VALUE
+        slot[:h, w:] = PAD_VALUE
+        shapes[i] = (h0, w0, h, w)
+
+    # cv2 디코딩은 GIL을 풀기 때문에 스레드 풀로 충분히 병렬화됩니다.
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(_work, range(n)))
+    images.flush()
+    del images
+
+    # 라벨/폴리곤을 이미지별 오프셋이 있는 연속 배열로 저장
+    lbl_off = np.zeros(n + 1, dtype=np.int64)
+    cls_all, box_all, seg_off, seg_pts = [], [], [0], []
+    for i, img in enumerate(img_files):
+        classes, boxes, polys = read_label_file(label_path_for(img))
+        cls_all.extend(classes)
+        box_all.extend(boxes)
+        for pts in polys:
+            seg_pts.append(pts)
+            seg_off.append(seg_off[-1] + len(pts))
+        lbl_off[i + 1] = lbl_off[i] + len(classes)
+
+    tmp_arrays = out / "arrays.tmp.npz"
+    np.savez_compressed(
+        tmp_arrays,
+        files=np.array(img_files),
+        shapes=shapes,
+        lbl_off=lbl_off,
+        cls=np.asarray(cls_all, dtype=np.int16),
+        boxes=np.asarray(box_all, dtype=np.float32).reshape(-1, 4),
+        seg_off=np.asarray(seg_off, dtype=np.int64),
+        seg_pts=np.concatenate(seg_pts).astype(np.float32) if seg_pts else np.zeros((0, 2), np.float32),
+    )
+
+    os.replace(tmp_images, out / "images.u8")
+    os.replace(tmp_arrays, out / "arrays.npz")
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"hash": digest, "count": n, "imgsz": imgsz, "version": STORE_VERSION}, f)
+
+    print(f"✅ [{split}] 캐시 생성 완료: {n}장 / {time.time() - t0:.1f}s -> {out}")
+    return out
+
+
+# 5. 캐시 스토어 읽기 (워커 프로세스마다 memmap을 지연 오픈)
+class CacheStore:
+    def __init__(self, store_dir):
+        self.store_dir = Path(store_dir)
+        arrays = np.load(self.store_dir / "arrays.npz")
+        self.files = [str(f) for f in arrays["files"]]
+        self.shapes = arrays["shapes"]
+        self.lbl_off = arrays["lbl_off"]
+        self.cls = arrays["cls"]
+        self.boxes = arrays["boxes"]
+        self.seg_off = arrays["seg_off"]
+        self.seg_pts = arrays["seg_pts"]
+        self._images = None
+
+    def __getstate__(self):
+        # DataLoader 워커로 넘길 때 memmap 핸들은 넘기지 않음 (fork/spawn 안전)
+        state = self.__dict__.copy()
+        state["_images"] = None
+        return state
+
+    @property
+    def images(self):
+        if self._images is None:
+            self._images = np.load(self.store_dir / "images.u8", mmap_mode="r")
+        return self._images
+
+    def __len__(self):
+        return len(self.files)
+
+    def image(self, i: int):
+        h0, w0, h, w = self.shapes[i]
+        # memmap 슬라이스 -> 연속 배열로 복사 (증강 단계에서 in-place 수정됨)
+        return np.ascontiguousarray(self.images[i, :h, :w]), (int(h0), int(w0)), (int(h), int(w))
+
+    def label(self, i: int) -> dict:
+        a, b = self.lbl_off[i], self.lbl_off[i + 1]
+        h0, w0 = self.shapes[i][:2]
+        segments = [self.seg_pts[self.seg_off[j]:self.seg_off[j + 1]] for j in range(a, b)]
+        if not any(len(seg) for seg in segments):
+            segments = []  # 박스 라벨만 있는 이미지
+        return {
+            "im_file": self.files[i],
+            "shape": (int(h0), int(w0)),
+            "cls": self.cls[a:b].astype(np.float32).reshape(-1, 1),
+            "bboxes": self.boxes[a:b].copy(),
+            "segments": segments,
+            "keypoints": None,
+            "normalized": True,
+            "bbox_format": "xywh",
+        }
+
+
+# 6. ultralytics 연동: 디코딩 대신 캐시에서 읽는 Dataset / Trainer
+def make_cached_trainer(data_yaml: str, imgsz: int = 640):
+    from ultralytics.data.dataset import YOLODataset
+    from ultralytics.models.yolo.segment import SegmentationTrainer
+
+    class CachedYOLODataset(YOLODataset):
+        def __init__(self, *args, store_dir=None, **kwargs):
+            self.store = CacheStore(store_dir)
+            super().__init__(*args, **kwargs)
+
+        def get_img_files(self, img_path):
+            return list(self.store.files)
+
+        def get_labels(self):
+            # 라벨 txt 스캔 / .cache 생성 대신 압축 배열에서 바로 구성
+            return [self.store.label(i) for i in range(len(self.store))]
+
+        def load_image(self, i, rect_mode=True):
+            # 캐시는 "긴 변을 imgsz로 맞춘" 이미지만 들고 있음
+            # 정사각형으로 늘리는 경로(rect_mode=False)나 다른 imgsz 는 원본에서 다시 디코딩
+            h, w = self.store.shapes[i][2:]
+            if not rect_mode or max(h, w) != self.imgsz:
+                return super().load_image(i, rect_mode)
+            im, hw0, hw = self.store.image(i)
+            if self.augment:
+                # 모자이크 증강이 참조하는 버퍼 유지 (이미지는 memmap이 들고 있으므로 인덱스만)
+                self.buffer.append(i)
+                if len(self.buffer) >= self.max_buffer_length:
+                    self.buffer.pop(0)
+            return im, hw0, hw
+
+    class CachedSegmentationTrainer(SegmentationTrainer):
+        def build_dataset(self, img_path, mode="train", batch=None):
+            split = "train" if mode == "train" else "val"
+            store_dir = build_store(data_yaml, split, imgsz=imgsz, workers=self.args.workers)
+            gs = max(int(self.model.stride.max() if self.model else 0), 32)
+            return CachedYOLODataset(
+                store_dir=store_dir,
+                img_path=img_path,
+                imgsz=self.args.imgsz,
+                batch_size=batch,
+                augment=mode == "train",
+                hyp=self.args,
+                rect=self.args.rect or mode == "val",
+                cache=None,
+                single_cls=self.args.single_cls or False,
+                stride=gs,
+                pad=0.0 if mode == "train" else 0.5,
+                prefix=f"{mode}: ",
+                task=self.args.task,
+                classes=self.args.classes,
+                data=self.data,
+                fraction=self.args.fraction if mode == "train" else 1.0,
+            )
+
+    return CachedSegmentationTrainer
+
+
+# 7. 간단 벤치마크: JPEG 디코딩+리사이즈 vs memmap 읽기 (1 epoch 분량 I/O)
+def benchmark(data_yaml: str, split: str = "train", imgsz: int = 640, limit: int = 5000):
+    img_files = resolve_split_images(data_yaml, split)[:limit]
+    store = CacheStore(build_store(data_yaml, split, imgsz=imgsz))
+
+    t0 = time.perf_counter()
+    for path in img_files:
+        load_resized(path, imgsz)
+    t_jpeg = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for i in range(min(limit, len(store))):
+        store.image(i)
+    t_cache = time.perf_counter() - t0
+
+    n = len(img_files)
+    print(f"📊 [{split}] {n}장 기준")
+    print(f"   - JPEG 디코딩+리사이즈 : {t_jpeg:.2f}s ({n / t_jpeg:.0f} img/s)")
+    print(f"   - memmap 캐시 읽기     : {t_cache:.2f}s ({n / t_cache:.0f} img/s)")
+    print(f"   - 속도 향상           : x{t_jpeg / max(t_cache, 1e-9):.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="custom_data.yaml 이미지를 memmap 캐시로 전처리합니다.")
+    parser.add_argument("--data", default="custom_data.yaml")
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--force", action="store_true", help="해시와 관계없이 다시 생성")
+    parser.add_argument("--bench", action="store_true", help="디코딩 vs 캐시 읽기 속도 비교")
+    parser.add_argument("--limit", type=int, default=5000)
+    args = parser.parse_args()
+
+    for split in ("train", "val"):
+        build_store(args.data, split, imgsz=args.imgsz, workers=args.workers, force=args.force)
+
+    if args.bench:
+        benchmark(args.data, "train", imgsz=args.imgsz, limit=args.limit)
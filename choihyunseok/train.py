@@ -1,4 +1,5 @@
 from ultralytics import YOLO
+from dataset_cache import make_cached_trainer
 
 # 1. 사전 학습된 모델 로드 (전이 학습 시작점)
 model = YOLO("yolo11n-seg.pt")
@@ -7,9 +8,14 @@ model = YOLO("yolo11n-seg.pt")
 # data: 위에서 작성한 yaml 파일 경로
 # epochs: 학습 반복 횟수
 # imgsz: 이미지 크기
+# trainer: JPEG 대신 전처리 캐시(memmap)에서 읽는 트레이너 (dataset_cache.py 참고)
+#          -> 캐시는 최초 1회 생성되고, 이미지/라벨 내용이 바뀌면 자동으로 다시 생성됩니다.
+# workers: 캐시 읽기는 가벼우므로 여러 워커로 병렬 로딩
 results = model.train(
-    data="custom_data.yaml", 
-    epochs=100, 
+    data="custom_data.yaml",
+    epochs=100,
     imgsz=640,
-    batch=16
-)
\ No newline at end of file
+    batch=16,
+    workers=8,
+    trainer=make_cached_trainer("custom_data.yaml", imgsz=640),
+)
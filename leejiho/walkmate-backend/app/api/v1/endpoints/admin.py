@@ -4,22 +4,23 @@ from typing import List
 # CRUD & Schemas
 from app.crud import report as crud_report
 from app.models import schemas
+from app.core.responses import FastJSONResponse
 
 # main.py가 바라보는'router' 변수
 router = APIRouter()
 
 # 1. 지도용 경량 데이터 조회
 # URL: GET /api/v1/admin/map
-@router.get("/map")
+@router.get("/map", response_model=List[schemas.MapMarker])
 def get_map_data():
     """
     [관리자] 지도에 표시할 경량 데이터를 가져옵니다.
     """
-    return crud_report.get_reports_for_map()
+    return FastJSONResponse(crud_report.get_reports_for_map())
 
 # 2. 전체 리스트 조회 (페이지네이션 포함)
 # URL: GET /api/v1/admin/reports
-@router.get("/reports", response_model=List[schemas.ReportResponse])
+@router.get("/reports", response_model=schemas.ReportPage)
 def get_admin_reports(
     skip: int = 0, 
     limit: int = Query(100, le=100) # 최대 100개 제한
@@ -32,7 +33,7 @@ def get_admin_reports(
 # 3. 신고 상태 변경
 # URL: PATCH /api/v1/admin/reports/{report_id}
 @router.patch("/reports/{report_id}", response_model=schemas.ReportResponse)
-def update_report_status(report_id: int, status_in: schemas.ReportUpdate):
+def update_report_status(report_id: str, status_in: schemas.ReportUpdate):
     """
     [관리자] 특정 신고의 처리 상태를 변경합니다.
     """
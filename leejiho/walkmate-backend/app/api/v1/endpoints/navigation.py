@@ -1,7 +1,10 @@
 # 라우터 파일 맨 위에 있어야 하는 필수 모듈
-from fastapi import APIRouter
-from pydantic import BaseModel
+from typing import Optional
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
 from app.services.tmap_service import get_navigation_path
+from app.services.safe_route import get_safest_navigation_path
+from app.services.nearby_index import nearby_index
 
 # (아까 말씀드린 Pydantic 설계도도 이 라우터 함수 바로 위에 있어야 합니다)
 class RouteRequestModel(BaseModel):
@@ -21,4 +24,23 @@ async def create_navigation_path(req_data: RouteRequestModel):
         end_coord={"x": req_data.end_lon, "y": req_data.end_lat}
     )
     # 가공된 딕셔너리 배열을 최종 반환
-    return {"status": "success", "data": navigation_steps}
\ No newline at end of file
+    return {"status": "success", "data": navigation_steps}
+
+
+class SafeRouteRequestModel(RouteRequestModel):
+    # 가장 짧은 후보보다 최대 몇 % 더 걸어도 되는지 (0.25 = 25%, 없으면 서버 기본값)
+    detour_budget: Optional[float] = Field(None, ge=0, le=1)
+
+# 3. 안전 경로 (여러 경로 후보 중 신고된 위험물을 가장 덜 지나는 경로)
+@router.post("/safe-path/")
+async def create_safe_navigation_path(req_data: SafeRouteRequestModel):
+    if not nearby_index.ready:
+        raise HTTPException(status_code=503, detail="Hazard index is warming up", headers={"Retry-After": "1"})
+
+    result = await get_safest_navigation_path(
+        start_coord={"x": req_data.start_lon, "y": req_data.start_lat},
+        end_coord={"x": req_data.end_lon, "y": req_data.end_lat},
+        detour_budget=req_data.detour_budget,
+    )
+    # data 는 /path/ 와 같은 안내 지점 목록, route / alternatives 는 후보별 거리와 위험 점수
+    return {"status": "success", "data": result["steps"], "route": result["route"], "alternatives": result["alternatives"]}
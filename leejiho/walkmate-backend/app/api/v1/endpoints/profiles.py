@@ -0,0 +1,59 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
+
+from app.core import profiler
+
+router = APIRouter()
+
+# [관리자] 요청 프로파일 조회
+# 측정 방법: 요청에 "X-Profile: 1" 헤더를 붙이거나 PROFILE_SAMPLE_RATE 환경변수 설정
+
+# 1. 최근 프로파일 목록 (구간별 소요시간 포함)
+@router.get("/")
+def read_profiles():
+    return profiler.list_profiles()
+
+
+# 2. 프로파일 상세 (구간 + 함수별 누적 시간 상위 N개)
+# scope=loop  : 이벤트 루프 스레드 전체 (같은 시간에 처리된 다른 요청 포함, 스레드풀 작업 제외)
+# scope=worker: 이 요청이 스레드풀에서 실행한 작업만 (S3 업로드 / DB 저장 등)
+PROFILE_SCOPES = ("loop", "worker")
+
+@router.get("/{profile_id}")
+def read_profile(
+    profile_id: str,
+    limit: int = Query(30, ge=1, le=500),
+    sort: str = Query("cumulative", description="cumulative | tottime | calls"),
+    scope: str = Query("loop", description="loop (루프 스레드 전체) | worker (이 요청의 스레드풀 작업)"),
+):
+    record = profiler.get_profile(profile_id)
+    if not record:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    if sort not in ("cumulative", "tottime", "calls"):
+        raise HTTPException(status_code=400, detail="Invalid sort value")
+    if scope not in PROFILE_SCOPES:
+        raise HTTPException(status_code=400, detail="Invalid scope value")
+
+    return {
+        **record.summary(),
+        "scope": scope,
+        "top_functions": record.top_functions(limit=limit, sort=sort, scope=scope),
+    }
+
+
+# 3. cProfile 원본 다운로드 (.prof -> snakeviz, pstats 등으로 분석)
+@router.get("/{profile_id}/download")
+def download_profile(profile_id: str, scope: str = Query("loop", description="loop | worker")):
+    if scope not in PROFILE_SCOPES:
+        raise HTTPException(status_code=400, detail="Invalid scope value")
+    record = profiler.get_profile(profile_id)
+    raw = record.raw_stats(scope) if record else None
+    if raw is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    return Response(
+        content=raw,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="profile_{record.id}_{scope}.prof"'},
+    )
@@ -1,5 +1,5 @@
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query, Request
 from app.crud import report as crud_report
 from app.services.s3_uploader import s3_uploader
 from fastapi import APIRouter
@@ -11,11 +11,23 @@ router = APIRouter()
 import logging
 logger = logging.getLogger("API_LOGGER")
 
-from app.models.schemas import HeatmapResponse
+from app.models.schemas import HeatmapResponse, MapMarker, ReportBulkStatusUpdate, ReportSubmit, UploadUrlRequest
+from app.core.responses import FastJSONResponse
+from app.core.config import settings
+from app.services.idempotency import created_response, report_guard
+from fastapi.concurrency import run_in_threadpool
+from app.core import profiler
+from app.services import hotspots, image_catalog, map_sync, report_export
+from app.services.report_spool import report_spool
+from app.services.admission import ingest_admission
+from app.services.nearby_index import nearby_index
+from fastapi.responses import JSONResponse, StreamingResponse
+from datetime import datetime
 
 # 1. [앱] 위험물 신고 접수 (통합 파이프라인: S3 -> DB)
 @router.post("/")
 async def create_report_pipeline(
+    request: Request,
     item_id: str = Form(...),
     user_id: str = Form(...),
     latitude: float = Form(...),
@@ -31,16 +43,13 @@ async def create_report_pipeline(
     description: str = Form(None),
     file: UploadFile = File(...)
 ):
+    # 여기까지 = 멀티파트 본문 수신/파싱 시간 (프로파일링 중일 때만 기록)
+    profiler.checkpoint("parse_form")
+
     if direction not in ['L', 'C', 'R']:
         raise HTTPException(status_code=400, detail="Direction must be L, C, or R")
 
-    # 1. S3 업로드
-    s3_url = await s3_uploader.upload_image(file)
-    if not s3_url:
-        raise HTTPException(status_code=500, detail="S3 Upload Failed")
-
-    # 2. 데이터 병합
-    report_data = {
+    report_fields = {
         "item_id": item_id,
         "user_id": user_id,
         "latitude": latitude,
@@ -54,19 +63,96 @@ async def create_report_pipeline(
         "hazard_type": hazard_type,
         "risk_level": risk_level,
         "description": description,
-        "image_url": s3_url
     }
 
-    # 3. DB 저장
-    new_report = crud_report.create_report(report_data)
-    
+    # accept-fast: 로컬 스풀에 기록(fsync)만 하고 202, 업로드/INSERT는 백그라운드 drainer가 처리
+    async def accept():
+        image = await file.read()
+        extension = file.filename.split(".")[-1]
+        with profiler.span("spool_enqueue"):
+            added = await run_in_threadpool(
+                profiler.in_worker(report_spool.enqueue), report_fields, image, file.content_type, extension
+            )
+        if not added:
+            # 아직 스풀에 남아 있는 재전송 (이미 처리된 건은 같은 S3 key 로 덮어쓰고 INSERT 는 duplicate 처리)
+            logger.info(f"🔁 Report already spooled: {item_id}")
+        return {"success": True, "item_id": item_id, "status": "accepted"}
+
+    # S3 업로드 / DB 저장은 블로킹 호출이므로 스레드풀에서 (이벤트 루프를 막지 않도록)
+    def create_sync():
+        # 1. S3 업로드
+        with profiler.span("s3_upload"):
+            s3_url = s3_uploader.upload_image(file)
+        if not s3_url:
+            raise HTTPException(status_code=500, detail="S3 Upload Failed")
+
+        # 2. 데이터 병합
+        report_data = {**report_fields, "image_url": s3_url}
+
+        # 3. DB 저장
+        with profiler.span("db_insert"):
+            new_report = crud_report.create_report(report_data)
+
+        return created_response(new_report['item_id'], s3_url)
+
+    # 기기별 속도 제한 / 전체 동시 처리 한도를 넘으면 429 / 503 (Retry-After)
+    async with ingest_admission.admit(request, user_id) as ticket:
+        async def create():
+            ticket.mark_work()
+            return await run_in_threadpool(profiler.in_worker(create_sync))
+
+        if report_spool.enabled:
+            async def spool():
+                ticket.mark_work()
+                return await accept()
+
+            result = await report_guard.run(item_id, spool, check_db=False)
+            return JSONResponse(status_code=202, content=result)
+        # 같은 item_id 재전송(앱 재시도)이면 업로드/저장 없이 처음 결과를 그대로 반환
+        return await report_guard.run(item_id, create)
+
+# 1-1. [앱] 직접 업로드 1단계: S3 presigned POST 발급
+# 앱은 응답의 url 로 fields + file 을 multipart POST 한 뒤 /submit 으로 메타데이터만 전송
+UPLOAD_EXTENSIONS = {"image/jpeg": "jpg", "image/png": "png", "image/webp": "webp"}
+
+@router.post("/upload-url")
+def create_upload_url(body: UploadUrlRequest = UploadUrlRequest()):
+    upload = s3_uploader.create_upload(UPLOAD_EXTENSIONS[body.content_type], body.content_type)
     return {
-        "success": True, 
-        "item_id": new_report['item_id'], 
-        "image_url": s3_url,
-        "message": "Report created successfully."
+        **upload,
+        "expires_in": settings.UPLOAD_URL_EXPIRES,
+        "max_bytes": settings.UPLOAD_MAX_BYTES,
     }
 
+
+# 1-2. [앱] 직접 업로드 2단계: 업로드된 이미지 확인 후 신고 저장
+@router.post("/submit")
+async def submit_report(body: ReportSubmit, request: Request):
+    def create_sync():
+        with profiler.span("s3_head"):
+            head = s3_uploader.head(body.image_key)
+        if head is None:
+            raise HTTPException(status_code=400, detail="Image not uploaded")
+        if head["size"] > settings.UPLOAD_MAX_BYTES:
+            raise HTTPException(status_code=413, detail="Image too large")
+        if not (head["content_type"] or "").startswith("image/"):
+            raise HTTPException(status_code=400, detail="Uploaded object is not an image")
+
+        image_url = s3_uploader.public_url(body.image_key)
+        report_data = {**body.model_dump(exclude={"image_key"}), "image_url": image_url}
+
+        with profiler.span("db_insert"):
+            new_report = crud_report.create_report(report_data)
+        return created_response(new_report['item_id'], image_url)
+
+    async with ingest_admission.admit(request, body.user_id) as ticket:
+        async def create():
+            ticket.mark_work()
+            return await run_in_threadpool(profiler.in_worker(create_sync))
+
+        return await report_guard.run(body.item_id, create)
+
+
 # [추가] 히트맵 전용 라우터 (Bounding Box 좌표값을 Query Parameter로 받음)
 @router.get("/heatmap", response_model=List[HeatmapResponse])
 def read_heatmap_data(
@@ -82,18 +168,59 @@ def read_heatmap_data(
     results = crud_report.get_heatmap_data(
         min_lat=min_lat, max_lat=max_lat, min_lng=min_lng, max_lng=max_lng
     )
-    return results
+    # DB 함수가 이미 HeatmapResponse 형태로 돌려주므로 행마다 다시 검증하지 않음 (response_model은 문서용)
+    return FastJSONResponse(results)
 
 
 # 2. [관리자] 지도 마커 데이터 조회
-@router.get("/map")
+@router.get("/map", response_model=List[MapMarker])
 def read_reports_for_map():
     """
     지도에 뿌릴 마커 데이터(위치, 상태, 타입)만 조회합니다.
     """
 
     results = crud_report.get_reports_for_map()
-    return results
+    return FastJSONResponse(results)
+
+
+# 2-1. 지도 마커 증분 동기화
+@router.get("/map/changes")
+def read_map_changes(
+    since: Optional[int] = Query(None, ge=0, description="이전 응답의 version (없으면 전체)"),
+    cursor: Optional[str] = Query(None, description="전체 동기화 다음 페이지 (이전 응답의 next_cursor)"),
+):
+    """
+    since 이후 바뀐 마커만 반환합니다.
+    - mode=delta: upserts(새로 생기거나 바뀐 마커), removed(지도에서 지울 item_id)
+    - mode=full : markers(전체 중 한 페이지) - since 가 없거나 너무 오래돼 변경분이 많을 때
+                  next_cursor 가 있으면 cursor=next_cursor 로 나머지 페이지를 이어 받습니다.
+    응답의 version 을 (전체를 다 받은 뒤) 다음 요청의 since 로 보내면 됩니다.
+    """
+    try:
+        return FastJSONResponse(map_sync.changes_since(since, cursor))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# 2-2. [앱] 내 주변 위험물 (보행 중 1~2초 간격 폴링용, 메모리 인덱스에서 응답)
+@router.get("/nearby")
+async def read_nearby_hazards(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    heading: Optional[float] = Query(None, ge=0, lt=360, description="진행 방향 (북=0, 시계방향 도)"),
+    radius: float = Query(100, gt=0, le=1000, description="반경 (m)"),
+    k: int = Query(5, ge=1, le=50),
+    ahead: bool = Query(False, description="true면 진행 방향 앞쪽(±90도)만"),
+):
+    """
+    가까운 순으로 최대 k개: item_id, hazard_type, risk_level, distance(m), side(L/C/R, heading 있을 때)
+    """
+    if not nearby_index.ready:
+        raise HTTPException(status_code=503, detail="Nearby index is warming up", headers={"Retry-After": "1"})
+    if ahead and heading is None:
+        raise HTTPException(status_code=400, detail="ahead requires heading")
+
+    return FastJSONResponse(nearby_index.query(lat, lng, heading, radius, k, ahead_only=ahead))
 
 
 # 3. [관리자] 전체 신고 목록 조회 (페이지네이션)
@@ -104,7 +231,73 @@ def read_all_reports(
     limit: int = Query(20, description="...")
 ): 
     results = crud_report.get_all_reports(skip=skip, limit=limit)
-    return results
+    return FastJSONResponse(results)
+
+
+# 3-1. [관리자] 전체 신고 내보내기 (스트리밍, 건수와 무관하게 메모리 일정)
+@router.get("/export")
+def export_reports(
+    format: str = Query("csv", description="csv | ndjson (GeoJSON Feature per line) | parquet"),
+    since: Optional[datetime] = Query(None, description="이 시각 이후 생성 (포함)"),
+    until: Optional[datetime] = Query(None, description="이 시각 이전 생성 (미포함)"),
+    hazard_type: Optional[str] = Query(None),
+    min_lat: Optional[float] = Query(None),
+    min_lng: Optional[float] = Query(None),
+    max_lat: Optional[float] = Query(None),
+    max_lng: Optional[float] = Query(None),
+):
+    if format not in report_export.STREAMERS:
+        raise HTTPException(status_code=400, detail="Invalid format value")
+    if format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+
+    bbox = (min_lat, min_lng, max_lat, max_lng)
+    if any(v is not None for v in bbox) and any(v is None for v in bbox):
+        raise HTTPException(status_code=400, detail="min_lat, min_lng, max_lat, max_lng must be given together")
+
+    flt = report_export.ExportFilter(
+        since=since, until=until, hazard_type=hazard_type, bbox=bbox if min_lat is not None else None
+    )
+    filename = f"reports_{datetime.now():%Y%m%d_%H%M%S}.{'geojsonl' if format == 'ndjson' else format}"
+    return StreamingResponse(
+        report_export.export_reports(format, flt),
+        media_type=report_export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# 3-2. [관리자] 신고 이미지 목록 (최신순, 커서 페이지네이션)
+@router.get("/images")
+def read_report_images(
+    limit: int = Query(30, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+):
+    try:
+        return image_catalog.list_images(limit=limit, cursor=cursor)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# 3-3. [관리자] 위험물 밀집 구역 (집계 작업 app/services/hotspots.py 가 미리 계산해 둔 테이블 조회, 점수는 조회 시점 기준)
+@router.get("/hotspots")
+def read_hotspots(
+    min_lat: Optional[float] = Query(None),
+    min_lng: Optional[float] = Query(None),
+    max_lat: Optional[float] = Query(None),
+    max_lng: Optional[float] = Query(None),
+    min_count: int = Query(1, ge=1, description="최소 신고 수"),
+    limit: int = Query(200, ge=1, le=1000),
+):
+    bbox = (min_lat, min_lng, max_lat, max_lng)
+    if any(v is not None for v in bbox) and any(v is None for v in bbox):
+        raise HTTPException(status_code=400, detail="min_lat, min_lng, max_lat, max_lng must be given together")
+
+    return hotspots.list_hotspots(
+        min_lat=min_lat, min_lng=min_lng, max_lat=max_lat, max_lng=max_lng, min_count=min_count, limit=limit
+    )
 
 
 # 4. [관리자] 신고 상태 변경 (예: new -> done)
@@ -127,6 +320,34 @@ def update_report_status(item_id: str, status: str):
     return {"success": True, "data": updated_item}
     
 
+# 5. [관리자] 신고 상태 일괄 변경 (숨김 처리 포함)
+@router.post("/bulk-status")
+def bulk_update_report_status(body: ReportBulkStatusUpdate):
+    """
+    item_ids 목록 또는 filter(bbox / hazard_type / older_than) 조건에 맞는 신고의 상태를
+    한 번의 쿼리로 변경하고, 실제로 변경된 item_id 목록을 반환합니다.
+    (일괄 숨김은 status를 'hidden'으로 전송)
+    """
+    if bool(body.item_ids) == bool(body.filter):
+        raise HTTPException(status_code=400, detail="Provide either item_ids or filter")
+
+    filters = None
+    if body.filter:
+        filters = body.filter.model_dump(exclude_none=True)
+        bbox = [filters.get(k) for k in ("min_lat", "min_lng", "max_lat", "max_lng")]
+        if any(v is not None for v in bbox) and any(v is None for v in bbox):
+            raise HTTPException(status_code=400, detail="min_lat, min_lng, max_lat, max_lng must be given together")
+        # 조건 없는 필터로 전체 테이블이 바뀌는 것 방지
+        if not filters:
+            raise HTTPException(status_code=400, detail="Filter must have at least one condition")
+        if "older_than" in filters:
+            filters["older_than"] = filters["older_than"].isoformat()
+
+    item_ids = [str(item_id) for item_id in body.item_ids] if body.item_ids else None
+    updated_ids = crud_report.bulk_update_report_status(body.status, item_ids=item_ids, filters=filters)
+    return {"success": True, "count": len(updated_ids), "item_ids": updated_ids}
+
+
 class RouteRequestModel(BaseModel):
     start_lat: float
     start_lon: float
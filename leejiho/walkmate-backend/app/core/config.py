@@ -1,7 +1,7 @@
 import os
 from dotenv import load_dotenv
 
-# .env 파일 로드
+# .env 파일 로드 (환경변수는 모두 여기서 한 번만 읽음)
 load_dotenv()
 
 class Settings:
@@ -9,10 +9,30 @@ class Settings:
     SUPABASE_URL = os.getenv("SUPABASE_URL")
     SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
+    # TMAP 보행자 경로 API
+    TMAP_API_KEY = os.getenv("TMAP_API_KEY")
+
     # AWS S3 설정
     AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
     AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
     AWS_BUCKET_NAME = os.getenv("AWS_BUCKET_NAME")
     AWS_REGION = os.getenv("AWS_REGION")
+    # S3 호환 스토리지 주소 (MinIO / LocalStack 등 로컬 테스트용, 비우면 AWS S3)
+    AWS_ENDPOINT_URL = os.getenv("AWS_ENDPOINT_URL") or None
+
+    # 앱 -> S3 직접 업로드 (presigned POST) 설정
+    UPLOAD_URL_EXPIRES = int(os.getenv("UPLOAD_URL_EXPIRES", "300"))
+    UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+
+    # Presigned URL 유효시간(초) / 만료 몇 초 전부터 새로 발급할지
+    PRESIGNED_URL_EXPIRES = int(os.getenv("PRESIGNED_URL_EXPIRES", "3600"))
+    PRESIGNED_URL_REFRESH_MARGIN = int(os.getenv("PRESIGNED_URL_REFRESH_MARGIN", "300"))
+
+    # 신고 접수 입장 제어 (기기별 초당 건수 / 버스트, 전체 동시 처리 수, 지연 예산(초, 0이면 끔))
+    INGEST_RATE_PER_DEVICE = float(os.getenv("INGEST_RATE_PER_DEVICE", "1"))
+    INGEST_BURST_PER_DEVICE = float(os.getenv("INGEST_BURST_PER_DEVICE", "10"))
+    INGEST_BUCKET_IDLE_TTL = float(os.getenv("INGEST_BUCKET_IDLE_TTL", "600"))
+    INGEST_MAX_CONCURRENCY = int(os.getenv("INGEST_MAX_CONCURRENCY", "64"))
+    INGEST_LATENCY_BUDGET = float(os.getenv("INGEST_LATENCY_BUDGET", "2.0"))
 
 settings = Settings()
\ No newline at end of file
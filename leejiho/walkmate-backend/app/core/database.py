@@ -1,15 +1,39 @@
-import os
-from dotenv import load_dotenv
-from supabase import create_client, Client
+import threading
+from typing import TYPE_CHECKING
 
-# .env 파일 활성화
-load_dotenv()
+from app.core.config import settings
+from app.core.metrics import track_dependency
 
-# os.getenv로 환경변수 가져오기 
-url: str = os.getenv("SUPABASE_URL")
-key: str = os.getenv("SUPABASE_KEY")
+if TYPE_CHECKING:
+    from supabase import Client
 
-if not url or not key:
-    raise ValueError("Supabase URL or Key is missing in .env file")
+# Supabase 클라이언트는 처음 쓸 때 만듭니다 (supabase 패키지 import + 클라이언트 생성이 무거워서
+# 모듈 import 시점에 만들면 워커 기동이 느려짐). 기동 시에는 warmup()이 미리 만들어 둡니다.
+_client = None
+_lock = threading.Lock()
 
-db_client: Client = create_client(url, key)
\ No newline at end of file
+
+def get_db_client() -> "Client":
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
+                    raise ValueError("Supabase URL or Key is missing in .env file")
+                from supabase import create_client
+                _client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    return _client
+
+
+def set_db_client(client):
+    # 부하 테스트 등에서 대역(fake) 클라이언트 주입용
+    global _client
+    with _lock:
+        _client = client
+
+
+def warmup():
+    # 클라이언트 생성 + 가벼운 조회 1번으로 HTTP 연결을 미리 열어 둠
+    client = get_db_client()
+    with track_dependency("supabase", "warmup"):
+        client.table("reports").select("item_id").limit(1).execute()
@@ -1,6 +1,10 @@
+import atexit
+import json
 import logging
 import os
-from logging.handlers import TimedRotatingFileHandler
+import queue
+import random
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 from datetime import datetime
 
 # ANSI 색상 코드
@@ -12,54 +16,103 @@ RED = "\033[31m"
 BLUE = "\033[34m"
 CYAN = "\033[36m"
 
+LOG_DIR = "logs"
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# 환경변수 설정
+# - LOG_JSON=1         : logs/app.jsonl 에 구조화된 JSON Lines 로그를 추가로 기록
+# - LOG_SAMPLE_RATE=0.1: 정상(2xx/3xx) 요청 로그 중 10%만 기록 (에러/경고는 항상 기록)
+LOG_JSON = os.getenv("LOG_JSON", "0").lower() in ("1", "true", "yes")
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+
+# 요청 로그에 extra로 붙이는 구조화 필드
+STRUCTURED_FIELDS = ("event", "method", "route", "status", "duration_ms", "device", "request_id")
+
+LEVEL_COLORS = {
+    logging.DEBUG: BLUE,
+    logging.INFO: GREEN,
+    logging.WARNING: YELLOW,
+    logging.ERROR: RED,
+    logging.CRITICAL: RED + BOLD,
+}
+
+_listener: QueueListener | None = None
+
+
 class CustomColorFormatter(logging.Formatter):
     """
-    로그 레벨과 메시지 내용에 따라 색상을 입히는 포매터
+    로그 레벨과 요청 결과(status)에 따라 색상을 입히는 포매터
+    (레벨 x 메시지 색상 조합별 Formatter를 미리 만들어 두고 재사용)
     """
+    def __init__(self):
+        super().__init__(LOG_FORMAT)
+        self._formatters = {}
+        for prefix_color in list(LEVEL_COLORS.values()) + [RESET]:
+            for msg_color in (GREEN, YELLOW, RED, CYAN, RESET):
+                self._formatters[(prefix_color, msg_color)] = logging.Formatter(
+                    f"{prefix_color}%(asctime)s - %(levelname)s{RESET} - {msg_color}%(message)s{RESET}"
+                )
+
+    @staticmethod
+    def _message_color(record):
+        # 메시지 문자열을 검사하지 않고, 미들웨어가 넘긴 구조화 필드로 판단
+        status = getattr(record, "status", None)
+        if status is not None:
+            if status >= 500:
+                return RED
+            if status >= 400:
+                return YELLOW
+            return GREEN
+        if getattr(record, "event", None) == "request_start":
+            return CYAN
+        return RESET
+
     def format(self, record):
-        # 1. 기본 로그 포맷
-        log_fmt = "%(asctime)s - %(levelname)s - %(message)s"
-        
-        # 2. 레벨별 색상 적용 (기본)
-        if record.levelno == logging.DEBUG:
-            prefix_color = BLUE
-        elif record.levelno == logging.INFO:
-            prefix_color = GREEN
-        elif record.levelno == logging.WARNING:
-            prefix_color = YELLOW
-        elif record.levelno == logging.ERROR:
-            prefix_color = RED
-        elif record.levelno == logging.CRITICAL:
-            prefix_color = RED + BOLD
-        else:
-            prefix_color = RESET
-
-        # 3. 메시지 내용 기반 하이라이팅 (요청/응답/에러)
-        msg = record.getMessage()
-        if "200 " in msg or "201 " in msg: # 성공
-            msg_color = GREEN
-        elif "404 " in msg or "400 " in msg: # 클라이언트 에러
-            msg_color = YELLOW
-        elif "500 " in msg: # 서버 에러
-            msg_color = RED
-        elif "➡️" in msg: # 요청 시작
-            msg_color = CYAN
-        else:
-            msg_color = RESET
-
-        # 4. 최종 포맷 조립
-        # [시간 - 레벨] 부분은 prefix_color
-        # [메시지] 부분은 msg_color
-        formatter = logging.Formatter(
-            f"{prefix_color}%(asctime)s - %(levelname)s{RESET} - {msg_color}%(message)s{RESET}"
-        )
-        return formatter.format(record)
+        prefix_color = LEVEL_COLORS.get(record.levelno, RESET)
+        return self._formatters[(prefix_color, self._message_color(record))].format(record)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    한 줄에 JSON 객체 하나 (route / status / duration_ms / device 등 구조화 필드 포함)
+    (예외 traceback 은 QueueHandler.prepare 가 msg 에 합쳐 exc_info 를 비우므로 msg 에 들어 있음)
+    """
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "msg": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def sample_request(status: int | None = None) -> bool:
+    """
+    INFO 요청 로그를 남길지 결정 (샘플링). 4xx/5xx 응답은 항상 남깁니다.
+    """
+    if status is not None and status >= 400:
+        return True
+    return LOG_SAMPLE_RATE >= 1.0 or random.random() < LOG_SAMPLE_RATE
+
+
+def stop_logger():
+    # 큐에 남은 로그를 모두 기록한 뒤 리스너 스레드 종료
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
 def setup_logger():
+    global _listener
+
     # 1. 로그 저장할 폴더 생성
-    log_dir = "logs"
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+    if not os.path.exists(LOG_DIR):
+        os.makedirs(LOG_DIR)
 
     # 2. 로거 생성
     logger = logging.getLogger("API_LOGGER")
@@ -69,19 +122,16 @@ def setup_logger():
     if logger.handlers:
         return logger
 
-    # 3. 포맷 설정 (파일용: 색상 없음)
-    file_formatter = logging.Formatter(
-        "%(asctime)s - %(levelname)s - %(message)s"
-    )
+    # 3. 포맷 설정 (파일용: 색상 없음) - 핸들러마다 한 번만 생성
+    file_formatter = logging.Formatter(LOG_FORMAT)
 
     # 4. 핸들러 1: 콘솔 출력 (색상 적용)
     stream_handler = logging.StreamHandler()
     stream_handler.setFormatter(CustomColorFormatter())
-    logger.addHandler(stream_handler)
 
     # 5. 핸들러 2: 파일 저장 (날짜별 회전 - 색상 없음)
-    filename = os.path.join(log_dir, "app.log") 
-    
+    filename = os.path.join(LOG_DIR, "app.log")
+
     file_handler = TimedRotatingFileHandler(
         filename=filename,
         when="midnight",  # 자정마다 회전
@@ -91,8 +141,29 @@ def setup_logger():
     )
     file_handler.suffix = "%Y-%m-%d" # 파일명 뒤에 날짜 붙임
     file_handler.setFormatter(file_formatter)
-    
-    logger.addHandler(file_handler)
+
+    handlers = [stream_handler, file_handler]
+
+    # 6. 핸들러 3 (선택): JSON Lines 구조화 로그
+    if LOG_JSON:
+        json_handler = TimedRotatingFileHandler(
+            filename=os.path.join(LOG_DIR, "app.jsonl"),
+            when="midnight",
+            interval=1,
+            encoding="utf-8",
+            backupCount=30
+        )
+        json_handler.suffix = "%Y-%m-%d"
+        json_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(json_handler)
+
+    # 7. 요청 처리 경로에서는 큐에 넣기만 하고, 실제 출력/파일 쓰기는 백그라운드 스레드가 담당
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logger)
 
     # Uvicorn의 기본 액세스 로그(INFO 레벨) 거슬리면 끄기
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
@@ -0,0 +1,205 @@
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# 경량 메트릭 수집기 (Prometheus 텍스트 포맷으로 /metrics 에 노출)
+#
+# 요청 처리 경로에서는 bisect + 정수 증가만 수행하고,
+# 문자열 조립은 /metrics 를 호출할 때만 합니다.
+
+# 초 단위 히스토그램 버킷 (5ms ~ 10s)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_str(names, values) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self._values = {}
+
+    def inc(self, *label_values, amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        for key, value in list(self._values.items()):
+            lines.append(f"{self.name}{_label_str(self.labels, key)} {value}")
+        return lines
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self._values = {}
+
+    def set(self, value: float, *label_values):
+        self._values[label_values] = value
+
+    def inc(self, *label_values, amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def dec(self, *label_values, amount: float = 1.0):
+        self.inc(*label_values, amount=-amount)
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        for key, value in list(self._values.items()):
+            lines.append(f"{self.name}{_label_str(self.labels, key)} {value}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label_values -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value: float, *label_values):
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[idx] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, *label_values):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        for key, series in list(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_label_str(self.labels + ('le',), key + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_str(self.labels, key)} {series[-1]}")
+            lines.append(f"{self.name}_count{_label_str(self.labels, key)} {cumulative}")
+        return lines
+
+
+REGISTRY: list[_Metric] = []
+
+
+# 1. HTTP 요청
+REQUEST_LATENCY = Histogram(
+    "walkmate_http_request_duration_seconds", "HTTP request latency by route template and status",
+    ("method", "route", "status"),
+)
+REQUESTS_IN_FLIGHT = Gauge("walkmate_http_requests_in_flight", "Requests currently being processed")
+
+# 2. 외부 의존성 (S3 / Supabase / TMAP)
+DEPENDENCY_LATENCY = Histogram(
+    "walkmate_dependency_duration_seconds", "Latency of calls to external dependencies",
+    ("dependency", "operation"),
+)
+DEPENDENCY_ERRORS = Counter(
+    "walkmate_dependency_errors_total", "Failed calls to external dependencies",
+    ("dependency", "operation"),
+)
+
+# 3. 이벤트 루프 지연 (동기 호출이 루프를 막고 있는지 확인용)
+EVENT_LOOP_LAG = Gauge("walkmate_event_loop_lag_seconds", "Most recent event loop scheduling lag")
+EVENT_LOOP_LAG_HIST = Histogram(
+    "walkmate_event_loop_lag_distribution_seconds", "Event loop scheduling lag",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+# 4. 신고 접수 스풀 (accept-fast 모드, app/services/report_spool.py)
+SPOOL_DEPTH = Gauge("walkmate_spool_depth", "Reports accepted but not yet stored in the database")
+SPOOL_OLDEST_AGE = Gauge("walkmate_spool_oldest_age_seconds", "Age of the oldest spooled report")
+SPOOL_DRAINED = Counter(
+    "walkmate_spool_drained_total", "Spooled reports stored by the drainer (duplicate = already in DB)",
+    ("result",),
+)
+SPOOL_RETRIES = Counter(
+    "walkmate_spool_retries_total", "Spooled report attempts that failed and were rescheduled",
+    ("stage",),
+)
+SPOOL_DEAD_LETTERED = Counter(
+    "walkmate_spool_dead_lettered_total", "Spooled reports moved to spool_dead after SPOOL_MAX_ATTEMPTS failures",
+    ("stage",),
+)
+
+# 5. 신고 접수 입장 제어 (app/services/admission.py)
+INGEST_REJECTED = Counter(
+    "walkmate_ingest_rejected_total", "Report submissions rejected by admission control",
+    ("reason",),
+)
+INGEST_IN_FLIGHT = Gauge("walkmate_ingest_in_flight", "Report submissions currently admitted")
+INGEST_LATENCY_EWMA = Gauge(
+    "walkmate_ingest_latency_ewma_seconds", "Moving average of admitted report submission latency"
+)
+INGEST_TRACKED_DEVICES = Gauge("walkmate_ingest_tracked_devices", "Devices with an active rate limit bucket")
+
+
+@contextmanager
+def track_dependency(dependency: str, operation: str):
+    """
+    외부 호출 구간의 소요 시간과 실패 횟수를 기록합니다.
+    예) with track_dependency("supabase", "insert_report"): ...
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        DEPENDENCY_ERRORS.inc(dependency, operation)
+        raise
+    finally:
+        DEPENDENCY_LATENCY.observe(time.perf_counter() - start, dependency, operation)
+
+
+async def monitor_event_loop_lag(interval: float = 0.5):
+    # interval 만큼 잠들었다가 실제로 깨어난 시각과의 차이 = 루프 지연
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag = max(time.perf_counter() - start - interval, 0.0)
+        EVENT_LOOP_LAG.set(lag)
+        EVENT_LOOP_LAG_HIST.observe(lag)
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
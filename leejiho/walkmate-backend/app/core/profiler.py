@@ -0,0 +1,194 @@
+import cProfile
+import functools
+import io
+import marshal
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+# 요청 단위 프로파일러 (필요할 때만 켜짐)
+#
+# - 요청 헤더 "X-Profile: 1" 또는 PROFILE_SAMPLE_RATE 비율로 선택된 요청만 cProfile로 측정
+# - 파이프라인 단계(폼 파싱 / S3 업로드 / DB 저장 / 로깅)는 span()으로 구간 시간 기록
+# - 결과는 최근 N개만 링 버퍼에 보관하고 관리자 API에서 내려받음
+#
+# cProfile 결과는 두 가지로 나눠 보관합니다.
+#   - loop  : 이벤트 루프 스레드 전체 (측정 구간 동안 같은 루프에서 돌던 다른 요청도 섞임, 스레드풀 작업은 빠짐)
+#   - worker: in_worker()로 감싸 스레드풀에서 실행한 이 요청의 작업만 (S3 업로드 / DB 저장 등)
+#
+# 꺼져 있을 때는 ContextVar 조회 한 번으로 끝나므로 오버헤드가 거의 없습니다.
+
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER_SIZE", "50"))
+PROFILE_HEADER = "x-profile"
+
+_current: ContextVar["ProfileRecord | None"] = ContextVar("current_profile", default=None)
+_profiles: deque = deque(maxlen=PROFILE_BUFFER_SIZE)
+_buffer_lock = threading.Lock()
+_cprofile_busy = threading.Lock()  # cProfile은 스레드당 하나만 활성화 가능
+
+
+class ProfileRecord:
+    def __init__(self, method: str, path: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.created_at = datetime.now().isoformat(timespec="seconds")
+        self.start = time.perf_counter()
+        self.last_mark = self.start
+        self.duration_ms = None
+        self.status = None
+        self.spans = []  # (name, 시작 offset ms, 소요 ms)
+        self.stats = None  # marshal된 cProfile 결과 (.prof 파일 형식), 루프 스레드 전체
+        self.worker_stats = None  # 이 요청의 스레드풀 작업만 (in_worker)
+        self._profile = None
+        self._worker = None  # pstats.Stats (워커 스레드별 결과를 합침)
+        self._worker_lock = threading.Lock()
+
+    def add_span(self, name: str, start: float, end: float):
+        self.spans.append((name, round((start - self.start) * 1000, 3), round((end - start) * 1000, 3)))
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "created_at": self.created_at,
+            "status": self.status,
+            "duration_ms": self.duration_ms,
+            "has_cprofile": self.stats is not None,
+            "has_worker_cprofile": self.worker_stats is not None,
+            "spans": [{"name": n, "start_ms": s, "duration_ms": d} for n, s, d in self.spans],
+        }
+
+    def add_worker_profile(self, profile: cProfile.Profile):
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = pstats.Stats(profile)
+            else:
+                self._worker.add(profile)
+
+    def raw_stats(self, scope: str = "loop") -> bytes | None:
+        return self.worker_stats if scope == "worker" else self.stats
+
+    def top_functions(self, limit: int = 30, sort: str = "cumulative", scope: str = "loop") -> str:
+        raw = self.raw_stats(scope)
+        if raw is None:
+            return ""
+        stats = pstats.Stats(stream=io.StringIO())
+        stats.stats = marshal.loads(raw)
+        stats.get_top_level_stats()
+        stats.sort_stats(sort).print_stats(limit)
+        return stats.stream.getvalue()
+
+
+# 1. 요청 시작/종료 (미들웨어에서 호출)
+def start_request(request) -> ProfileRecord | None:
+    forced = request.headers.get(PROFILE_HEADER) == "1"
+    if not forced and (PROFILE_SAMPLE_RATE <= 0 or random.random() >= PROFILE_SAMPLE_RATE):
+        return None
+
+    record = ProfileRecord(request.method, request.url.path)
+    # 동시에 여러 요청을 cProfile 할 수 없으므로, 이미 측정 중이면 span만 기록
+    if _cprofile_busy.acquire(blocking=False):
+        record._profile = cProfile.Profile()
+        record._profile.enable()
+    _current.set(record)
+    return record
+
+
+def finish_request(record: ProfileRecord, status: int | None):
+    if record._profile is not None:
+        record._profile.disable()
+        record._profile.create_stats()
+        record.stats = marshal.dumps(record._profile.stats)
+        record._profile = None
+        _cprofile_busy.release()
+    with record._worker_lock:
+        if record._worker is not None:
+            record.worker_stats = marshal.dumps(record._worker.stats)
+            record._worker = None
+
+    record.status = status
+    record.duration_ms = round((time.perf_counter() - record.start) * 1000, 3)
+    _current.set(None)
+    with _buffer_lock:
+        _profiles.append(record)
+
+
+# 2. 단계별 구간 기록
+@contextmanager
+def span(name: str):
+    record = _current.get()
+    if record is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        record.add_span(name, start, end)
+        record.last_mark = end
+
+
+def checkpoint(name: str):
+    """
+    직전 기록 시점(또는 요청 시작)부터 지금까지를 하나의 구간으로 기록합니다.
+    예) 핸들러 첫 줄에서 checkpoint("parse_form") -> 멀티파트 파싱 시간
+    """
+    record = _current.get()
+    if record is None:
+        return
+    now = time.perf_counter()
+    record.add_span(name, record.last_mark, now)
+    record.last_mark = now
+
+
+def in_worker(fn):
+    """
+    스레드풀에서 실행할 함수를 감싸, 측정 중인 요청이면 그 워커 스레드에서도 cProfile로 측정합니다.
+    (루프 스레드의 cProfile에는 스레드풀에서 돈 작업이 잡히지 않으므로)
+    예) await run_in_threadpool(profiler.in_worker(create_sync))
+    """
+    record = _current.get()
+    if record is None:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ 는 프로세스 전체에서 프로파일러 하나만 켤 수 있음 (span 기록만 남김)
+            return fn(*args, **kwargs)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profile.disable()
+            record.add_worker_profile(profile)
+
+    return wrapper
+
+
+# 3. 조회
+def list_profiles() -> list[dict]:
+    with _buffer_lock:
+        records = list(_profiles)
+    return [r.summary() for r in reversed(records)]
+
+
+def get_profile(profile_id: str) -> ProfileRecord | None:
+    with _buffer_lock:
+        for record in _profiles:
+            if record.id == profile_id:
+                return record
+    return None
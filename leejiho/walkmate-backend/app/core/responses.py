@@ -0,0 +1,20 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+# orjson 기반 JSON 응답
+#
+# FastAPI 기본 경로는 (response_model 검증 ->) jsonable_encoder 로 dict/list 를 한 번 더 복사한 뒤
+# 표준 json 으로 직렬화합니다. 마커 수천 건짜리 응답에서는 이 부분이 요청 처리 시간 대부분을 차지합니다.
+#   - app 기본 응답 클래스로 지정 -> 마지막 json.dumps 단계만 orjson 으로
+#   - 라우트에서 FastJSONResponse(rows) 를 직접 반환 -> 검증 / jsonable_encoder 도 건너뜀
+#     (DB가 이미 정해진 형태로 돌려준 내부 데이터에만 사용. response_model 은 문서용으로 남겨둠)
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        # datetime / UUID / dataclass 는 orjson 이 직접 처리, dict 키가 숫자인 경우도 허용
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,90 @@
+from app.core.database import get_db_client
+from app.core.metrics import track_dependency
+
+import logging
+
+logger = logging.getLogger("API_LOGGER")
+
+# 위험물 밀집 구역(hotspot) 테이블 / 함수: sql/report_hotspots.sql
+
+# 집합 반환 RPC는 PostgREST max-rows(Supabase 기본 1000)에 잘리므로 이 크기 이하로 나눠 받음
+POINTS_PAGE_SIZE = 1000
+
+
+# 1. 집계 작업용
+def get_dirty_tiles(since: str | None, tile_deg: float, halo_deg: float) -> dict:
+    """{"watermark": 반영한 최대 updated_at, "tiles": [[ty, tx], ...]}"""
+    with track_dependency("supabase", "rpc_hotspot_dirty_tiles"):
+        response = get_db_client().rpc(
+            "hotspot_dirty_tiles", {"since": since, "tile_deg": tile_deg, "halo_deg": halo_deg}
+        ).execute()
+    return response.data or {"watermark": None, "tiles": []}
+
+
+def get_active_points(min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> list[dict]:
+    # item_id 키셋 페이지네이션 (밀집 tile도 잘리지 않도록)
+    points, after_id = [], None
+    while True:
+        with track_dependency("supabase", "rpc_hotspot_points"):
+            response = get_db_client().rpc(
+                "hotspot_points",
+                {
+                    "min_lat": min_lat, "min_lng": min_lng, "max_lat": max_lat, "max_lng": max_lng,
+                    "after_id": after_id, "page_size": POINTS_PAGE_SIZE,
+                },
+            ).execute()
+        rows = response.data or []
+        points.extend(rows)
+        if len(rows) < POINTS_PAGE_SIZE:
+            return points
+        after_id = rows[-1]["item_id"]
+
+
+def replace_hotspots(tiles: list[str], hotspots: list[dict]) -> int:
+    with track_dependency("supabase", "rpc_replace_hotspots"):
+        response = get_db_client().rpc("replace_hotspots", {"tiles": tiles, "hotspots": hotspots}).execute()
+    return response.data
+
+
+def get_last_run() -> dict | None:
+    with track_dependency("supabase", "select_hotspot_run"):
+        response = get_db_client().table("report_hotspot_runs").select("*").eq("id", 1).execute()
+    return response.data[0] if response.data else None
+
+
+def save_run(watermark: str | None, tiles: int, hotspots: int, finished_at: str):
+    with track_dependency("supabase", "upsert_hotspot_run"):
+        get_db_client().table("report_hotspot_runs").upsert({
+            "id": 1, "watermark": watermark, "tiles": tiles, "hotspots": hotspots, "finished_at": finished_at,
+        }).execute()
+
+
+# 2. 조회 (지도 화면 범위 안, 위험도 높은 순)
+def get_hotspots(
+    min_lat: float | None = None,
+    min_lng: float | None = None,
+    max_lat: float | None = None,
+    max_lng: float | None = None,
+    min_count: int = 1,
+    limit: int = 200,
+):
+    try:
+        query = (
+            get_db_client().table("report_hotspots")
+            .select("hotspot_id, report_count, dominant_hazard, hazard_counts, risk_log2, "
+                    "center_lat, center_lng, polygon, last_reported_at")
+            .gte("report_count", min_count)
+            .order("risk_log2", desc=True)
+            .limit(limit)
+        )
+        if min_lat is not None:
+            query = (
+                query.gte("center_lat", min_lat).lte("center_lat", max_lat)
+                .gte("center_lng", min_lng).lte("center_lng", max_lng)
+            )
+        with track_dependency("supabase", "select_hotspots"):
+            response = query.execute()
+        return response.data
+    except Exception as e:
+        logger.error(f"❌ DB Select Hotspots Error: {e}", exc_info=True)
+        raise e
@@ -1,10 +1,29 @@
-from app.core.database import db_client
+from app.core.database import get_db_client
+from app.core.metrics import track_dependency
 import json
 
 import logging
 
 logger = logging.getLogger("API_LOGGER")
 
+# 신고 변경 알림 (지도/인덱스 캐시 무효화 등)
+# listener(event, item_ids, **details) 형태로 등록하면 변경 1회(일괄 처리면 배치 1회)마다 한 번 호출됩니다.
+#   event: "created" (details: rows = INSERT한 payload 목록) | "status" (details: status = 바뀐 상태)
+_change_listeners = []
+
+
+def register_change_listener(listener):
+    _change_listeners.append(listener)
+    return listener
+
+
+def _notify_change(event: str, item_ids: list, **details):
+    for listener in _change_listeners:
+        try:
+            listener(event, item_ids, **details)
+        except Exception as e:
+            logger.warning(f"⚠️ Change listener error ({event}): {e}")
+
 def parse_location(location_data):
     try:
         # Case 1: 데이터가 없을 때
@@ -39,48 +58,96 @@ def parse_location(location_data):
         return {"latitude": 0.0, "longitude": 0.0}
 
 
+def with_coords(item: dict) -> dict:
+    """DB 행의 location 을 latitude / longitude 로 바꾼 행 (응답용)"""
+    item.update(parse_location(item.pop("location", None)))
+    return item
+
+
 # 1. 신고 데이터 생성 (INSERT)
+def _report_payload(report_data: dict) -> dict:
+    location_wkt = f"POINT({report_data['longitude']} {report_data['latitude']})"
+    return {
+        "item_id": report_data["item_id"],
+        "user_id": report_data["user_id"],
+        "location": location_wkt,
+        "hazard_type": report_data["hazard_type"],
+        "distance": report_data["distance"],
+        "direction": report_data["direction"],
+        "x": report_data["x"],
+        "y": report_data["y"],
+        "w": report_data["w"],
+        "h": report_data["h"],
+        "risk_level": report_data["risk_level"],
+        "image_url": report_data["image_url"],
+        "description": report_data.get("description"),
+        "status": "new"
+    }
+
+
 def create_report(report_data: dict):
     try:
-        location_wkt = f"POINT({report_data['longitude']} {report_data['latitude']})"
-        payload = {
-            "item_id": report_data["item_id"],
-            "user_id": report_data["user_id"],
-            "location": location_wkt,
-            "hazard_type": report_data["hazard_type"],
-            "distance": report_data["distance"],
-            "direction": report_data["direction"],
-            "x": report_data["x"],
-            "y": report_data["y"],
-            "w": report_data["w"],
-            "h": report_data["h"],
-            "risk_level": report_data["risk_level"],
-            "image_url": report_data["image_url"],
-            "description": report_data.get("description"),
-            "status": "new"
-        }
+        payload = _report_payload(report_data)
 
+        with track_dependency("supabase", "insert_report"):
+            response = (
+                get_db_client().table("reports")
+                .insert(payload)
+                .execute()
+            )
+        _notify_change("created", [payload["item_id"]], rows=[payload])
+        return response.data[0]
+    except Exception as e:
+        logger.error(f"❌ DB Insert Error: {e}", exc_info=True)
+        raise e
+
+
+# 1-1. 여러 건 한 번에 INSERT (스풀 drainer용, 한 요청 = 한 트랜잭션)
+def create_reports_batch(report_datas: list[dict]):
+    payloads = [_report_payload(r) for r in report_datas]
+    with track_dependency("supabase", "insert_report_batch"):
         response = (
-            db_client.table("reports")
-            .insert(payload)
+            get_db_client().table("reports")
+            .insert(payloads)
             .execute()
         )
-        return response.data[0]
+    _notify_change("created", [p["item_id"] for p in payloads], rows=payloads)
+    return response.data
+
+
+# 1-2. item_id 단건 조회 (중복 접수 확인용)
+def get_report_by_id(item_id: str):
+    try:
+        with track_dependency("supabase", "select_by_id"):
+            response = (
+                get_db_client().table("reports")
+                .select("item_id, image_url")
+                .eq("item_id", item_id)
+                .limit(1)
+                .execute()
+            )
+        return response.data[0] if response.data else None
     except Exception as e:
-        logger.error(f"❌ DB Insert Error: {e}", exc_info=True)
+        logger.error(f"❌ DB Select By Id Error: {e}", exc_info=True)
         raise e
 
 
+def is_unique_violation(error: Exception) -> bool:
+    # PostgREST APIError.code == Postgres SQLSTATE (23505 = unique_violation)
+    return getattr(error, "code", None) == "23505"
+
+
 # 2. 지도용 경량 데이터 조회 (SELECT - Map View)
 def get_reports_for_map():
     try:
-        response = (
-            db_client.table("reports")
-            .select("item_id, location, hazard_type, distance, direction, risk_level, status")
-            .neq("status", "done")
-            .neq("status", "hidden") # [추가] 숨김 리포트 마커 제외
-            .execute()
-        )
+        with track_dependency("supabase", "select_map"):
+            response = (
+                get_db_client().table("reports")
+                .select("item_id, location, hazard_type, distance, direction, risk_level, status, created_at")
+                .neq("status", "done")
+                .neq("status", "hidden") # [추가] 숨김 리포트 마커 제외
+                .execute()
+            )
         
         results = []
         for item in response.data:
@@ -99,63 +166,237 @@ def get_reports_for_map():
         raise e
 
 
+# 2-1. 지도 마커 변경분 (증분 동기화용, sql/report_change_version.sql)
+# since 이후 change_version 순으로 최대 limit 건 (상태가 done/hidden 으로 바뀐 건도 포함)
+def get_map_changes(since: int, limit: int):
+    try:
+        with track_dependency("supabase", "select_map_changes"):
+            rows = (
+                get_db_client().table("reports")
+                .select("item_id, location, hazard_type, distance, direction, risk_level, status, "
+                        "change_version, updated_at")
+                .gt("change_version", since)
+                .order("change_version")
+                .limit(limit)
+                .execute()
+            ).data
+        with track_dependency("supabase", "select_map_tombstones"):
+            tombstones = (
+                get_db_client().table("report_tombstones")
+                .select("item_id, change_version, updated_at:deleted_at")
+                .gt("change_version", since)
+                .order("change_version")
+                .limit(limit)
+                .execute()
+            ).data
+
+        for item in rows:
+            item.update(parse_location(item.pop("location", None)))
+        return rows, tombstones
+    except Exception as e:
+        logger.error(f"❌ DB Select Map Changes Error: {e}", exc_info=True)
+        raise e
+
+
+# 2-1-1. 지도 마커 전체 스냅샷 한 페이지 (증분 동기화의 full 모드, created_at + item_id 키셋)
+# 한 번에 다 읽으면 PostgREST max-rows 에서 잘리므로 limit(<= max-rows) 단위로 나눠 받음
+def get_map_page(limit: int, cursor: tuple | None = None):
+    try:
+        query = (
+            get_db_client().table("reports")
+            .select("item_id, location, hazard_type, distance, direction, risk_level, status, created_at")
+            .neq("status", "done")
+            .neq("status", "hidden")
+            .order("created_at")
+            .order("item_id")
+            .limit(limit)
+        )
+        if cursor:
+            ts, last_id = cursor
+            query = query.or_(f'created_at.gt."{ts}",and(created_at.eq."{ts}",item_id.gt.{last_id})')
+
+        with track_dependency("supabase", "select_map_page"):
+            rows = query.execute().data
+        return [with_coords(item) for item in rows]
+    except Exception as e:
+        logger.error(f"❌ DB Select Map Page Error: {e}", exc_info=True)
+        raise e
+
+
+# 2-2. 최근 변경 버전 (전체 동기화 직전 기준점)
+def get_recent_change_versions(limit: int = 100):
+    with track_dependency("supabase", "select_change_versions"):
+        return (
+            get_db_client().table("reports")
+            .select("change_version, updated_at")
+            .not_.is_("change_version", "null")
+            .order("change_version", desc=True)
+            .limit(limit)
+            .execute()
+        ).data
+
+
 # 3. 관리자 리스트용 전체 조회
 def get_all_reports(skip: int = 0, limit: int = 20):
     try:
-        response = (
-            db_client.table("reports")
-            .select("*", count="exact") 
-            .neq("status", "hidden") # [추가] 숨김 처리된 항목 제외
-            .order("created_at", desc=True)
-            .range(skip, skip + limit - 1)
-            .execute()
-        )
+        with track_dependency("supabase", "select_all"):
+            response = (
+                get_db_client().table("reports")
+                .select("*", count="exact") 
+                .neq("status", "hidden") # [추가] 숨김 처리된 항목 제외
+                .order("created_at", desc=True)
+                .range(skip, skip + limit - 1)
+                .execute()
+            )
         
-        processed_data = []
-        for item in response.data:
-            coords = parse_location(item.get("location"))
-            item.update(coords)
-            if "location" in item:
-                del item["location"]
-            processed_data.append(item)
-            
         return {
             "total": response.count,
-            "data": processed_data
+            "data": [with_coords(item) for item in response.data]
         }
     except Exception as e:
         logger.error(f"❌ DB Select All Error: {e}", exc_info=True)
         raise e
 
 
+# 3-1. 전체 순회 (내보내기 / 주변 위험물 인덱스 적재용, created_at + item_id 키셋 페이지네이션 - count/offset 없이)
+# page_size 는 PostgREST max-rows(Supabase 기본 1000) 이하여야 함 (넘으면 잘린 페이지를 마지막으로 오인)
+def iter_reports(
+    columns: str = "*",
+    page_size: int = 1000,
+    since: str | None = None,
+    until: str | None = None,
+    hazard_type: str | None = None,
+    statuses: tuple | None = None,
+    op: str = "select_export_page",
+):
+    cursor = None
+    while True:
+        query = (
+            get_db_client().table("reports")
+            .select(columns)
+            .order("created_at")
+            .order("item_id")
+            .limit(page_size)
+        )
+        if statuses:
+            query = query.in_("status", list(statuses))
+        else:
+            query = query.neq("status", "hidden")
+        if since:
+            query = query.gte("created_at", since)
+        if until:
+            query = query.lt("created_at", until)
+        if hazard_type:
+            query = query.eq("hazard_type", hazard_type)
+        if cursor:
+            ts, last_id = cursor
+            # 타임스탬프의 ':' '.' 는 PostgREST 예약 문자 -> 큰따옴표로 감쌈
+            query = query.or_(f'created_at.gt."{ts}",and(created_at.eq."{ts}",item_id.gt.{last_id})')
+
+        with track_dependency("supabase", op):
+            rows = query.execute().data
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        cursor = (rows[-1]["created_at"], rows[-1]["item_id"])
+
+
+# 3-2. 이미지 목록 (최신순, created_at + item_id 키셋 페이지네이션)
+# cursor: 이전 페이지 마지막 항목의 (created_at, item_id)
+def get_image_page(limit: int = 30, cursor: tuple | None = None):
+    try:
+        query = (
+            get_db_client().table("reports")
+            .select("item_id, image_url, created_at, hazard_type, status")
+            .neq("status", "hidden")
+            .order("created_at", desc=True)
+            .order("item_id", desc=True)
+            .limit(limit)
+        )
+        if cursor:
+            ts, last_id = cursor
+            query = query.or_(f'created_at.lt."{ts}",and(created_at.eq."{ts}",item_id.lt.{last_id})')
+
+        with track_dependency("supabase", "select_images"):
+            response = query.execute()
+        return response.data
+    except Exception as e:
+        logger.error(f"❌ DB Select Images Error: {e}", exc_info=True)
+        raise e
+
+
 # 4. 상태 수정
 def update_report_status(item_id: str, new_status: str):
     try:
-        response = (
-            db_client.table("reports")
-            .update({"status": new_status})
-            .eq("item_id", item_id)
-            .execute()
-        )
+        with track_dependency("supabase", "update_status"):
+            response = (
+                get_db_client().table("reports")
+                .update({"status": new_status})
+                .eq("item_id", item_id)
+                .execute()
+            )
         if not response.data: return None
-        return response.data[0]
+        _notify_change("status", [item_id], status=new_status)
+        return with_coords(response.data[0])  # 관리자 응답 모델(ReportResponse)과 같은 형태
     except Exception as e:
         logger.error(f"❌ DB Update Error: {e}", exc_info=True)
         return None
 
+# 5. 상태 일괄 수정 (item_id 목록 또는 필터 조건, 한 번의 쿼리)
+def bulk_update_report_status(new_status: str, item_ids: list | None = None, filters: dict | None = None):
+    try:
+        if item_ids:
+            with track_dependency("supabase", "bulk_update_status"):
+                response = (
+                    get_db_client().table("reports")
+                    .update({"status": new_status})
+                    .in_("item_id", item_ids)
+                    .neq("status", new_status)
+                    .execute()
+                )
+        else:
+            # bbox / 종류 / 기간 조건은 PostgREST 필터로 표현할 수 없어 DB 함수로 처리
+            # (sql/bulk_update_report_status.sql)
+            filters = filters or {}
+            with track_dependency("supabase", "rpc_bulk_update_status"):
+                response = (
+                    get_db_client().rpc(
+                        "bulk_update_report_status",
+                        {
+                            "new_status": new_status,
+                            "min_lon": filters.get("min_lng"), "min_lat": filters.get("min_lat"),
+                            "max_lon": filters.get("max_lng"), "max_lat": filters.get("max_lat"),
+                            "filter_hazard": filters.get("hazard_type"),
+                            "created_before": filters.get("older_than"),
+                        }
+                    ).execute()
+                )
+
+        updated_ids = [row["item_id"] for row in response.data]
+        if updated_ids:
+            _notify_change("status", updated_ids, status=new_status)
+        return updated_ids
+    except Exception as e:
+        logger.error(f"❌ DB Bulk Update Error: {e}", exc_info=True)
+        raise e
+
+
 # [추가] 히트맵 데이터 조회 (Bounding Box 필터링 적용)
 def get_heatmap_data(min_lat: float, max_lat: float, min_lng: float, max_lng: float):
     try:
         # DB 내부의 공간 연산 함수(RPC)를 호출
-        response = (
-            db_client.rpc(
-                "get_reports_in_bbox", 
-                {
-                    "min_lon": min_lng, "min_lat": min_lat, 
-                    "max_lon": max_lng, "max_lat": max_lat
-                }
-            ).execute()
-        )
+        with track_dependency("supabase", "rpc_reports_in_bbox"):
+            response = (
+                get_db_client().rpc(
+                    "get_reports_in_bbox", 
+                    {
+                        "min_lon": min_lng, "min_lat": min_lat, 
+                        "max_lon": max_lng, "max_lat": max_lat
+                    }
+                ).execute()
+            )
         return response.data # DB가 이미 필터링과 JSON 변환을 끝낸 상태로 반환함
     except Exception as e:
         logger.error(f"❌ DB Select for Heatmap Error: {e}", exc_info=True)
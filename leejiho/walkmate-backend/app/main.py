@@ -1,14 +1,24 @@
 from fastapi import FastAPI, APIRouter, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from app.api.v1.endpoints import reports, navigation
+from app.api.v1.endpoints import reports, navigation, profiles
 import time
-from app.core.logger import setup_logger
+import uuid
+import asyncio
+from app.core.logger import setup_logger, stop_logger, sample_request
+from app.core import metrics, profiler
+from app.core.responses import FastJSONResponse
+from app.services.report_spool import report_spool
+from app.core import database
+from app.services.s3_uploader import s3_uploader
+from app.services.nearby_index import nearby_index
+from fastapi.concurrency import run_in_threadpool
 
 # 로그 출력 형식 세팅
 logger = setup_logger()
 
-app = FastAPI(title="WalkMate API")
+# 기본 응답 직렬화를 orjson 으로 (app/core/responses.py)
+app = FastAPI(title="WalkMate API", default_response_class=FastJSONResponse)
 
 # 1. CORS 설정 (안드로이드 앱 통신 필수)
 app.add_middleware(
@@ -25,6 +35,9 @@ app.include_router(reports.router, prefix="/api/v1/reports", tags=["reports"])
 # 3. 네비게이션 라우터 연결 
 app.include_router(navigation.router, prefix="/api/v1/navigation", tags=["Navigation"])
 
+# 4. [관리자] 요청 프로파일 조회 라우터 연결
+app.include_router(profiles.router, prefix="/api/v1/admin/profiles", tags=["admin"])
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     # 1. HTTP Exception (우리가 의도적으로 발생시킨 에러) 처리
@@ -39,6 +52,7 @@ async def global_exception_handler(request: Request, exc: Exception):
         return JSONResponse(
             status_code=exc.status_code,
             content={"detail": exc.detail},
+            headers=exc.headers,  # 429/503의 Retry-After 등
         )
 
     # 2. 예기치 못한 에러 (Traceback 포함)
@@ -49,29 +63,66 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 import os
-from fastapi.responses import PlainTextResponse, HTMLResponse
+from datetime import datetime
+from typing import Optional
+from fastapi import Query
+from fastapi.responses import PlainTextResponse, HTMLResponse, StreamingResponse
+from app.services import log_viewer
 
 @app.get("/")
 def read_root():
     return {"message": "WalkMate Server is Running! 🚀"}
 
-@app.get("/logs", description="최근 백엔드 서버 로그 100줄을 확인합니다.")
-def view_logs():
-    # 로그 파일이 저장되는 경로
-    log_path = "logs/app.log"
-    if not os.path.exists(log_path):
+def _log_filter(level, route, since, until, q=None, request_id=None):
+    return log_viewer.LogFilter(level=level, route=route, since=since, until=until, q=q, request_id=request_id)
+
+@app.get("/logs", description="최근 백엔드 서버 로그를 확인합니다. (기본 100줄, 레벨/경로/시간 필터 지원)")
+def view_logs(
+    lines: int = Query(100, ge=1, le=5000, description="가져올 로그 개수"),
+    level: Optional[str] = Query(None, description="최소 로그 레벨 (INFO, WARNING, ERROR...)"),
+    route: Optional[str] = Query(None, description="요청 경로 (예: /api/v1/reports/)"),
+    since: Optional[datetime] = Query(None, description="시작 시각 (예: 2026-02-20T09:00:00)"),
+    until: Optional[datetime] = Query(None, description="종료 시각"),
+    request_id: Optional[str] = Query(None, description="요청 ID (시작/완료 줄의 'ID: ...')"),
+):
+    if not os.path.exists(log_viewer.LOG_FILE):
         return PlainTextResponse("No logs found.", status_code=404)
     
     try:
-        # 마지막 100줄만 읽기
-        with open(log_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-            tail_lines = lines[-100:] 
-            
-        return PlainTextResponse("".join(tail_lines))
+        # 파일 끝에서부터 거꾸로 읽어서 필요한 줄만 가져옴 (필요 시 회전된 파일까지)
+        tail_lines = log_viewer.tail(lines, _log_filter(level, route, since, until, request_id=request_id))
+        return PlainTextResponse("\n".join(tail_lines) + ("\n" if tail_lines else ""))
     except Exception as e:
         return PlainTextResponse(f"Error reading logs: {str(e)}", status_code=500)
 
+@app.get("/logs/search", description="회전된 로그 파일(app.log.YYYY-MM-DD)까지 포함해 검색합니다.")
+def search_logs(
+    q: Optional[str] = Query(None, description="검색어"),
+    level: Optional[str] = Query(None),
+    route: Optional[str] = Query(None),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    request_id: Optional[str] = Query(None),
+    limit: int = Query(1000, ge=1, le=100000),
+):
+    records = log_viewer.search(_log_filter(level, route, since, until, q, request_id), limit=limit)
+    # 파일 전체를 메모리에 올리지 않고 찾은 레코드를 바로바로 흘려보냄
+    return StreamingResponse((r + "\n" for r in records), media_type="text/plain; charset=utf-8")
+
+@app.get("/logs/stream", description="새 로그를 실시간으로 받아봅니다. (Server-Sent Events)")
+def stream_logs(
+    level: Optional[str] = Query(None),
+    route: Optional[str] = Query(None),
+    backlog: int = Query(20, ge=0, le=1000, description="연결 직후 보내줄 최근 로그 개수"),
+):
+    if not os.path.exists(log_viewer.LOG_FILE):
+        return PlainTextResponse("No logs found.", status_code=404)
+    return StreamingResponse(
+        log_viewer.follow(_log_filter(level, route, None, None), backlog=backlog),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.get("/mirror", description="임시: DB에 적재되는 x,y,w,h 실시간 미러링 페이지")
 def view_mirror():
     html_content = """
@@ -173,26 +224,129 @@ def view_mirror():
     """
     return HTMLResponse(content=html_content)
 
+@app.get("/metrics", description="Prometheus 포맷 성능 지표 (라우트별 지연시간, 외부 의존성, 이벤트 루프 지연)")
+def view_metrics():
+    return PlainTextResponse(metrics.render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.on_event("startup")
+async def start_loop_lag_monitor():
+    app.state.loop_lag_task = asyncio.create_task(metrics.monitor_event_loop_lag())
+
+# 기동 준비: 외부 클라이언트 생성 + 연결 열기 + 주변 위험물 인덱스 적재가 끝나야 /ready 가 200 (그 전에는 트래픽을 받지 않도록)
+app.state.ready = False
+
+async def warmup_clients():
+    delay = 1
+    while True:
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(
+                run_in_threadpool(database.warmup),
+                run_in_threadpool(s3_uploader.warmup),
+                run_in_threadpool(nearby_index.refresh),
+            )
+        except Exception as e:
+            logger.error(f"❌ Warmup failed (retry in {delay}s): {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+            continue
+        app.state.ready = True
+        logger.info(f"✅ Warmup finished in {time.perf_counter() - start:.2f}s")
+        return
+
+@app.on_event("startup")
+async def start_warmup():
+    app.state.warmup_task = asyncio.create_task(warmup_clients())
+    nearby_index.start()
+
+@app.on_event("shutdown")
+async def stop_nearby_index():
+    await nearby_index.stop()
+
+@app.get("/ready", description="기동 준비(클라이언트 생성, 연결 열기, 인덱스 적재) 완료 여부 (readiness probe)")
+def read_ready():
+    if not app.state.ready:
+        return JSONResponse(status_code=503, content={"ready": False})
+    return {"ready": True}
+
+@app.on_event("startup")
+async def start_report_spool():
+    # REPORT_ACCEPT_MODE=spool 일 때만: 재시작 전에 남은 접수 건부터 이어서 처리
+    if report_spool.enabled:
+        report_spool.start()
+
+@app.on_event("shutdown")
+async def stop_report_spool():
+    await report_spool.stop()
+
+@app.on_event("shutdown")
+def flush_logs():
+    # 종료 시 큐에 남아있는 로그를 모두 기록
+    stop_logger()
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     # 1. 입구: 어떤 주소로 어떤 메서드가 들어왔는지 기록 (IP 포함)
+    # (로그는 큐에 넣기만 하고, 콘솔/파일 기록은 백그라운드 스레드가 처리)
     user_agent = request.headers.get("user-agent", "unknown")
-    logger.info(f"➡️ [요청 시작] {request.method} {request.url.path} | Device: {user_agent}")
+    method, route = request.method, request.url.path
+    # 프로파일링 대상 요청인지 결정 (X-Profile 헤더 또는 샘플링, 평소에는 None)
+    profile = profiler.start_request(request)
+    # 시작/완료 줄을 잇는 요청 ID (완료 줄에도 method/route 를 남겨 경로 필터가 둘 다 잡도록)
+    request_id = uuid.uuid4().hex[:12]
+    sampled = sample_request()
+    if sampled:
+        logger.info(
+            f"➡️ [요청 시작] {method} {route} | Device: {user_agent} | ID: {request_id}",
+            extra={
+                "event": "request_start", "method": method, "route": route, "device": user_agent,
+                "request_id": request_id,
+            },
+        )
 
+    metrics.REQUESTS_IN_FLIGHT.inc()
+    status = None
     try:
         # 2. 본문(라우터) 실행
         response = await call_next(request)
 
-        # 3. 출구: 걸린 시간과 결과 코드 기록
-        process_time = (time.time() - start_time) * 1000
-        
-        logger.info(
-            f"⬅️ [요청 완료] {response.status_code} | 소요시간: {process_time:.2f}ms"
+        # 3. 출구: 걸린 시간과 결과 코드 기록 (에러 응답은 샘플링과 무관하게 기록)
+        elapsed = time.perf_counter() - start_time
+        process_time = elapsed * 1000
+        status = response.status_code
+
+        # 라우트 템플릿(/reports/{item_id})으로 집계 -> 경로별 라벨 폭증 방지
+        matched = request.scope.get("route")
+        metrics.REQUEST_LATENCY.observe(
+            elapsed, method, getattr(matched, "path", "unmatched"), str(status)
         )
+
+        with profiler.span("logging"):
+            # 시작 줄을 남긴 요청은 완료 줄도 남기고, 에러는 샘플링과 무관하게 남김 (다시 추첨하지 않음)
+            if sampled or status >= 400:
+                logger.info(
+                    f"⬅️ [요청 완료] {method} {route} {status} | 소요시간: {process_time:.2f}ms | ID: {request_id}",
+                    extra={
+                        "event": "request_end", "method": method, "route": route,
+                        "status": status, "duration_ms": round(process_time, 2), "device": user_agent,
+                        "request_id": request_id,
+                    },
+                )
+
+        if profile is not None:
+            response.headers["X-Profile-Id"] = profile.id
         
         return response
     except Exception as e:
         # 미들웨어에서 놓친 에러가 있다면 여기서도 잡힐 수 있음
-        raise e
\ No newline at end of file
+        matched = request.scope.get("route")
+        metrics.REQUEST_LATENCY.observe(
+            time.perf_counter() - start_time, method, getattr(matched, "path", "unmatched"), "500"
+        )
+        raise e
+    finally:
+        metrics.REQUESTS_IN_FLIGHT.dec()
+        if profile is not None:
+            profiler.finish_request(profile, status or 500)
\ No newline at end of file
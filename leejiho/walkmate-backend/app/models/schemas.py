@@ -1,10 +1,11 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, Literal
+from typing import List, Optional, Literal
+from uuid import UUID
 
 # 1. [공통] 모든 모델의 base
 class ReportBase(BaseModel):
-    device_id: str
+    user_id: str
     hazard_type: str
     latitude: float  
     longitude: float
@@ -25,7 +26,7 @@ class ReportCreate(ReportBase):
 
 # 3. [출력] DB에서 꺼내서 보여줄 때 사용하는 양식 (Response)
 class ReportResponse(ReportBase):
-    id: int
+    item_id: str
     created_at: datetime
     status: str 
 
@@ -33,10 +34,61 @@ class ReportResponse(ReportBase):
     class Config:
         from_attributes = True
 
+# 3-1. [출력] 관리자 목록 (crud.get_all_reports 반환 형태: 전체 건수 + 한 페이지)
+class ReportPage(BaseModel):
+    total: Optional[int] = None
+    data: List[ReportResponse]
+
+# 3-2. [출력] 지도 마커 (crud.get_reports_for_map 반환 형태)
+class MapMarker(BaseModel):
+    item_id: str
+    latitude: float
+    longitude: float
+    hazard_type: str
+    distance: Optional[float] = None
+    direction: Optional[Literal['L', 'C', 'R']] = None
+    risk_level: int = 1
+    status: str
+    created_at: Optional[datetime] = None
+
 # 4. [수정] 관리자가 상태를 변경할 때 사용하는 양식 (Update)
 class ReportUpdate(BaseModel):
     status: Literal['new', 'processing', 'done', 'hidden']
 
+# 5. [일괄 수정] item_id 목록 또는 필터 조건으로 여러 건의 상태를 한 번에 변경
+class ReportBulkFilter(BaseModel):
+    min_lat: Optional[float] = None
+    min_lng: Optional[float] = None
+    max_lat: Optional[float] = None
+    max_lng: Optional[float] = None
+    hazard_type: Optional[str] = None
+    older_than: Optional[datetime] = None  # 이 시각 이전에 생성된 신고만
+
+class ReportBulkStatusUpdate(BaseModel):
+    status: Literal['new', 'processing', 'done', 'hidden']
+    item_ids: Optional[List[UUID]] = Field(None, max_length=1000)  # 형식이 틀리면 422 (DB 캐스팅 오류 500 대신)
+    filter: Optional[ReportBulkFilter] = None
+
+# 6. [앱 직접 업로드] presigned POST 발급 요청 / 업로드 후 메타데이터 제출
+class UploadUrlRequest(BaseModel):
+    content_type: Literal['image/jpeg', 'image/png', 'image/webp'] = 'image/jpeg'
+
+class ReportSubmit(BaseModel):
+    item_id: str
+    user_id: str
+    latitude: float
+    longitude: float
+    distance: float
+    direction: Literal['L', 'C', 'R']
+    x: float
+    y: float
+    w: float
+    h: float
+    hazard_type: str
+    risk_level: int
+    description: Optional[str] = None
+    image_key: str = Field(..., pattern=r"^[0-9a-f-]{36}\.(jpg|png|webp)$")  # upload-url 응답의 key
+
 # [추가] 히트맵 전용 초경량 응답 모델 (불필요한 데이터 제거)
 class HeatmapResponse(BaseModel):
     lat: float
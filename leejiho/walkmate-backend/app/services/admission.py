@@ -0,0 +1,180 @@
+import math
+import threading
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException, Request
+
+from app.core import metrics
+from app.core.config import settings
+
+import logging
+logger = logging.getLogger("API_LOGGER")
+
+# 신고 접수 입장 제어 (부하 차단)
+#
+# 오탐지 루프에 빠진 앱 하나가 S3 / Supabase를 포화시키면 지도, 길안내까지 같이 느려지므로
+#   1) 기기별 토큰 버킷 : 기기 하나가 초당 INGEST_RATE_PER_DEVICE건(버스트 INGEST_BURST_PER_DEVICE) 초과 -> 429
+#   2) 전체 동시 처리 수 : 접수 처리 중인 요청이 INGEST_MAX_CONCURRENCY개 이상 -> 503
+#   3) 지연 예산         : 최근 접수 처리 시간(EWMA)이 INGEST_LATENCY_BUDGET초를 넘으면
+#                          동시 처리 한도를 1/4로 줄여 하류가 회복할 때까지 덜 보냄 -> 503
+# 거절 응답에는 Retry-After(초)를 넣어 앱이 그만큼 기다렸다 재전송하도록 합니다.
+
+DEVICE_HEADER = "X-Device-Id"
+BUCKET_SWEEP_INTERVAL = 60.0
+LATENCY_EWMA_ALPHA = 0.2
+
+
+class TokenBucketLimiter:
+    """키별 토큰 버킷 (검사 O(1), 오래 안 쓴 버킷은 BUCKET_SWEEP_INTERVAL마다 정리)"""
+
+    def __init__(self, rate: float, burst: float, idle_ttl: float):
+        self.rate = rate
+        self.burst = burst
+        self.idle_ttl = idle_ttl
+        self._buckets: dict[str, list[float]] = {}  # key -> [남은 토큰, 마지막 갱신 시각]
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    def acquire(self, key: str) -> float:
+        """토큰 1개 사용. 허용이면 0, 거절이면 토큰이 찰 때까지 기다려야 하는 초"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sweep >= BUCKET_SWEEP_INTERVAL:
+                self._sweep(now)
+
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, now]
+            else:
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1.0:
+                bucket[0] -= 1.0
+                return 0.0
+            return (1.0 - bucket[0]) / self.rate
+
+    def _sweep(self, now: float):
+        # idle_ttl 동안 요청이 없던 버킷은 이미 가득 찬 상태와 같으므로 지워도 동작이 같음
+        stale = [k for k, (_, updated) in self._buckets.items() if now - updated >= self.idle_ttl]
+        for key in stale:
+            del self._buckets[key]
+        self._last_sweep = now
+        metrics.INGEST_TRACKED_DEVICES.set(len(self._buckets))
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class IngestGate:
+    """접수 경로 전체 동시 처리 수 + 지연 예산"""
+
+    def __init__(self, max_concurrency: int, latency_budget: float):
+        self.max_concurrency = max_concurrency
+        self.latency_budget = latency_budget
+        self.in_flight = 0
+        self.latency_ewma = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def over_budget(self) -> bool:
+        return self.latency_budget > 0 and self.latency_ewma > self.latency_budget
+
+    def limit(self) -> int:
+        return max(1, self.max_concurrency // 4) if self.over_budget else self.max_concurrency
+
+    def try_enter(self) -> bool:
+        with self._lock:
+            if self.in_flight >= self.limit():
+                return False
+            self.in_flight += 1
+        metrics.INGEST_IN_FLIGHT.inc()
+        return True
+
+    def leave(self, elapsed: float | None):
+        with self._lock:
+            self.in_flight -= 1
+            if elapsed is not None:
+                self.latency_ewma += LATENCY_EWMA_ALPHA * (elapsed - self.latency_ewma)
+        metrics.INGEST_IN_FLIGHT.dec()
+        metrics.INGEST_LATENCY_EWMA.set(self.latency_ewma)
+
+
+class AdmissionTicket:
+    """
+    admit() 가 넘겨주는 표식. 실제 접수 처리(업로드/저장/스풀 기록)를 했으면 mark_work() 호출
+    (멱등 재전송처럼 캐시된 응답만 돌려준 요청은 지연 통계에서 빼기 위해)
+    """
+
+    __slots__ = ("worked",)
+
+    def __init__(self):
+        self.worked = False
+
+    def mark_work(self):
+        self.worked = True
+
+
+def _server_failure(exc: BaseException) -> bool:
+    # 하류(S3 / Supabase) 장애로 볼 수 있는 실패: HTTPException 이 아닌 예외 또는 5xx
+    if isinstance(exc, HTTPException):
+        return exc.status_code >= 500
+    return isinstance(exc, Exception)
+
+
+def _reject(status_code: int, reason: str, retry_after: float):
+    metrics.INGEST_REJECTED.inc(reason)
+    raise HTTPException(
+        status_code=status_code,
+        detail="Too many reports from this device" if status_code == 429 else "Report ingestion overloaded",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class IngestAdmission:
+    def __init__(self):
+        self.limiter = TokenBucketLimiter(
+            rate=settings.INGEST_RATE_PER_DEVICE,
+            burst=settings.INGEST_BURST_PER_DEVICE,
+            idle_ttl=settings.INGEST_BUCKET_IDLE_TTL,
+        )
+        self.gate = IngestGate(
+            max_concurrency=settings.INGEST_MAX_CONCURRENCY,
+            latency_budget=settings.INGEST_LATENCY_BUDGET,
+        )
+
+    @asynccontextmanager
+    async def admit(self, request: Request, user_id: str):
+        """
+        async with ingest_admission.admit(request, user_id) as ticket: ... (접수 처리)
+        기기 키는 X-Device-Id 헤더, 없으면 user_id
+
+        지연 통계(EWMA)에 넣는 요청
+          - 성공: 실제 처리를 한 경우만 (ticket.mark_work(), 멱등 재전송 응답은 제외)
+          - 실패: 서버 쪽 실패(5xx / 예외)는 항상 (느리게 실패하는 하류 장애를 잡기 위해), 빠른 4xx 는 제외
+        """
+        device = request.headers.get(DEVICE_HEADER) or user_id
+        wait = self.limiter.acquire(device)
+        if wait > 0:
+            logger.warning(f"🚦 Device rate limited: {device} (retry in {wait:.1f}s)")
+            _reject(429, "device_rate", wait)
+
+        if not self.gate.try_enter():
+            _reject(503, "latency_budget" if self.gate.over_budget else "concurrency", 1)
+
+        ticket = AdmissionTicket()
+        start = time.perf_counter()
+        record = False
+        try:
+            yield ticket
+            record = ticket.worked
+        except BaseException as e:
+            # 처리 도중 취소(클라이언트가 기다리다 끊음)도 느린 하류 때문일 수 있으므로 처리를 시작했으면 포함
+            record = _server_failure(e) or (ticket.worked and not isinstance(e, HTTPException))
+            raise
+        finally:
+            self.gate.leave(time.perf_counter() - start if record else None)
+
+
+ingest_admission = IngestAdmission()
@@ -0,0 +1,258 @@
+import argparse
+import math
+import os
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+
+from app.crud import hotspot as crud_hotspot
+
+import logging
+logger = logging.getLogger("API_LOGGER")
+
+# 위험물 밀집 구역(hotspot) 집계 작업
+#
+# 활성(new / processing) 신고를 DBSCAN으로 묶어 report_hotspots 테이블에 저장합니다.
+#   - 좌표는 tile 중심 위도 기준 등장방형 투영(미터)으로 바꿔 계산
+#   - 이웃 탐색은 eps 크기 격자 해시 (점 하나당 주변 9칸만 확인)
+#   - 위경도 격자(HOTSPOT_TILE_DEG) 단위로 나눠, 지난 실행 이후 바뀐 신고가 있는 tile만 다시 계산
+#     (tile + halo 범위의 점으로 군집을 만들고, 중심점이 그 tile 안에 있는 군집만 그 tile 소속으로 저장)
+#   - 위험도는 고정 기준 시각(HOTSPOT_EPOCH)에 맞춘 log2 값(risk_log2)으로 저장하고, 조회 시점에 감쇠
+#     (다시 계산되지 않은 tile의 hotspot도 같은 시각 기준으로 비교되고, 오래되면 점수가 계속 줄어듦)
+# 실행: python -m app.services.hotspots [--full] [--loop 300]
+
+HOTSPOT_EPS_M = float(os.getenv("HOTSPOT_EPS_M", "30"))           # 이웃 반경 (m)
+HOTSPOT_MIN_SAMPLES = int(os.getenv("HOTSPOT_MIN_SAMPLES", "5"))   # 핵심점이 되기 위한 최소 이웃 수 (자신 포함)
+HOTSPOT_TILE_DEG = float(os.getenv("HOTSPOT_TILE_DEG", "0.01"))    # 약 1.1km (위도 방향)
+HOTSPOT_HALO_DEG = float(os.getenv("HOTSPOT_HALO_DEG", "0.002"))   # 약 220m, 이보다 큰 군집은 잘릴 수 있음
+HOTSPOT_HALF_LIFE_DAYS = float(os.getenv("HOTSPOT_HALF_LIFE_DAYS", "14"))
+HOTSPOT_EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+# reports.updated_at 은 트랜잭션 시작 시각이라 늦게 커밋된 행을 놓치지 않도록 조금 겹쳐서 다시 봄
+WATERMARK_OVERLAP = timedelta(minutes=1)
+
+METERS_PER_DEG_LAT = 110_540.0
+METERS_PER_DEG_LNG = 111_320.0
+
+
+# 1. 군집화
+def project(points: list[dict], ref_lat: float) -> list[tuple[float, float]]:
+    kx = METERS_PER_DEG_LNG * math.cos(math.radians(ref_lat))
+    return [(p["longitude"] * kx, p["latitude"] * METERS_PER_DEG_LAT) for p in points]
+
+
+def dbscan(xy: list[tuple[float, float]], eps: float, min_samples: int) -> list[int]:
+    """점마다 군집 번호 (-1 = 노이즈)"""
+    grid = defaultdict(list)
+    for i, (x, y) in enumerate(xy):
+        grid[(int(x // eps), int(y // eps))].append(i)
+
+    eps2 = eps * eps
+
+    def neighbors(i):
+        x, y = xy[i]
+        cx, cy = int(x // eps), int(y // eps)
+        found = []
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                for j in grid.get((gx, gy), ()):
+                    dx, dy = xy[j][0] - x, xy[j][1] - y
+                    if dx * dx + dy * dy <= eps2:
+                        found.append(j)
+        return found
+
+    labels = [None] * len(xy)
+    cluster = 0
+    for i in range(len(xy)):
+        if labels[i] is not None:
+            continue
+        seeds = neighbors(i)
+        if len(seeds) < min_samples:
+            labels[i] = -1
+            continue
+
+        labels[i] = cluster
+        queue = [j for j in seeds if j != i]
+        while queue:
+            j = queue.pop()
+            if labels[j] == -1:
+                labels[j] = cluster  # 노이즈였던 경계점
+            if labels[j] is not None:
+                continue
+            labels[j] = cluster
+            more = neighbors(j)
+            if len(more) >= min_samples:
+                queue.extend(more)
+        cluster += 1
+    return labels
+
+
+def convex_hull(coords: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    # Andrew monotone chain, (lng, lat)
+    pts = sorted(set(coords))
+    if len(pts) <= 2:
+        return pts
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower, upper = [], []
+    for p in pts:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    for p in reversed(pts):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    return lower[:-1] + upper[:-1]
+
+
+def hull_polygon(members: list[dict], pad_deg: float) -> dict:
+    ring = convex_hull([(p["longitude"], p["latitude"]) for p in members])
+    if len(ring) < 3:
+        # 점이 한 곳/한 줄에 몰려 면적이 없으면 bbox를 eps 절반만큼 키운 사각형
+        lngs = [p[0] for p in ring]
+        lats = [p[1] for p in ring]
+        w, e = min(lngs) - pad_deg, max(lngs) + pad_deg
+        s, n = min(lats) - pad_deg, max(lats) + pad_deg
+        ring = [(w, s), (e, s), (e, n), (w, n)]
+    ring = [[round(lng, 7), round(lat, 7)] for lng, lat in ring]
+    return {"type": "Polygon", "coordinates": [ring + [ring[0]]]}
+
+
+def _parse_ts(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _half_lives(ts: datetime) -> float:
+    return (ts - HOTSPOT_EPOCH).total_seconds() / 86400 / HOTSPOT_HALF_LIFE_DAYS
+
+
+def risk_log2(members: list[dict], created: list[datetime]) -> float:
+    """
+    log2( sum(risk_level x 2^((created - EPOCH) / half_life)) )
+    최근 신고일수록 가중치 큼 (HOTSPOT_HALF_LIFE_DAYS 마다 절반). 기준 시각이 고정이라 계산 시점과 무관
+    """
+    exps = [math.log2(p.get("risk_level") or 1) + _half_lives(ts) for p, ts in zip(members, created)]
+    top = max(exps)
+    return top + math.log2(sum(2 ** (e - top) for e in exps))
+
+
+def decayed_score(log2_score: float | None, now: datetime | None = None) -> float | None:
+    """저장된 risk_log2 -> now 시점의 위험 점수"""
+    if log2_score is None:
+        return None
+    return round(2 ** (log2_score - _half_lives(now or datetime.now(timezone.utc))), 3)
+
+
+def summarize(members: list[dict], now: datetime) -> dict:
+    hazards = Counter(p["hazard_type"] for p in members)
+    created = [_parse_ts(p["created_at"]) for p in members]
+    log2_score = risk_log2(members, created)
+    return {
+        "report_count": len(members),
+        "dominant_hazard": hazards.most_common(1)[0][0],
+        "hazard_counts": dict(hazards),
+        "risk_log2": log2_score,
+        "risk_score": decayed_score(log2_score, now),  # 계산 시점 값 (참고용)
+        "center_lat": sum(p["latitude"] for p in members) / len(members),
+        "center_lng": sum(p["longitude"] for p in members) / len(members),
+        "polygon": hull_polygon(members, HOTSPOT_EPS_M / 2 / METERS_PER_DEG_LAT),
+        "first_reported_at": min(created).isoformat(),
+        "last_reported_at": max(created).isoformat(),
+    }
+
+
+# 2. tile 단위 계산
+def tile_key(ty: int, tx: int) -> str:
+    return f"{ty}_{tx}"
+
+
+def compute_tile(ty: int, tx: int, now: datetime) -> list[dict]:
+    min_lat, min_lng = ty * HOTSPOT_TILE_DEG, tx * HOTSPOT_TILE_DEG
+    max_lat, max_lng = min_lat + HOTSPOT_TILE_DEG, min_lng + HOTSPOT_TILE_DEG
+    points = crud_hotspot.get_active_points(
+        min_lat - HOTSPOT_HALO_DEG, min_lng - HOTSPOT_HALO_DEG,
+        max_lat + HOTSPOT_HALO_DEG, max_lng + HOTSPOT_HALO_DEG,
+    )
+    if len(points) < HOTSPOT_MIN_SAMPLES:
+        return []
+
+    labels = dbscan(project(points, (min_lat + max_lat) / 2), HOTSPOT_EPS_M, HOTSPOT_MIN_SAMPLES)
+    clusters = defaultdict(list)
+    for point, label in zip(points, labels):
+        if label >= 0:
+            clusters[label].append(point)
+
+    key = tile_key(ty, tx)
+    hotspots = []
+    for members in clusters.values():
+        summary = summarize(members, now)
+        # 이웃 tile과 halo가 겹치므로 중심점이 이 tile 안에 있는 군집만 저장 (중복 방지)
+        if not (min_lat <= summary["center_lat"] < max_lat and min_lng <= summary["center_lng"] < max_lng):
+            continue
+        hotspots.append(summary)
+
+    # 같은 tile 안에서는 위험도 순으로 번호 매김
+    hotspots.sort(key=lambda h: h["risk_log2"], reverse=True)
+    for n, h in enumerate(hotspots):
+        h["hotspot_id"] = f"{key}:{n}"
+        h["tile"] = key
+    return hotspots
+
+
+# 3. 작업 1회 실행
+def run_once(full: bool = False, flush_tiles: int = 50) -> dict:
+    started = time.perf_counter()
+    now = datetime.now(timezone.utc)
+
+    last = None if full else crud_hotspot.get_last_run()
+    since = None
+    if last and last.get("watermark"):
+        since = (_parse_ts(last["watermark"]) - WATERMARK_OVERLAP).isoformat()
+
+    dirty = crud_hotspot.get_dirty_tiles(since, HOTSPOT_TILE_DEG, HOTSPOT_HALO_DEG)
+    tiles = [tuple(t) for t in dirty["tiles"]]
+
+    # 여러 tile의 결과를 모아 한 번에 교체 (tile 수만큼 왕복하지 않도록)
+    total, batch_tiles, batch_hotspots = 0, [], []
+    for ty, tx in tiles:
+        batch_tiles.append(tile_key(ty, tx))
+        batch_hotspots.extend(compute_tile(ty, tx, now))
+        if len(batch_tiles) >= flush_tiles:
+            total += crud_hotspot.replace_hotspots(batch_tiles, batch_hotspots) or 0
+            batch_tiles, batch_hotspots = [], []
+    if batch_tiles:
+        total += crud_hotspot.replace_hotspots(batch_tiles, batch_hotspots) or 0
+
+    watermark = dirty.get("watermark") or (last or {}).get("watermark")
+    crud_hotspot.save_run(watermark, len(tiles), total, now.isoformat())
+
+    result = {"tiles": len(tiles), "hotspots": total, "seconds": round(time.perf_counter() - started, 2)}
+    logger.info(f"🗺️ Hotspot run: {result['tiles']} tiles, {result['hotspots']} hotspots ({result['seconds']}s)")
+    return result
+
+
+# 4. 조회 (위험 점수는 지금 시각 기준으로 감쇠)
+def list_hotspots(**filters) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    rows = crud_hotspot.get_hotspots(**filters)
+    for row in rows:
+        row["risk_score"] = decayed_score(row.pop("risk_log2", None), now)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="위험물 밀집 구역(hotspot) 집계")
+    parser.add_argument("--full", action="store_true", help="지난 실행 기록을 무시하고 전체 tile 재계산")
+    parser.add_argument("--loop", type=float, default=0, help="지정 시 N초마다 반복 실행")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    full = args.full
+    while True:
+        run_once(full=full)
+        if not args.loop:
+            break
+        full = False
+        time.sleep(args.loop)
@@ -0,0 +1,109 @@
+import asyncio
+import os
+import threading
+
+from cachetools import TTLCache
+from fastapi.concurrency import run_in_threadpool
+
+from app.crud import report as crud_report
+
+import logging
+logger = logging.getLogger("API_LOGGER")
+
+# 신고 중복 접수 방지 (item_id 기준 멱등 처리)
+#
+# 앱은 item_id를 직접 만들어 보내므로, 타임아웃 후 재시도하면 같은 item_id가 다시 들어옵니다.
+#   1) 최근 처리한 item_id -> 응답 캐시 (메모리, TTL)    : 바로 이전 응답 반환
+#   2) 같은 item_id가 처리 중이면                       : 먼저 들어온 요청의 결과를 기다림
+#   3) DB에 이미 있으면 (다른 워커/재시작 이후)          : 저장된 행으로 응답 재구성
+#   4) 그래도 INSERT가 23505(unique_violation)로 실패하면 : 먼저 저장된 행으로 응답
+# 1~3에 해당하면 S3 업로드와 INSERT를 다시 하지 않습니다.
+
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", "3600"))
+
+
+def created_response(item_id: str, image_url: str) -> dict:
+    return {
+        "success": True,
+        "item_id": item_id,
+        "image_url": image_url,
+        "message": "Report created successfully."
+    }
+
+
+class IdempotencyGuard:
+    def __init__(self, maxsize: int = IDEMPOTENCY_CACHE_SIZE, ttl: int = IDEMPOTENCY_TTL):
+        self._recent = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def _remember(self, item_id: str, result: dict):
+        with self._lock:
+            self._recent[item_id] = result
+
+    def _recall(self, item_id: str) -> dict | None:
+        with self._lock:
+            return self._recent.get(item_id)
+
+    async def run(self, item_id: str, create, check_db: bool = True):
+        """
+        create: 실제 접수(업로드 + INSERT)를 수행하고 응답 dict를 돌려주는 async 함수
+        check_db: False면 3) DB 조회를 생략 (스풀 접수처럼 요청 경로에서 DB를 건드리지 않을 때)
+        """
+        while True:
+            cached = self._recall(item_id)
+            if cached is not None:
+                return cached
+
+            pending = self._inflight.get(item_id)
+            if pending is None:
+                break
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # 이 요청 자체가 취소됨
+                # 먼저 온 요청이 취소됐으면 (연결 끊김 / 종료) 이 요청이 다시 시도
+                continue
+            except Exception:
+                # 먼저 온 요청이 실패했으면 이 요청이 다시 시도
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[item_id] = future
+        try:
+            result = await (self._create_once(item_id, create) if check_db else create())
+            self._remember(item_id, result)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 기다리는 요청이 없어도 "never retrieved" 경고가 나지 않도록
+            raise
+        finally:
+            # 취소(CancelledError)로 빠져나가도 기다리던 요청이 멈춰 있지 않도록
+            if not future.done():
+                future.cancel()
+            self._inflight.pop(item_id, None)
+
+    async def _create_once(self, item_id: str, create) -> dict:
+        existing = await run_in_threadpool(crud_report.get_report_by_id, item_id)
+        if existing:
+            logger.info(f"♻️ Duplicate report ignored: {item_id}")
+            return created_response(existing["item_id"], existing["image_url"])
+
+        try:
+            return await create()
+        except Exception as e:
+            if not crud_report.is_unique_violation(e):
+                raise
+            # 다른 워커가 같은 item_id를 먼저 저장한 경우
+            existing = await run_in_threadpool(crud_report.get_report_by_id, item_id)
+            if not existing:
+                raise
+            logger.info(f"♻️ Duplicate report resolved after conflict: {item_id}")
+            return created_response(existing["item_id"], existing["image_url"])
+
+
+report_guard = IdempotencyGuard()
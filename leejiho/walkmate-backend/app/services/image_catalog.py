@@ -0,0 +1,63 @@
+import base64
+import json
+import re
+from datetime import datetime
+
+from app.crud import report as crud_report
+from app.services.s3_uploader import s3_uploader
+
+import logging
+logger = logging.getLogger("API_LOGGER")
+
+# 신고 이미지 목록 (reports 테이블 기준, 최신순 페이지네이션)
+#
+# 버킷 전체를 list_objects_v2 로 훑지 않고, 신고마다 저장된 image_url 을
+# (created_at, item_id) 키셋으로 페이지 단위 조회합니다. -> 페이지 N 조회 비용 = O(페이지 크기)
+# presigned URL 은 S3Uploader 캐시에서 만료 직전까지 재사용합니다.
+
+ITEM_ID_RE = re.compile(r"^[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}$")  # 앱이 만든 UUID
+
+
+def encode_cursor(row: dict) -> str:
+    raw = json.dumps([row["created_at"], row["item_id"]]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    클라이언트가 보낸 커서 -> (created_at, item_id)
+    두 값은 PostgREST or_ 필터 문자열에 그대로 들어가므로 형식을 검사 (잘못되면 ValueError -> 400)
+    """
+    created_at, item_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    if not isinstance(created_at, str) or not isinstance(item_id, str):
+        raise ValueError("Invalid cursor")
+    datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+    if not ITEM_ID_RE.match(item_id):
+        raise ValueError("Invalid cursor")
+    return created_at, item_id
+
+
+def list_images(limit: int = 30, cursor: str | None = None) -> dict:
+    rows = crud_report.get_image_page(limit=limit, cursor=decode_cursor(cursor) if cursor else None)
+
+    items = []
+    for row in rows:
+        key = s3_uploader.key_from_url(row.get("image_url"))
+        if not key:
+            continue
+        try:
+            url = s3_uploader.presigned_url(key)
+        except Exception as e:
+            logger.warning(f"Failed to generate presigned URL for {key}: {e}")
+            continue
+        items.append({
+            "item_id": row["item_id"],
+            "created_at": row["created_at"],
+            "hazard_type": row.get("hazard_type"),
+            "status": row.get("status"),
+            "url": url,
+        })
+
+    # 다음 페이지 커서는 (URL 생성 실패로 빠진 항목과 무관하게) 조회한 마지막 행 기준
+    next_cursor = encode_cursor(rows[-1]) if len(rows) == limit else None
+    return {"items": items, "next_cursor": next_cursor}
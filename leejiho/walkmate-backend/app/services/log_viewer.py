@@ -0,0 +1,225 @@
+import asyncio
+import glob
+import os
+import re
+from datetime import datetime, timedelta
+
+from app.core.logger import LOG_DIR
+
+# 로그 뷰어 (logs/app.log + 회전된 app.log.YYYY-MM-DD)
+#
+# - tail  : 파일 끝에서부터 블록 단위로 거꾸로 읽어서 마지막 N개 레코드만 가져옴 (파일 전체를 읽지 않음)
+# - search: 회전된 파일까지 한 줄씩 스트리밍하며 검색 (시간 범위 밖의 파일은 열지 않음)
+# - follow: 새로 추가되는 줄을 계속 읽어서 SSE로 전달 (자정 회전 감지)
+
+LOG_FILE = os.path.join(LOG_DIR, "app.log")
+BLOCK_SIZE = 64 * 1024
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+
+# "2026-02-23 10:05:41,100 - INFO - 메시지"
+HEADER_RE = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}),\d{3} - (\w+) - ")
+ROTATED_RE = re.compile(r"app\.log\.(\d{4}-\d{2}-\d{2})$")
+
+
+def _local_naive(value: datetime | None) -> datetime | None:
+    # 로그 시각은 서버 로컬 시각(naive)이므로, 시간대가 붙어 온 값은 로컬 시각으로 바꾼 뒤 tzinfo 제거
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+# 1. 레코드 필터 (여러 줄짜리 Traceback은 앞의 헤더 줄과 한 레코드로 취급)
+class LogFilter:
+    def __init__(self, level: str | None = None, route: str | None = None,
+                 since: datetime | None = None, until: datetime | None = None, q: str | None = None,
+                 request_id: str | None = None):
+        self.min_level = LEVELS.get(level.upper(), 0) if level else 0
+        self.route = route
+        self.since = _local_naive(since)
+        self.until = _local_naive(until)
+        self.q = q
+        self.request_id = request_id
+        # 요청 시작/완료 줄 모두 "{method} {route}" 를 담으므로 경로 토큰이 정확히 같은 줄만 (접두사 일치 X)
+        self._route_re = re.compile(rf"(?<!\S){re.escape(route)}(?!\S)") if route else None
+        # 같은 요청의 시작/완료 줄은 "ID: {request_id}" 로 연결됨
+        self._request_re = re.compile(rf"\| ID: {re.escape(request_id)}\b") if request_id else None
+
+    def matches(self, record: str) -> bool:
+        m = HEADER_RE.match(record)
+        if not m:
+            # 헤더 없는 조각(파일 맨 앞의 잘린 줄 등)은 조건이 없을 때만 통과
+            return not (self.min_level or self.since or self.until or self.route or self.q or self.request_id)
+
+        if self.min_level and LEVELS.get(m.group(2), 0) < self.min_level:
+            return False
+        if self.since or self.until:
+            ts = datetime.strptime(m.group(1), "%Y-%m-%d %H:%M:%S")
+            if self.since and ts < self.since:
+                return False
+            if self.until and ts > self.until:
+                return False
+        if self._route_re and not self._route_re.search(record):
+            return False
+        if self._request_re and not self._request_re.search(record):
+            return False
+        if self.q and self.q not in record:
+            return False
+        return True
+
+
+# 2. 대상 파일 목록 (최신 -> 과거 순서)
+def log_files_newest_first(since: datetime | None = None, until: datetime | None = None) -> list[str]:
+    rotated = []
+    for path in glob.glob(LOG_FILE + ".*"):
+        m = ROTATED_RE.search(path)
+        if not m:
+            continue
+        day = datetime.strptime(m.group(1), "%Y-%m-%d")
+        # app.log.D 에는 D일 00:00 ~ 다음날 00:00 로그가 들어있음
+        if since and day + timedelta(days=1) <= since:
+            continue
+        if until and day > until:
+            continue
+        rotated.append((day, path))
+
+    files = [LOG_FILE] if os.path.exists(LOG_FILE) else []
+    files += [path for _, path in sorted(rotated, reverse=True)]
+    return files
+
+
+# 3. 파일을 끝에서부터 거꾸로 한 줄씩 읽기
+def iter_lines_reverse(path: str):
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        remainder = b""
+        while pos > 0:
+            read_size = min(BLOCK_SIZE, pos)
+            pos -= read_size
+            f.seek(pos)
+            chunk = f.read(read_size) + remainder
+            lines = chunk.split(b"\n")
+            # 첫 조각은 이전 블록과 이어질 수 있으므로 보류 (멀티바이트 문자 경계도 안전)
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line:
+                    yield line.rstrip(b"\r").decode("utf-8", errors="replace")
+        if remainder:
+            yield remainder.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+def iter_records_reverse(path: str):
+    continuation = []
+    for line in iter_lines_reverse(path):
+        if HEADER_RE.match(line):
+            yield "\n".join([line] + continuation[::-1])
+            continuation = []
+        else:
+            continuation.append(line)
+    if continuation:
+        yield "\n".join(continuation[::-1])
+
+
+def iter_records_forward(path: str):
+    record = None
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if HEADER_RE.match(line):
+                if record is not None:
+                    yield record
+                record = line
+            else:
+                record = line if record is None else record + "\n" + line
+    if record is not None:
+        yield record
+
+
+# 4. 마지막 N개 (필터가 있으면 조건에 맞는 마지막 N개, 필요하면 회전 파일까지 거슬러 올라감)
+def tail(n: int = 100, log_filter: LogFilter | None = None) -> list[str]:
+    if n <= 0:
+        return []
+    log_filter = log_filter or LogFilter()
+    found = []
+    for path in log_files_newest_first(log_filter.since, log_filter.until):
+        for record in iter_records_reverse(path):
+            if log_filter.matches(record):
+                found.append(record)
+                if len(found) >= n:
+                    return found[::-1]
+    return found[::-1]
+
+
+# 5. 회전 파일 포함 검색 (과거 -> 최신 순서로 스트리밍)
+def search(log_filter: LogFilter, limit: int = 1000):
+    if limit <= 0:
+        return
+    count = 0
+    for path in reversed(log_files_newest_first(log_filter.since, log_filter.until)):
+        for record in iter_records_forward(path):
+            if log_filter.matches(record):
+                yield record
+                count += 1
+                if count >= limit:
+                    return
+
+
+# 6. 실시간 follow (Server-Sent Events)
+# 파일 읽기/열기는 모두 스레드에서 (이벤트 루프를 막지 않도록)
+def _sse(record: str) -> str:
+    return "".join(f"data: {line}\n" for line in record.split("\n")) + "\n"
+
+
+def _open_log(at_end: bool):
+    f = open(LOG_FILE, "r", encoding="utf-8", errors="replace")
+    if at_end:
+        f.seek(0, os.SEEK_END)
+    return f, os.fstat(f.fileno()).st_ino
+
+
+def _rotated(f, inode: int) -> bool:
+    try:
+        st = os.stat(LOG_FILE)
+    except FileNotFoundError:
+        return False
+    return st.st_ino != inode or st.st_size < f.tell()
+
+
+async def follow(log_filter: LogFilter | None = None, backlog: int = 20, poll_interval: float = 0.5):
+    log_filter = log_filter or LogFilter()
+
+    for record in await asyncio.to_thread(tail, backlog, log_filter):
+        yield _sse(record)
+
+    f, inode = await asyncio.to_thread(_open_log, True)
+    try:
+        pending = ""
+        last_matched = False  # Traceback 등 이어지는 줄은 직전 헤더의 필터 결과를 따름
+        idle = 0.0
+        while True:
+            lines = await asyncio.to_thread(f.readlines, BLOCK_SIZE)
+            if lines:
+                for line in lines:
+                    pending += line
+                    if not pending.endswith("\n"):
+                        continue  # 아직 다 쓰이지 않은 줄
+                    line, pending = pending.rstrip("\r\n"), ""
+                    if HEADER_RE.match(line):
+                        last_matched = log_filter.matches(line)
+                    if last_matched:
+                        yield _sse(line)
+                idle = 0.0
+                continue
+
+            # 새 줄이 없으면 잠시 대기 (회전되었으면 새 app.log를 다시 엶)
+            await asyncio.sleep(poll_interval)
+            idle += poll_interval
+            if await asyncio.to_thread(_rotated, f, inode):
+                f.close()
+                f, inode = await asyncio.to_thread(_open_log, False)  # 회전 후 새 파일은 처음부터
+            elif idle >= 15:
+                # 하트비트 (프록시가 연결을 끊지 않도록)
+                idle = 0.0
+                yield ": keep-alive\n\n"
+    finally:
+        f.close()
@@ -0,0 +1,117 @@
+import base64
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+from app.crud import report as crud_report
+from app.services.image_catalog import ITEM_ID_RE
+
+# 지도 마커 증분 동기화
+#
+# 클라이언트는 처음 한 번 전체 마커(mode=full)와 version을 받고, 이후에는 since=version 으로
+# 그 뒤에 바뀐 것(mode=delta: upserts / removed)만 받습니다. 변경 건수가 MAP_DELTA_MAX_CHANGES를
+# 넘을 만큼 오래 뒤처졌으면 다시 전체를 내려줍니다.
+# 전체(mode=full)는 MAP_FULL_PAGE_SIZE 건씩 나눠 주며, next_cursor 가 있으면 cursor=next_cursor 로
+# 이어 받습니다. (모든 페이지의 version 은 첫 페이지와 같음, 다 받은 뒤 since=version 으로 전환)
+#
+# change_version 은 INSERT/UPDATE 시점에 시퀀스에서 받지만 커밋 순서는 그와 다를 수 있습니다.
+# (101번을 받은 트랜잭션이 102번보다 늦게 커밋되면 since=102 인 클라이언트가 101을 놓침)
+# 그래서 최근 MAP_DELTA_SETTLE_SECONDS 안에 바뀐 행은 응답에는 넣되 version은 그 앞에서 멈춰,
+# 다음 요청 때 다시 받도록 합니다. (같은 변경을 두 번 받아도 결과는 같음)
+
+# 넘침 확인용으로 +1 건을 더 조회하므로 PostgREST max-rows(기본 1000)보다 작아야 함
+MAP_DELTA_MAX_CHANGES = int(os.getenv("MAP_DELTA_MAX_CHANGES", "500"))
+MAP_DELTA_SETTLE_SECONDS = float(os.getenv("MAP_DELTA_SETTLE_SECONDS", "5"))
+# PostgREST max-rows 이하여야 페이지가 잘리지 않음
+MAP_FULL_PAGE_SIZE = int(os.getenv("MAP_FULL_PAGE_SIZE", "1000"))
+
+INACTIVE_STATUSES = ("done", "hidden")
+MARKER_FIELDS = ("item_id", "hazard_type", "distance", "direction", "risk_level", "status", "latitude", "longitude")
+
+
+def _parse_ts(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def settled_version(entries: list[tuple[int, str]], start: int) -> int:
+    """
+    entries: change_version 오름차순 (version, updated_at)
+    앞에서부터 안정된(settle 시간이 지난) 변경까지만 version 을 올림
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=MAP_DELTA_SETTLE_SECONDS)
+    version = start
+    for v, ts in entries:
+        if ts and _parse_ts(ts) > cutoff:
+            break
+        version = v
+    return version
+
+
+def encode_cursor(version: int, row: dict) -> str:
+    raw = json.dumps([version, row["created_at"], row["item_id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[int, tuple[str, str]]:
+    """(version, (created_at, item_id)) — 형식이 틀리면 ValueError"""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    version, created_at, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    if not isinstance(version, int) or isinstance(version, bool) or version < 0:
+        raise ValueError("invalid cursor version")
+    if not isinstance(created_at, str) or not isinstance(item_id, str) or not ITEM_ID_RE.match(item_id):
+        raise ValueError("invalid cursor position")
+    _parse_ts(created_at)
+    return version, (created_at, item_id)
+
+
+def full_sync(cursor: str | None = None) -> dict:
+    if cursor:
+        version, after = decode_cursor(cursor)
+    else:
+        # 기준 version 을 스냅샷보다 먼저 잡음 (그 사이 바뀐 것은 다음 delta 에서 한 번 더 받음)
+        recent = sorted(
+            (r["change_version"], r["updated_at"]) for r in crud_report.get_recent_change_versions()
+        )
+        version = settled_version(recent, recent[0][0] - 1 if recent else 0)
+        after = None
+
+    rows = crud_report.get_map_page(MAP_FULL_PAGE_SIZE, after)
+    return {
+        "mode": "full",
+        "version": version,
+        "markers": [{k: row.get(k) for k in MARKER_FIELDS} for row in rows],
+        "next_cursor": encode_cursor(version, rows[-1]) if len(rows) >= MAP_FULL_PAGE_SIZE else None,
+    }
+
+
+def changes_since(since: int | None, cursor: str | None = None) -> dict:
+    if cursor or not since:
+        return full_sync(cursor)
+
+    rows, tombstones = crud_report.get_map_changes(since, MAP_DELTA_MAX_CHANGES + 1)
+    if len(rows) > MAP_DELTA_MAX_CHANGES or len(tombstones) > MAP_DELTA_MAX_CHANGES:
+        return full_sync()
+
+    # change_version 순으로 적용해 item 별 마지막 상태만 남김
+    changes = sorted(
+        [(r["change_version"], r["updated_at"], r) for r in rows]
+        + [(t["change_version"], t["updated_at"], {"item_id": t["item_id"], "status": None}) for t in tombstones],
+        key=lambda c: c[0],
+    )
+    latest = {}
+    for _, _, row in changes:
+        latest[row["item_id"]] = row
+
+    upserts, removed = [], []
+    for item_id, row in latest.items():
+        if row["status"] is None or row["status"] in INACTIVE_STATUSES:
+            removed.append(item_id)
+        else:
+            upserts.append({k: row.get(k) for k in MARKER_FIELDS})
+
+    return {
+        "mode": "delta",
+        "version": settled_version([(v, ts) for v, ts, _ in changes], since),
+        "upserts": upserts,
+        "removed": removed,
+    }
@@ -0,0 +1,188 @@
+import asyncio
+import heapq
+import math
+import os
+import threading
+import time
+from datetime import datetime
+
+from app.crud import report as crud_report
+from app.crud.report import parse_location
+
+import logging
+logger = logging.getLogger("API_LOGGER")
+
+# "내 주변 위험물" 조회용 메모리 격자 인덱스
+#
+# 걷는 중인 앱이 1~2초마다 호출하므로 DB를 거치지 않고 메모리에서 바로 답합니다.
+#   - 활성(new / processing) 신고만 NEARBY_CELL_DEG 격자 칸에 나눠 보관
+#   - 조회는 반경이 걸치는 칸만 훑고, 가까운 순 k개를 heap으로 뽑음
+#   - 이 워커의 신고 생성/상태 변경은 crud 변경 알림으로 바로 반영,
+#     다른 워커에서 일어난 변경은 NEARBY_REFRESH_SECONDS마다 전체 재적재로 따라잡음
+#   - 재적재는 키셋 페이지 단위로 읽음 (한 번에 읽으면 PostgREST max-rows 에서 잘려 위험물을 놓침)
+
+NEARBY_CELL_DEG = float(os.getenv("NEARBY_CELL_DEG", "0.001"))  # 약 110m
+NEARBY_REFRESH_SECONDS = float(os.getenv("NEARBY_REFRESH_SECONDS", "30"))
+NEARBY_PAGE_SIZE = 1000  # PostgREST max-rows 이하
+CENTER_HALF_ANGLE = 20.0  # 진행 방향 ±20도 안이면 C (정면)
+
+ACTIVE_STATUSES = ("new", "processing")
+INDEX_COLUMNS = "item_id, location, hazard_type, risk_level, status, created_at"
+METERS_PER_DEG_LAT = 110_540.0
+METERS_PER_DEG_LNG = 111_320.0
+
+
+def _cell(lat: float, lng: float) -> tuple[int, int]:
+    return (math.floor(lat / NEARBY_CELL_DEG), math.floor(lng / NEARBY_CELL_DEG))
+
+
+def relative_side(bearing: float, heading: float) -> str:
+    """진행 방향 기준 위험물이 왼쪽/정면/오른쪽 중 어디인지 (신고의 direction 값과 같은 L/C/R)"""
+    delta = (bearing - heading + 180.0) % 360.0 - 180.0
+    if abs(delta) <= CENTER_HALF_ANGLE:
+        return "C"
+    return "L" if delta < 0 else "R"
+
+
+class NearbyIndex:
+    def __init__(self):
+        self._cells: dict[tuple[int, int], dict[str, tuple]] = {}
+        self._where: dict[str, tuple[int, int]] = {}  # item_id -> 칸
+        self._lock = threading.Lock()
+        self.loaded_at = None
+        self._task = None
+
+    @property
+    def ready(self) -> bool:
+        return self.loaded_at is not None
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    # 1. 적재 / 갱신
+    @staticmethod
+    def _entry(row: dict):
+        if "latitude" not in row:
+            row = {**row, **parse_location(row.get("location"))}
+        lat, lng = row["latitude"], row["longitude"]
+        if not lat and not lng:
+            return None
+        created = row.get("created_at")
+        created_ts = datetime.fromisoformat(created.replace("Z", "+00:00")).timestamp() if created else time.time()
+        return (lat, lng, row.get("hazard_type"), row.get("risk_level"), created_ts)
+
+    def _add(self, cells, where, item_id: str, entry: tuple):
+        cell = _cell(entry[0], entry[1])
+        cells.setdefault(cell, {})[item_id] = entry
+        where[item_id] = cell
+
+    def _remove(self, item_id: str):
+        cell = self._where.pop(item_id, None)
+        if cell is None:
+            return
+        bucket = self._cells.get(cell)
+        if bucket is not None:
+            bucket.pop(item_id, None)
+            if not bucket:
+                del self._cells[cell]
+
+    def load(self, rows):
+        # 새 구조를 다 만든 뒤 한 번에 교체 (조회는 재적재 중에도 이전 인덱스로 응답)
+        cells, where = {}, {}
+        for row in rows:
+            if row.get("status", "new") not in ACTIVE_STATUSES:
+                continue
+            entry = self._entry(row)
+            if entry:
+                self._add(cells, where, str(row["item_id"]), entry)
+        with self._lock:
+            self._cells, self._where = cells, where
+            self.loaded_at = time.time()
+
+    def refresh(self):
+        started = time.perf_counter()
+        pages = crud_report.iter_reports(
+            INDEX_COLUMNS, NEARBY_PAGE_SIZE, statuses=ACTIVE_STATUSES, op="select_nearby_page"
+        )
+        self.load(row for page in pages for row in page)
+        logger.info(f"📍 Nearby index loaded: {len(self)} hazards ({time.perf_counter() - started:.2f}s)")
+
+    def on_change(self, event: str, item_ids: list, **details):
+        with self._lock:
+            if event == "created":
+                for row in details.get("rows") or ():
+                    entry = self._entry(row)
+                    if entry:
+                        self._remove(str(row["item_id"]))
+                        self._add(self._cells, self._where, str(row["item_id"]), entry)
+            elif event == "status" and details.get("status") not in ACTIVE_STATUSES:
+                for item_id in item_ids:
+                    self._remove(str(item_id))
+            # done/hidden -> new 처럼 다시 활성화된 건은 위치를 모르므로 다음 재적재 때 반영
+
+    # 2. 조회
+    def within(self, lat: float, lng: float, radius_m: float) -> list[tuple]:
+        """반경 안의 (거리², dx(m), dy(m), item_id, entry) 목록 (정렬 안 됨)"""
+        kx = METERS_PER_DEG_LNG * math.cos(math.radians(lat))
+        dlat, dlng = radius_m / METERS_PER_DEG_LAT, radius_m / kx
+        (cy0, cx0), (cy1, cx1) = _cell(lat - dlat, lng - dlng), _cell(lat + dlat, lng + dlng)
+        r2 = radius_m * radius_m
+
+        found = []
+        with self._lock:
+            for cy in range(cy0, cy1 + 1):
+                for cx in range(cx0, cx1 + 1):
+                    bucket = self._cells.get((cy, cx))
+                    if not bucket:
+                        continue
+                    for item_id, entry in bucket.items():
+                        dy = (entry[0] - lat) * METERS_PER_DEG_LAT
+                        dx = (entry[1] - lng) * kx
+                        d2 = dx * dx + dy * dy
+                        if d2 <= r2:
+                            found.append((d2, dx, dy, item_id, entry))
+        return found
+
+    def query(self, lat: float, lng: float, heading: float | None, radius_m: float, k: int,
+              ahead_only: bool = False) -> list[dict]:
+        found = self.within(lat, lng, radius_m)
+
+        results = []
+        for d2, dx, dy, item_id, (_, _, hazard, risk, _) in heapq.nsmallest(
+            k if not ahead_only else len(found), found, key=lambda f: f[0]
+        ):
+            item = {"item_id": item_id, "hazard_type": hazard, "risk_level": risk, "distance": round(math.sqrt(d2))}
+            if heading is not None:
+                bearing = math.degrees(math.atan2(dx, dy)) % 360.0
+                if ahead_only and abs((bearing - heading + 180.0) % 360.0 - 180.0) > 90.0:
+                    continue
+                item["side"] = relative_side(bearing, heading)
+            results.append(item)
+            if len(results) >= k:
+                break
+        return results
+
+    # 3. 주기적 재적재
+    async def _run(self):
+        while True:
+            await asyncio.sleep(NEARBY_REFRESH_SECONDS)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                logger.error(f"❌ Nearby index refresh failed: {e}")
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+nearby_index = NearbyIndex()
+crud_report.register_change_listener(nearby_index.on_change)
@@ -0,0 +1,165 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from app.crud import report as crud_report
+from app.crud.report import parse_location
+
+# 신고 데이터 스트리밍 내보내기 (CSV / NDJSON GeoJSON / Parquet)
+#
+# DB에서 키셋 페이지 단위(PAGE_SIZE)로 읽어 바로 직렬화해 내보내므로
+# 전체 건수와 상관없이 메모리 사용량은 페이지 1~2개 분량으로 일정합니다.
+
+PAGE_SIZE = 1000
+PARQUET_ROW_GROUP = 10_000
+
+EXPORT_COLUMNS = [
+    "item_id", "user_id", "created_at", "status", "hazard_type", "risk_level",
+    "latitude", "longitude", "distance", "direction", "x", "y", "w", "h",
+    "description", "image_url",
+]
+SELECT_COLUMNS = ", ".join(c for c in EXPORT_COLUMNS if c not in ("latitude", "longitude")) + ", location"
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/geo+json-seq",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class ExportFilter:
+    def __init__(self, since=None, until=None, hazard_type=None, bbox=None):
+        self.since = since.isoformat() if since else None
+        self.until = until.isoformat() if until else None
+        self.hazard_type = hazard_type
+        self.bbox = bbox  # (min_lat, min_lng, max_lat, max_lng)
+
+    def contains(self, row: dict) -> bool:
+        if not self.bbox:
+            return True
+        min_lat, min_lng, max_lat, max_lng = self.bbox
+        return min_lat <= row["latitude"] <= max_lat and min_lng <= row["longitude"] <= max_lng
+
+
+# 1. DB -> 행 (bbox는 PostgREST 필터로 표현할 수 없어 스트림 안에서 거름)
+def iter_rows(flt: ExportFilter):
+    for page in crud_report.iter_reports(
+        SELECT_COLUMNS, PAGE_SIZE, since=flt.since, until=flt.until, hazard_type=flt.hazard_type
+    ):
+        for row in page:
+            row.update(parse_location(row.pop("location", None)))
+            if flt.contains(row):
+                yield row
+
+
+# 2. 포맷별 직렬화 (bytes 청크 제너레이터)
+def stream_csv(rows):
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+    # 엑셀에서 한글이 깨지지 않도록 BOM 포함
+    yield "\ufeff".encode("utf-8")
+    writer.writeheader()
+    for i, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if i % PAGE_SIZE == 0:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue().encode("utf-8")
+
+
+def stream_ndjson(rows):
+    # 한 줄에 GeoJSON Feature 하나 (newline-delimited GeoJSON)
+    chunk = []
+    for row in rows:
+        props = {k: row.get(k) for k in EXPORT_COLUMNS if k not in ("latitude", "longitude")}
+        feature = {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [row["longitude"], row["latitude"]]},
+            "properties": props,
+        }
+        chunk.append(json.dumps(feature, ensure_ascii=False))
+        if len(chunk) >= PAGE_SIZE:
+            yield ("\n".join(chunk) + "\n").encode("utf-8")
+            chunk = []
+    if chunk:
+        yield ("\n".join(chunk) + "\n").encode("utf-8")
+
+
+class _ChunkSink:
+    """ParquetWriter가 쓰는 바이트를 모아뒀다가 꺼내 가는 append-only 파일 객체"""
+
+    def __init__(self):
+        self._buf = io.BytesIO()
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._buf.write(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = self._buf.getvalue()
+        self._buf.seek(0)
+        self._buf.truncate()
+        return data
+
+
+def parquet_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("item_id", pa.string()), ("user_id", pa.string()),
+        ("created_at", pa.timestamp("us", tz="UTC")), ("status", pa.string()),
+        ("hazard_type", pa.string()), ("risk_level", pa.int32()),
+        ("latitude", pa.float64()), ("longitude", pa.float64()),
+        ("distance", pa.float64()), ("direction", pa.string()),
+        ("x", pa.float64()), ("y", pa.float64()), ("w", pa.float64()), ("h", pa.float64()),
+        ("description", pa.string()), ("image_url", pa.string()),
+    ])
+
+
+def stream_parquet(rows):
+    # row group 단위로 써서 row group 하나 분량만 메모리에 유지
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = parquet_schema()
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+
+    def flush(batch):
+        for row in batch:
+            if isinstance(row.get("created_at"), str):
+                row["created_at"] = datetime.fromisoformat(row["created_at"])
+        writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+        return sink.drain()
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= PARQUET_ROW_GROUP:
+            yield flush(batch)
+            batch = []
+    if batch:
+        yield flush(batch)
+    writer.close()
+    yield sink.drain()
+
+
+STREAMERS = {"csv": stream_csv, "ndjson": stream_ndjson, "parquet": stream_parquet}
+
+
+def export_reports(fmt: str, flt: ExportFilter):
+    return STREAMERS[fmt](iter_rows(flt))
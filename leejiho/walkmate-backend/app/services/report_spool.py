@@ -0,0 +1,272 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from app.core import metrics
+from app.crud import report as crud_report
+from app.services.s3_uploader import s3_uploader
+
+import logging
+logger = logging.getLogger("API_LOGGER")
+
+# 신고 접수 스풀 (accept-fast 모드: REPORT_ACCEPT_MODE=spool)
+#
+# 요청 처리 중에는 신고 데이터와 이미지를 로컬 SQLite(WAL, synchronous=FULL)에 기록만 하고
+# 바로 202를 반환합니다. 백그라운드 drainer가 접수 순서(seq)대로 꺼내
+#   1) 이미지 S3 업로드 (동시 SPOOL_UPLOAD_CONCURRENCY개, key는 item_id로 정함 -> 재시도 / 재전송해도 중복 객체 없음)
+#   2) DB에 배치 INSERT (SPOOL_BATCH_SIZE건씩 한 요청)
+# 를 수행하고, 실패한 건은 지수 백오프로 다시 시도합니다. 서버가 재시작돼도 스풀 파일에서 이어서 처리합니다.
+# 배치 INSERT가 실패하면 한 건씩 다시 넣어, 계속 실패하는 한 건이 이웃 행까지 막지 않게 합니다.
+# SPOOL_MAX_ATTEMPTS번 실패한 건은 spool_dead 테이블로 옮겨 더 이상 시도하지 않습니다. (수동 확인용)
+
+REPORT_ACCEPT_MODE = os.getenv("REPORT_ACCEPT_MODE", "sync")  # sync | spool
+SPOOL_PATH = os.getenv("SPOOL_PATH", "spool/reports.db")
+SPOOL_BATCH_SIZE = int(os.getenv("SPOOL_BATCH_SIZE", "50"))
+SPOOL_UPLOAD_CONCURRENCY = int(os.getenv("SPOOL_UPLOAD_CONCURRENCY", "8"))
+SPOOL_MAX_BACKOFF = float(os.getenv("SPOOL_MAX_BACKOFF", "300"))
+SPOOL_MAX_ATTEMPTS = int(os.getenv("SPOOL_MAX_ATTEMPTS", "20"))
+SPOOL_IDLE_WAIT = 1.0
+# 같은 item_id 는 항상 같은 S3 key (이미 처리돼 스풀에서 빠진 뒤 재전송돼도 새 객체를 만들지 않음)
+SPOOL_KEY_NAMESPACE = uuid.UUID("6f1c2b9e-4d7a-5e3f-9a0b-2c8d1e4f7a65")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spool (
+    seq             INTEGER PRIMARY KEY AUTOINCREMENT,
+    item_id         TEXT NOT NULL UNIQUE,
+    payload         TEXT NOT NULL,
+    image           BLOB,
+    content_type    TEXT,
+    image_key       TEXT NOT NULL,
+    image_url       TEXT,
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error      TEXT,
+    accepted_at     REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS spool_dead (
+    seq             INTEGER PRIMARY KEY,
+    item_id         TEXT NOT NULL,
+    payload         TEXT NOT NULL,
+    image           BLOB,
+    content_type    TEXT,
+    image_key       TEXT NOT NULL,
+    image_url       TEXT,
+    attempts        INTEGER NOT NULL,
+    last_error      TEXT,
+    accepted_at     REAL NOT NULL,
+    dead_at         REAL NOT NULL
+);
+"""
+
+
+class ReportSpool:
+    def __init__(self, path: str = SPOOL_PATH):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+        self._loop = None
+        self._wakeup = None
+        self._task = None
+
+    @property
+    def enabled(self) -> bool:
+        return REPORT_ACCEPT_MODE == "spool"
+
+    # 1. 저장소
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")  # 커밋 = fsync (전원이 나가도 202 응답한 신고는 남음)
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def image_key(item_id: str, extension: str) -> str:
+        return f"{uuid.uuid5(SPOOL_KEY_NAMESPACE, item_id)}.{extension}"
+
+    def enqueue(self, report_data: dict, image: bytes, content_type: str | None, extension: str) -> bool:
+        """스풀에 추가 (같은 item_id가 이미 있으면 False)"""
+        now = time.time()
+        with self._lock:
+            cur = self._db().execute(
+                """INSERT OR IGNORE INTO spool
+                   (item_id, payload, image, content_type, image_key, next_attempt_at, accepted_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (report_data["item_id"], json.dumps(report_data, ensure_ascii=False), image,
+                 content_type, self.image_key(report_data["item_id"], extension), now, now),
+            )
+            added = cur.rowcount == 1
+        if added:
+            metrics.SPOOL_DEPTH.inc()
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+        return added
+
+    def _due_batch(self, limit: int) -> list[tuple]:
+        with self._lock:
+            return self._db().execute(
+                """SELECT seq, item_id, payload, image, content_type, image_key, image_url, attempts
+                   FROM spool WHERE next_attempt_at <= ? ORDER BY seq LIMIT ?""",
+                (time.time(), limit),
+            ).fetchall()
+
+    def _mark_uploaded(self, seq: int, image_url: str):
+        # 업로드가 끝난 이미지는 스풀에서 바이트를 지워 파일 크기를 줄임
+        with self._lock:
+            self._db().execute("UPDATE spool SET image = NULL, image_url = ? WHERE seq = ?", (image_url, seq))
+
+    def _mark_done(self, seqs: list[int]):
+        with self._lock:
+            self._db().executemany("DELETE FROM spool WHERE seq = ?", [(s,) for s in seqs])
+        metrics.SPOOL_DEPTH.dec(amount=len(seqs))
+
+    def _reschedule(self, seq: int, attempts: int, stage: str, error: Exception):
+        if attempts + 1 >= SPOOL_MAX_ATTEMPTS:
+            self._dead_letter(seq, attempts, stage, error)
+            return
+        delay = min(2 ** attempts, SPOOL_MAX_BACKOFF)
+        with self._lock:
+            self._db().execute(
+                "UPDATE spool SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE seq = ?",
+                (attempts + 1, time.time() + delay, f"{stage}: {error}"[:500], seq),
+            )
+        metrics.SPOOL_RETRIES.inc(stage)
+        logger.warning(f"⚠️ Spool {stage} failed (seq={seq}, attempt={attempts + 1}, retry in {delay:.0f}s): {error}")
+
+    def _dead_letter(self, seq: int, attempts: int, stage: str, error: Exception):
+        with self._lock:
+            conn = self._db()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    """INSERT OR REPLACE INTO spool_dead
+                       (seq, item_id, payload, image, content_type, image_key, image_url,
+                        attempts, last_error, accepted_at, dead_at)
+                       SELECT seq, item_id, payload, image, content_type, image_key, image_url,
+                              ?, ?, accepted_at, ?
+                       FROM spool WHERE seq = ?""",
+                    (attempts + 1, f"{stage}: {error}"[:500], time.time(), seq),
+                )
+                conn.execute("DELETE FROM spool WHERE seq = ?", (seq,))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        metrics.SPOOL_DEPTH.dec()
+        metrics.SPOOL_DEAD_LETTERED.inc(stage)
+        logger.error(f"❌ Spool {stage} gave up after {attempts + 1} attempts (seq={seq}), moved to spool_dead: {error}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            depth, oldest = self._db().execute("SELECT count(*), min(accepted_at) FROM spool").fetchone()
+            dead = self._db().execute("SELECT count(*) FROM spool_dead").fetchone()[0]
+        return {
+            "depth": depth,
+            "oldest_age_seconds": round(time.time() - oldest, 3) if oldest else 0.0,
+            "dead_letter": dead,
+        }
+
+    # 2. drainer
+    async def _upload(self, row, semaphore) -> str | None:
+        seq, _, _, image, content_type, image_key, image_url, attempts = row
+        if image_url:
+            return image_url  # 이전 시도에서 업로드 완료
+        async with semaphore:
+            try:
+                image_url = await asyncio.to_thread(s3_uploader.upload_bytes, image_key, image, content_type)
+            except Exception as e:
+                await asyncio.to_thread(self._reschedule, seq, attempts, "upload", e)
+                return None
+        await asyncio.to_thread(self._mark_uploaded, seq, image_url)
+        return image_url
+
+    async def _insert(self, rows: list[tuple], datas: list[dict]):
+        try:
+            await asyncio.to_thread(crud_report.create_reports_batch, datas)
+            await asyncio.to_thread(self._mark_done, [r[0] for r in rows])
+            metrics.SPOOL_DRAINED.inc("inserted", amount=len(rows))
+            return
+        except Exception as e:
+            if not crud_report.is_unique_violation(e):
+                logger.warning(f"⚠️ Spool batch insert failed ({len(rows)} rows), retrying one by one: {e}")
+
+        # 배치 중 일부가 이미 DB에 있거나(재시작 전 INSERT 후 스풀 삭제 전에 종료된 경우 등)
+        # 특정 행이 계속 실패하는 경우 -> 한 건씩 넣어 실패한 행만 재시도 / dead-letter
+        for row, data in zip(rows, datas):
+            try:
+                await asyncio.to_thread(crud_report.create_report, data)
+                result = "inserted"
+            except Exception as e:
+                if not crud_report.is_unique_violation(e):
+                    await asyncio.to_thread(self._reschedule, row[0], row[7], "insert", e)
+                    continue
+                result = "duplicate"
+            await asyncio.to_thread(self._mark_done, [row[0]])
+            metrics.SPOOL_DRAINED.inc(result)
+
+    async def drain_once(self) -> int:
+        rows = await asyncio.to_thread(self._due_batch, SPOOL_BATCH_SIZE)
+        if not rows:
+            return 0
+
+        semaphore = asyncio.Semaphore(SPOOL_UPLOAD_CONCURRENCY)
+        urls = await asyncio.gather(*(self._upload(row, semaphore) for row in rows))
+
+        # 접수 순서 유지 (업로드 실패 건은 다음 시도로 미룸)
+        ready, datas = [], []
+        for row, url in zip(rows, urls):
+            if url:
+                ready.append(row)
+                datas.append({**json.loads(row[2]), "image_url": url})
+        if ready:
+            await self._insert(ready, datas)
+        return len(rows)
+
+    async def _run(self):
+        # SQLite 조회도 블로킹이므로 스레드에서
+        stats = await asyncio.to_thread(self.stats)
+        metrics.SPOOL_DEPTH.set(stats["depth"])
+        logger.info(f"📥 Report spool drainer started ({self.path}, {stats['depth']} pending)")
+        while True:
+            try:
+                processed = await self.drain_once()
+                stats = await asyncio.to_thread(self.stats)
+                metrics.SPOOL_DEPTH.set(stats["depth"])
+                metrics.SPOOL_OLDEST_AGE.set(stats["oldest_age_seconds"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Spool drainer error: {e}", exc_info=True)
+                processed = 0
+
+            if not processed:
+                # 새 접수가 들어오거나 재시도 시각이 될 때까지 대기
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=SPOOL_IDLE_WAIT)
+                except asyncio.TimeoutError:
+                    pass
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+report_spool = ReportSpool()
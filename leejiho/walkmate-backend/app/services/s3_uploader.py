@@ -1,73 +1,148 @@
-import boto3
+import threading
 import uuid
+from urllib.parse import unquote, urlsplit
+from cachetools import TTLCache
 from fastapi import UploadFile
 from app.core.config import settings
+from app.core.metrics import track_dependency
 
 import logging
 logger = logging.getLogger("API_LOGGER")
 
 class S3Uploader:
     def __init__(self):
-        self.s3_client = boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
+        # boto3 import + 클라이언트 생성(엔드포인트/서비스 모델 로딩)이 무거워서 처음 쓸 때 만듦
+        self._s3_client = None
+        self._client_lock = threading.Lock()
         self.bucket_name = settings.AWS_BUCKET_NAME
 
-    async def upload_image(self, file: UploadFile) -> str:
+        # key -> presigned URL (URL 만료보다 조금 먼저 캐시에서 빠지도록 TTL 설정)
+        self._url_cache = TTLCache(
+            maxsize=10_000,
+            ttl=max(settings.PRESIGNED_URL_EXPIRES - settings.PRESIGNED_URL_REFRESH_MARGIN, 1)
+        )
+        self._url_lock = threading.Lock()
+
+    @property
+    def s3_client(self):
+        if self._s3_client is None:
+            with self._client_lock:
+                if self._s3_client is None:
+                    import boto3
+                    self._s3_client = boto3.client(
+                        's3',
+                        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                        region_name=settings.AWS_REGION,
+                        endpoint_url=settings.AWS_ENDPOINT_URL
+                    )
+        return self._s3_client
+
+    @s3_client.setter
+    def s3_client(self, client):
+        # 부하 테스트 등에서 대역(fake) 클라이언트 주입용
+        self._s3_client = client
+
+    def warmup(self):
+        # 기동 시 클라이언트를 미리 만들어 첫 신고 요청이 생성 비용을 떠안지 않도록 함
+        return self.s3_client
+
+    def upload_image(self, file: UploadFile) -> str:
+        # boto3 호출은 블로킹 -> 호출하는 쪽에서 스레드풀로 넘김 (run_in_threadpool)
         try:
             file_extension = file.filename.split(".")[-1]
             unique_filename = f"{uuid.uuid4()}.{file_extension}"
 
-            self.s3_client.upload_fileobj(
-                file.file,
-                self.bucket_name,
-                unique_filename,
-                ExtraArgs={"ContentType": file.content_type}
-            )
+            with track_dependency("s3", "upload"):
+                self.s3_client.upload_fileobj(
+                    file.file,
+                    self.bucket_name,
+                    unique_filename,
+                    ExtraArgs={"ContentType": file.content_type}
+                )
 
-            image_url = f"https://{self.bucket_name}.s3.{settings.AWS_REGION}.amazonaws.com/{unique_filename}"
-            return image_url
+            return self.public_url(unique_filename)
 
         except Exception as e:
             logger.error(f"❌ S3 Upload Error: {e}", exc_info=True)
             raise e
 
-    def list_objects(self) -> list[str]:
+    def upload_bytes(self, key: str, body: bytes, content_type: str | None) -> str:
+        # key를 호출하는 쪽에서 정함 -> 재시도해도 같은 객체를 덮어쓰므로 중복 업로드가 남지 않음
+        with track_dependency("s3", "put_object"):
+            self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=key,
+                Body=body,
+                ContentType=content_type or "image/jpeg"
+            )
+        return self.public_url(key)
+
+    def public_url(self, key: str) -> str:
+        if settings.AWS_ENDPOINT_URL:
+            # S3 호환 스토리지는 path-style ({endpoint}/{bucket}/{key})
+            return f"{settings.AWS_ENDPOINT_URL.rstrip('/')}/{self.bucket_name}/{key}"
+        return f"https://{self.bucket_name}.s3.{settings.AWS_REGION}.amazonaws.com/{key}"
+
+    def key_from_url(self, image_url: str) -> str | None:
+        # public_url()이 만든 주소에서 key 추출
+        if not image_url:
+            return None
+        path = unquote(urlsplit(image_url).path.lstrip("/"))
+        if settings.AWS_ENDPOINT_URL and path.startswith(f"{self.bucket_name}/"):
+            path = path[len(self.bucket_name) + 1:]
+        return path or None
+
+    # --- 앱 -> S3 직접 업로드 (API 서버는 이미지 바이트를 받지 않음) ---
+    def create_upload(self, extension: str, content_type: str) -> dict:
+        """
+        서버가 정한 key로 presigned POST 발급.
+        Content-Type 과 최대 크기(UPLOAD_MAX_BYTES)를 서명 조건에 넣어 S3가 직접 검증합니다.
+        """
+        key = f"{uuid.uuid4()}.{extension}"
+        with track_dependency("s3", "presign_post"):
+            post = self.s3_client.generate_presigned_post(
+                Bucket=self.bucket_name,
+                Key=key,
+                Fields={"Content-Type": content_type},
+                Conditions=[
+                    {"Content-Type": content_type},
+                    ["content-length-range", 1, settings.UPLOAD_MAX_BYTES],
+                ],
+                ExpiresIn=settings.UPLOAD_URL_EXPIRES
+            )
+        return {"key": key, "url": post["url"], "fields": post["fields"]}
+
+    def head(self, key: str) -> dict | None:
+        """업로드된 객체의 크기/타입 (없으면 None)"""
+        from botocore.exceptions import ClientError
+
         try:
-            response = self.s3_client.list_objects_v2(Bucket=self.bucket_name)
-            if 'Contents' not in response:
-                return []
-            
-            # Sort by LastModified in descending order (newest first)
-            sorted_contents = sorted(response['Contents'], key=lambda x: x['LastModified'], reverse=True)
-
-            image_urls = []
-            for obj in sorted_contents:
-                key = obj['Key']
-                # Basic filter for images
-                if key.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp')):
-                     # Generate presigned URL (valid for 1 hour)
-                     try:
-                        url = self.s3_client.generate_presigned_url(
-                            ClientMethod='get_object',
-                            Params={
-                                'Bucket': self.bucket_name,
-                                'Key': key
-                            },
-                            ExpiresIn=3600
-                        )
-                        image_urls.append(url)
-                     except Exception as e:
-                        logger.warning(f"Failed to generate presigned URL for {key}: {e}")
-                        continue
-            
-            return image_urls
+            with track_dependency("s3", "head_object"):
+                response = self.s3_client.head_object(Bucket=self.bucket_name, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return {"size": response["ContentLength"], "content_type": response.get("ContentType")}
 
-        except Exception as e:
-            logger.error(f"❌ S3 List Objects Error: {e}", exc_info=True)
-            return []
+    def presigned_url(self, key: str) -> str:
+        """
+        get_object용 presigned URL (만료 PRESIGNED_URL_REFRESH_MARGIN초 전까지 캐시 재사용)
+        같은 이미지를 보는 요청마다 서명을 새로 만들지 않도록 합니다.
+        """
+        with self._url_lock:
+            url = self._url_cache.get(key)
+        if url:
+            return url
+
+        url = self.s3_client.generate_presigned_url(
+            ClientMethod='get_object',
+            Params={'Bucket': self.bucket_name, 'Key': key},
+            ExpiresIn=settings.PRESIGNED_URL_EXPIRES
+        )
+        with self._url_lock:
+            self._url_cache[key] = url
+        return url
 
 s3_uploader = S3Uploader()
\ No newline at end of file
@@ -0,0 +1,147 @@
+import math
+import os
+import time
+
+from app.services import tmap_service
+from app.services.nearby_index import nearby_index
+
+import logging
+logger = logging.getLogger("API_LOGGER")
+
+# 가장 안전한 보행 경로 고르기
+#
+# TMAP에 경로 후보 여러 개(searchOption 별 + 직선 경로 좌우로 비켜 가는 경유지)를 동시에 요청하고,
+# 각 경로 주변 ROUTE_HAZARD_BUFFER_M 안의 활성 위험물(주변 위험물 인덱스)을
+#   risk_level x 최근성(ROUTE_HAZARD_HALF_LIFE_DAYS 마다 절반)
+# 으로 합산해 위험 점수를 매깁니다. 가장 짧은 후보보다 detour_budget 비율 이상 길지 않은 후보 중
+# 위험 점수가 가장 낮은 경로를 고릅니다. (점수가 같으면 짧은 경로)
+
+ROUTE_SEARCH_OPTIONS = (0, 4, 10, 30)  # 추천 / 추천+대로우선 / 최단 / 최단+계단제외
+ROUTE_DETOUR_BUDGET = float(os.getenv("ROUTE_DETOUR_BUDGET", "0.25"))
+ROUTE_HAZARD_BUFFER_M = float(os.getenv("ROUTE_HAZARD_BUFFER_M", "20"))
+ROUTE_HAZARD_HALF_LIFE_DAYS = float(os.getenv("ROUTE_HAZARD_HALF_LIFE_DAYS", "14"))
+ROUTE_SAMPLE_M = 10.0                   # 경로를 이 간격으로 잘라 주변 위험물 조회
+ROUTE_VIA_OFFSET = (150.0, 500.0, 0.2)  # 경유지 우회 폭: 직선거리의 20%, 150~500m
+
+METERS_PER_DEG_LAT = 110_540.0
+METERS_PER_DEG_LNG = 111_320.0
+
+
+# 1. 후보 만들기
+def route_variants(start_coord, end_coord) -> list[dict]:
+    """fetch_tmap_data 키워드 인자 목록 (첫 번째 = 기본 경로)"""
+    variants = [{"search_option": option} for option in ROUTE_SEARCH_OPTIONS]
+
+    # 출발-도착 중간점을 직선의 좌/우로 비켜 경유하는 후보 (다른 골목으로 돌아가는 경로)
+    kx = METERS_PER_DEG_LNG * math.cos(math.radians((start_coord["y"] + end_coord["y"]) / 2))
+    dx = (end_coord["x"] - start_coord["x"]) * kx
+    dy = (end_coord["y"] - start_coord["y"]) * METERS_PER_DEG_LAT
+    length = math.hypot(dx, dy)
+    if length > 0:
+        low, high, ratio = ROUTE_VIA_OFFSET
+        offset = min(max(length * ratio, low), high)
+        mid_x, mid_y = (start_coord["x"] + end_coord["x"]) / 2, (start_coord["y"] + end_coord["y"]) / 2
+        for sign in (1, -1):
+            via_x = mid_x + sign * (-dy / length) * offset / kx
+            via_y = mid_y + sign * (dx / length) * offset / METERS_PER_DEG_LAT
+            variants.append({"search_option": 0, "pass_list": f"{via_x:.7f},{via_y:.7f}"})
+    return variants
+
+
+# 2. 경로 해석 / 점수
+def route_line(raw_tree) -> list[tuple[float, float]]:
+    """LineString 구간을 이어 붙인 (lat, lng) 목록"""
+    line = []
+    for node in raw_tree.get("features", []):
+        geometry = node.get("geometry", {})
+        if geometry.get("type") != "LineString":
+            continue
+        for lng, lat in geometry.get("coordinates", []):
+            if not line or line[-1] != (lat, lng):
+                line.append((lat, lng))
+    return line
+
+
+def _segment_m(a, b) -> tuple[float, float, float]:
+    kx = METERS_PER_DEG_LNG * math.cos(math.radians(a[0]))
+    dx, dy = (b[1] - a[1]) * kx, (b[0] - a[0]) * METERS_PER_DEG_LAT
+    return dx, dy, math.hypot(dx, dy)
+
+
+def route_summary(raw_tree) -> dict:
+    props = next(
+        (f.get("properties", {}) for f in raw_tree.get("features", []) if "totalDistance" in f.get("properties", {})),
+        {},
+    )
+    line = route_line(raw_tree)
+    distance = props.get("totalDistance")
+    if distance is None:
+        distance = sum(_segment_m(a, b)[2] for a, b in zip(line, line[1:]))
+    return {"distance": distance, "time": props.get("totalTime"), "line": line}
+
+
+def hazard_exposure(line: list[tuple[float, float]], now: float | None = None) -> tuple[float, int]:
+    """경로 주변 위험물 (점수, 개수) - 한 위험물은 한 번만 셈"""
+    now = now or time.time()
+    seen = {}
+    for a, b in zip(line, line[1:]):
+        _, _, length = _segment_m(a, b)
+        steps = max(1, math.ceil(length / ROUTE_SAMPLE_M))
+        for i in range(steps + (b == line[-1])):
+            t = i / steps
+            lat, lng = a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t
+            for _, _, _, item_id, entry in nearby_index.within(lat, lng, ROUTE_HAZARD_BUFFER_M):
+                seen[item_id] = entry
+
+    score = 0.0
+    for _, _, _, risk, created_ts in seen.values():
+        age_days = max(now - created_ts, 0) / 86400
+        score += (risk or 1) * 0.5 ** (age_days / ROUTE_HAZARD_HALF_LIFE_DAYS)
+    return round(score, 3), len(seen)
+
+
+# 3. 고르기
+async def get_safest_navigation_path(start_coord, end_coord, detour_budget: float | None = None):
+    budget = ROUTE_DETOUR_BUDGET if detour_budget is None else detour_budget
+    variants = route_variants(start_coord, end_coord)
+    raw_trees = await tmap_service.fetch_route_variants(start_coord, end_coord, variants)
+
+    candidates = []
+    for variant, raw_tree in zip(variants, raw_trees):
+        if raw_tree is None:
+            continue
+        summary = route_summary(raw_tree)
+        if len(summary["line"]) < 2:
+            continue
+        score, count = hazard_exposure(summary["line"])
+        candidates.append({
+            "raw_tree": raw_tree,
+            "search_option": variant.get("search_option"),
+            "via": variant.get("pass_list"),
+            "distance": summary["distance"],
+            "time": summary["time"],
+            "hazard_score": score,
+            "hazard_count": count,
+        })
+
+    if not candidates:
+        # 경로 형상이 없는 응답뿐이면 기본 경로를 그대로 안내
+        first = next(r for r in raw_trees if r is not None)
+        return {"steps": tmap_service.extract_steps(first), "route": None, "alternatives": []}
+
+    shortest = min(c["distance"] for c in candidates)
+    allowed = [c for c in candidates if c["distance"] <= shortest * (1 + budget)]
+    best = min(allowed, key=lambda c: (c["hazard_score"], c["distance"]))
+
+    def public(c):
+        return {k: c[k] for k in ("search_option", "via", "distance", "time", "hazard_score", "hazard_count")}
+
+    logger.info(
+        f"🧭 Safe route: {len(candidates)}/{len(variants)} candidates, "
+        f"picked option={best['search_option']} via={best['via']} score={best['hazard_score']}"
+    )
+    return {
+        "steps": tmap_service.extract_steps(best["raw_tree"]),
+        "route": public(best),
+        "alternatives": [public(c) for c in candidates if c is not best],
+    }
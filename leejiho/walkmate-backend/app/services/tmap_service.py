@@ -1,52 +1,61 @@
-import os
+import asyncio
 import httpx
-from dotenv import load_dotenv
-
-# 통신 함수가 시작되기 전에, 파일 맨 위쪽에서 무조건 먼저 실행되어야 합니다!
-load_dotenv()
 import logging
 from fastapi import HTTPException
+from app.core.config import settings
+from app.core.metrics import track_dependency
 
 logger = logging.getLogger("API_LOGGER")
 
+# 여러 경로 후보를 동시에 요청할 때: 기본 경로가 도착한 뒤 나머지를 이만큼만 더 기다림
+ROUTE_FANOUT_GRACE = 0.3
+
 # 1. [통신 담당] 순수하게 Tmap 서버에서 원본 JSON 트리만 가져옴
-async def fetch_tmap_data(start_coord, end_coord):
-    async with httpx.AsyncClient() as client:
-        req_data = {
-            "startX": start_coord["x"], "startY": start_coord["y"], # y좌표도 필요합니다!
-            "endX": end_coord["x"], "endY": end_coord["y"],
-            "startName": "출발지", # Tmap 필수 파라미터
-            "endName": "목적지"    # Tmap 필수 파라미터
-        }
-        
-        # 1. 진짜 Tmap 보행자 경로 탐색 URL
-        real_url = "https://apis.openapi.sk.com/tmap/routes/pedestrian?version=1&format=json"
-        
-        # 2. 선생님의 신분증(App Key)을 헤더에 동봉
-        # 2. 하드코딩 대신 메모리(os.getenv)에서 안전하게 키를 꺼내옴
-        secret_key = os.getenv("TMAP_API_KEY")
-        
-        headers = {
-            "appKey": secret_key, 
-            "Accept": "application/json"
-        }
-        
-        try:
-            # 3. 요청 전송
+# search_option: 0 추천 / 4 추천+대로우선 / 10 최단 / 30 최단+계단제외
+# pass_list: 경유지 "x1,y1_x2,y2" (최대 5개)
+async def fetch_tmap_data(start_coord, end_coord, search_option=None, pass_list=None, client=None):
+    if client is None:
+        async with httpx.AsyncClient() as client:
+            return await fetch_tmap_data(start_coord, end_coord, search_option, pass_list, client)
+
+    req_data = {
+        "startX": start_coord["x"], "startY": start_coord["y"], # y좌표도 필요합니다!
+        "endX": end_coord["x"], "endY": end_coord["y"],
+        "startName": "출발지", # Tmap 필수 파라미터
+        "endName": "목적지"    # Tmap 필수 파라미터
+    }
+    if search_option is not None:
+        req_data["searchOption"] = search_option
+    if pass_list:
+        req_data["passList"] = pass_list
+    
+    # 1. 진짜 Tmap 보행자 경로 탐색 URL
+    real_url = "https://apis.openapi.sk.com/tmap/routes/pedestrian?version=1&format=json"
+    
+    # 2. 선생님의 신분증(App Key)을 헤더에 동봉
+    # 2. 하드코딩 대신 설정(.env -> settings)에서 안전하게 키를 꺼내옴
+    secret_key = settings.TMAP_API_KEY
+    
+    headers = {
+        "appKey": secret_key, 
+        "Accept": "application/json"
+    }
+    
+    try:
+        # 3. 요청 전송
+        with track_dependency("tmap", "pedestrian_route"):
             response = await client.post(real_url, json=req_data, headers=headers)
             response.raise_for_status() # 4xx, 5xx 에러 발생 시 예외 송출
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"TMAP API Error: {e.response.text}")
-            raise HTTPException(status_code=502, detail="TMAP External Gateway Error")
-        except httpx.RequestError as e:
-            logger.error(f"TMAP Connection Error: {e}")
-            raise HTTPException(status_code=503, detail="TMAP Service Unavailable")
+        return response.json()
+    except httpx.HTTPStatusError as e:
+        logger.error(f"TMAP API Error: {e.response.text}")
+        raise HTTPException(status_code=502, detail="TMAP External Gateway Error")
+    except httpx.RequestError as e:
+        logger.error(f"TMAP Connection Error: {e}")
+        raise HTTPException(status_code=503, detail="TMAP Service Unavailable")
 
 # [표준 예문] app/services/tmap_service.py 내부 파싱 로직 수정
-async def get_navigation_path(start_coord, end_coord):
-    raw_tree = await fetch_tmap_data(start_coord, end_coord)
-    
+def extract_steps(raw_tree):
     refined_path = []
     for node in raw_tree.get("features", []):
         # 방향 전환점(Point) 노드만 필터링
@@ -60,4 +69,45 @@ async def get_navigation_path(start_coord, end_coord):
             }
             refined_path.append(step_info)
             
-    return refined_path
\ No newline at end of file
+    return refined_path
+
+
+async def get_navigation_path(start_coord, end_coord):
+    raw_tree = await fetch_tmap_data(start_coord, end_coord)
+    return extract_steps(raw_tree)
+
+
+# 2. 경로 후보 여러 개를 동시에 요청 (연결 하나를 같이 씀)
+# variants[0] 이 기본 경로: 그 응답이 온 뒤 ROUTE_FANOUT_GRACE 초 안에 도착한 후보만 사용하고 나머지는 취소
+# 반환: variants 와 같은 순서의 raw_tree 목록 (실패/취소된 후보는 None)
+async def fetch_route_variants(start_coord, end_coord, variants):
+    async with httpx.AsyncClient() as client:
+        tasks = [
+            asyncio.create_task(fetch_tmap_data(start_coord, end_coord, client=client, **variant))
+            for variant in variants
+        ]
+        try:
+            await asyncio.wait([tasks[0]])
+            if len(tasks) > 1:
+                # 기본 경로가 실패했으면 다른 후보라도 쓸 수 있도록 끝까지 기다림
+                grace = ROUTE_FANOUT_GRACE if not tasks[0].exception() else None
+                await asyncio.wait(tasks[1:], timeout=grace)
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        results = []
+        for task in tasks:
+            if task.cancelled():
+                results.append(None)
+            elif task.exception():
+                logger.warning(f"⚠️ TMAP route variant failed: {task.exception()}")
+                results.append(None)
+            else:
+                results.append(task.result())
+
+        if all(r is None for r in results):
+            raise tasks[0].exception()
+        return results
@@ -0,0 +1,240 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import yaml
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import get_db_client
+
+logger = logging.getLogger("API_LOGGER")
+
+# 현장 신고(reports) -> YOLO 학습 데이터셋 증분 내보내기
+#
+# 매일 밤 실행하면 지난 체크포인트 이후의 신고만 읽어서
+#   <out>/images/{train,val}/<item_id>.jpg
+#   <out>/labels/{train,val}/<item_id>.txt
+# 를 추가하고, custom_data.yaml(클래스 이름 포함)을 다시 생성합니다.
+#
+# 예) python export_dataset.py --s3-root ./fake_s3    (로컬 폴더를 S3 대신 사용)
+#     python export_dataset.py                        (실제 S3 사용)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUT = os.path.join(BASE_DIR, "..", "..", "choihyunseok", "datasets", "my_custom_data")
+DEFAULT_YAML = os.path.join(BASE_DIR, "..", "..", "choihyunseok", "custom_data.yaml")
+STATE_FILE = ".export_state.json"
+SELECT_COLUMNS = "item_id, created_at, hazard_type, x, y, w, h, image_url, status"
+
+
+# 1. 체크포인트 (커서 + 클래스 목록 + 재시도 대상)
+def load_state(out_dir: str) -> dict:
+    path = os.path.join(out_dir, STATE_FILE)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {"cursor": None, "names": [], "failed": [], "exported": 0}
+
+
+def save_state(out_dir: str, state: dict):
+    path = os.path.join(out_dir, STATE_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)  # 원자적 교체 (중간에 죽어도 이전 체크포인트 유지)
+
+
+# 2. 신고 스트리밍 (created_at, item_id 키셋 페이지네이션 - count 없이)
+def iter_new_reports(cursor: dict | None, page_size: int):
+    while True:
+        query = (
+            get_db_client().table("reports")
+            .select(SELECT_COLUMNS)
+            .order("created_at")
+            .order("item_id")
+            .limit(page_size)
+        )
+        if cursor:
+            ts, last_id = cursor["created_at"], cursor["item_id"]
+            # 타임스탬프의 ':' '.' 는 PostgREST 예약 문자 -> 큰따옴표로 감쌈
+            query = query.or_(f'created_at.gt."{ts}",and(created_at.eq."{ts}",item_id.gt.{last_id})')
+
+        rows = query.execute().data
+        if not rows:
+            return
+        yield rows
+        cursor = {"created_at": rows[-1]["created_at"], "item_id": rows[-1]["item_id"]}
+        if len(rows) < page_size:
+            return
+
+
+def fetch_reports_by_ids(item_ids: list[str]):
+    if not item_ids:
+        return []
+    return get_db_client().table("reports").select(SELECT_COLUMNS).in_("item_id", item_ids).execute().data
+
+
+# 3. 이미지 소스 (실제 S3 또는 로컬 폴더)
+def object_key(image_url: str) -> str:
+    return urlparse(image_url).path.lstrip("/")
+
+
+class LocalImageSource:
+    def __init__(self, root: str):
+        self.root = root
+
+    def fetch(self, key: str) -> bytes:
+        with open(os.path.join(self.root, key), "rb") as f:
+            return f.read()
+
+
+class S3ImageSource:
+    def __init__(self):
+        import boto3
+        from app.core.config import settings
+
+        self.s3_client = boto3.client(
+            "s3",
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            region_name=settings.AWS_REGION,
+        )
+        self.bucket_name = settings.AWS_BUCKET_NAME
+
+    def fetch(self, key: str) -> bytes:
+        return self.s3_client.get_object(Bucket=self.bucket_name, Key=key)["Body"].read()
+
+
+# 4. 변환 규칙
+def split_for(item_id: str, val_ratio: float) -> str:
+    # item_id 해시 기반 -> 실행 순서/횟수와 관계없이 항상 같은 split
+    bucket = int(hashlib.md5(item_id.encode()).hexdigest()[:8], 16) % 10000
+    return "val" if bucket < val_ratio * 10000 else "train"
+
+
+def yolo_label_line(cls_idx: int, row: dict) -> str | None:
+    # 앱이 보내는 x, y, w, h는 정규화된 중심 좌표/크기 (YoloParser.ts 참고)
+    try:
+        cx, cy, w, h = (float(row[k]) for k in ("x", "y", "w", "h"))
+    except (TypeError, ValueError, KeyError):
+        return None
+    if w <= 0 or h <= 0:
+        return None
+
+    x1, y1 = max(cx - w / 2, 0.0), max(cy - h / 2, 0.0)
+    x2, y2 = min(cx + w / 2, 1.0), min(cy + h / 2, 1.0)
+    if x2 <= x1 or y2 <= y1:
+        return None
+
+    # train.py는 세그멘테이션 모델이므로 박스를 사각형 폴리곤으로 기록
+    pts = [x1, y1, x2, y1, x2, y2, x1, y2]
+    return f"{cls_idx} " + " ".join(f"{p:.6f}" for p in pts)
+
+
+def write_atomic(path: str, data: bytes):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+# 5. 페이지 단위 처리 (이미지는 제한된 풀에서 동시 다운로드)
+def export_rows(rows, state, source, pool, out_dir, val_ratio) -> list[str]:
+    names = state["names"]
+    jobs = []
+    for row in rows:
+        if row.get("status") == "hidden" or not row.get("image_url"):
+            continue
+        hazard = row.get("hazard_type") or "unknown"
+        # 라벨이 유효한 행만 클래스를 등록 (박스가 깨진 행 때문에 학습 샘플 없는 클래스가 생기지 않도록)
+        cls_idx = names.index(hazard) if hazard in names else len(names)
+        line = yolo_label_line(cls_idx, row)
+        if line is None:
+            continue
+        if cls_idx == len(names):
+            names.append(hazard)  # 새 클래스는 뒤에 추가 -> 기존 인덱스 유지
+
+        split = split_for(row["item_id"], val_ratio)
+        img_path = os.path.join(out_dir, "images", split, f"{row['item_id']}.jpg")
+        lbl_path = os.path.join(out_dir, "labels", split, f"{row['item_id']}.txt")
+        if os.path.exists(img_path) and os.path.exists(lbl_path):
+            continue  # 이미 내보낸 행 (재실행 시 건너뜀)
+
+        future = pool.submit(source.fetch, object_key(row["image_url"]))
+        jobs.append((row["item_id"], future, img_path, lbl_path, line))
+
+    failed = []
+    for item_id, future, img_path, lbl_path, line in jobs:
+        try:
+            write_atomic(img_path, future.result())
+            write_atomic(lbl_path, (line + "\n").encode("utf-8"))
+            state["exported"] += 1
+        except Exception as e:
+            logger.warning(f"⚠️ Export Skip {item_id}: {e}")
+            failed.append(item_id)
+    return failed
+
+
+# 6. custom_data.yaml 재생성
+def write_data_yaml(yaml_path: str, out_dir: str, names: list[str]):
+    rel = os.path.relpath(os.path.abspath(out_dir), os.path.dirname(os.path.abspath(yaml_path)))
+    body = yaml.safe_dump(
+        {
+            "path": "./" + rel.replace(os.sep, "/"),
+            "train": "images/train",
+            "val": "images/val",
+            "nc": len(names),
+            "names": {i: n for i, n in enumerate(names)},
+        },
+        allow_unicode=True,
+        sort_keys=False,
+    )
+    header = "# export_dataset.py가 자동 생성한 파일입니다. (reports 테이블 기준)\n"
+    write_atomic(yaml_path, (header + body).encode("utf-8"))
+
+
+def run_export(out_dir: str, yaml_path: str, s3_root: str | None, page_size: int, workers: int, val_ratio: float):
+    for sub in ("images/train", "images/val", "labels/train", "labels/val"):
+        os.makedirs(os.path.join(out_dir, sub), exist_ok=True)
+
+    state = load_state(out_dir)
+    source = LocalImageSource(s3_root) if s3_root else S3ImageSource()
+    before = state["exported"]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # 1) 이전 실행에서 실패한 항목 재시도
+        retry_ids, state["failed"] = state["failed"], []
+        if retry_ids:
+            state["failed"] = export_rows(fetch_reports_by_ids(retry_ids), state, source, pool, out_dir, val_ratio)
+            save_state(out_dir, state)
+
+        # 2) 체크포인트 이후 신규 행만 처리 (페이지마다 체크포인트 저장 -> 중단 후 재개 가능)
+        for rows in iter_new_reports(state["cursor"], page_size):
+            state["failed"] += export_rows(rows, state, source, pool, out_dir, val_ratio)
+            state["cursor"] = {"created_at": rows[-1]["created_at"], "item_id": rows[-1]["item_id"]}
+            save_state(out_dir, state)
+            print(f"➡️ {state['cursor']['created_at']} 까지 처리 (누적 {state['exported']}장)")
+
+    if state["names"]:
+        write_data_yaml(yaml_path, out_dir, state["names"])
+
+    print(f"✅ 내보내기 완료: 신규 {state['exported'] - before}장 / 재시도 대기 {len(state['failed'])}건")
+    return state
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="reports 테이블을 YOLO 학습 데이터셋으로 증분 내보냅니다.")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="데이터셋 루트 폴더")
+    parser.add_argument("--data-yaml", default=DEFAULT_YAML, help="다시 생성할 custom_data.yaml 경로")
+    parser.add_argument("--s3-root", default=None, help="S3 대신 사용할 로컬 폴더 (버킷 키 = 상대 경로)")
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8, help="동시 이미지 다운로드 수")
+    parser.add_argument("--val-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    run_export(args.out, args.data_yaml, args.s3_root, args.page_size, args.workers, args.val_ratio)
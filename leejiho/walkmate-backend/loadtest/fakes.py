@@ -0,0 +1,617 @@
+import asyncio
+import io
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import httpx
+
+# 부하 테스트용 로컬 대역 (S3 / Supabase PostgREST / TMAP)
+#
+# 실제 서비스 없이 앱 코드 경로를 그대로 실행할 수 있도록
+# 앱이 사용하는 메서드만 같은 모양으로 흉내냅니다.
+# 각 대역은 FaultInjector로 지연시간과 에러 비율을 조절할 수 있습니다.
+
+
+# 1. 지연/에러 주입
+class FaultInjector:
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+
+    def delay(self) -> float:
+        return max(self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms), 0.0) / 1000
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and random.random() < self.error_rate
+
+    def sync_call(self, name: str):
+        # boto3 / supabase 클라이언트는 동기 호출 -> 실제처럼 호출 스레드를 막음
+        d = self.delay()
+        if d:
+            time.sleep(d)
+        if self.should_fail():
+            raise FakeServiceError(f"injected failure: {name}")
+
+    async def async_call(self):
+        d = self.delay()
+        if d:
+            await asyncio.sleep(d)
+        return self.should_fail()
+
+
+class FakeServiceError(Exception):
+    pass
+
+
+class FakeAPIError(Exception):
+    """postgrest.exceptions.APIError 와 같은 속성(code, message)을 가진 에러"""
+    def __init__(self, message: str, code: str):
+        super().__init__({"message": message, "code": code})
+        self.message = message
+        self.code = code
+
+
+# 2. S3 대역 (boto3 s3 client 호환 메서드)
+FAKE_S3_URL = "https://fake-s3.local"
+
+
+class FakeS3Client:
+    def __init__(self, faults: FaultInjector | None = None, root: str | None = None):
+        self.faults = faults or FaultInjector()
+        self.root = root  # 지정하면 로컬 폴더에 실제 파일로 저장 (export_dataset.py --s3-root 와 호환)
+        self._objects = {}  # key -> (bytes 또는 None, content_type, last_modified, size)
+        self._lock = threading.Lock()
+
+    def _store(self, key: str, body: bytes, content_type: str | None):
+        size = len(body)
+        if self.root:
+            path = os.path.join(self.root, key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(body)
+            body = None  # 메모리에는 메타데이터만 유지
+        with self._lock:
+            self._objects[key] = (body, content_type or "binary/octet-stream", datetime.now(timezone.utc), size)
+
+    def _load(self, key: str) -> bytes:
+        body = self._objects[key][0]
+        if body is None:
+            with open(os.path.join(self.root, key), "rb") as f:
+                body = f.read()
+        return body
+
+    def _missing(self, op: str):
+        from botocore.exceptions import ClientError
+        return ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, op)
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None):
+        self.faults.sync_call("s3.upload_fileobj")
+        self._store(key, fileobj.read(), (ExtraArgs or {}).get("ContentType"))
+
+    def put_object(self, Bucket, Key, Body, ContentType=None, **kwargs):
+        self.faults.sync_call("s3.put_object")
+        self._store(Key, Body if isinstance(Body, bytes) else Body.read(), ContentType)
+        return {"ETag": uuid.uuid4().hex}
+
+    def get_object(self, Bucket, Key, **kwargs):
+        self.faults.sync_call("s3.get_object")
+        if Key not in self._objects:
+            raise self._missing("GetObject")
+        _, content_type, modified, size = self._objects[Key]
+        return {"Body": io.BytesIO(self._load(Key)), "ContentType": content_type, "ContentLength": size, "LastModified": modified}
+
+    def head_object(self, Bucket, Key, **kwargs):
+        self.faults.sync_call("s3.head_object")
+        if Key not in self._objects:
+            raise self._missing("HeadObject")
+        _, content_type, modified, size = self._objects[Key]
+        return {"ContentType": content_type, "ContentLength": size, "LastModified": modified}
+
+    def list_objects_v2(self, Bucket, MaxKeys=1000, ContinuationToken=None, StartAfter=None, Prefix="", **kwargs):
+        self.faults.sync_call("s3.list_objects_v2")
+        with self._lock:
+            keys = sorted(k for k in self._objects if k.startswith(Prefix or ""))
+        start_after = ContinuationToken or StartAfter
+        if start_after:
+            keys = [k for k in keys if k > start_after]
+        page, rest = keys[:MaxKeys], keys[MaxKeys:]
+        response = {"KeyCount": len(page), "IsTruncated": bool(rest)}
+        if page:
+            response["Contents"] = [
+                {"Key": k, "LastModified": self._objects[k][2], "Size": self._objects[k][3]} for k in page
+            ]
+        if rest:
+            response["NextContinuationToken"] = page[-1]
+        return response
+
+    def generate_presigned_url(self, ClientMethod, Params, ExpiresIn=3600, **kwargs):
+        # 서명 계산 비용을 흉내내지 않음 (순수 로컬 연산이므로 지연 주입 없음)
+        expires = int(time.time()) + ExpiresIn
+        return f"{FAKE_S3_URL}/{Params['Bucket']}/{Params['Key']}?X-Amz-Expires={ExpiresIn}&Expires={expires}"
+
+    def generate_presigned_post(self, Bucket, Key, Fields=None, Conditions=None, ExpiresIn=3600):
+        max_bytes = next(
+            (c[2] for c in Conditions or [] if isinstance(c, list) and c[0] == "content-length-range"), None
+        )
+        policy = json.dumps({"key": Key, "expires": time.time() + ExpiresIn, "max": max_bytes})
+        return {"url": f"{FAKE_S3_URL}/{Bucket}", "fields": {"key": Key, **(Fields or {}), "policy": policy}}
+
+    def receive_post(self, fields: dict, body: bytes):
+        """presigned POST 로 앱이 직접 올리는 요청을 흉내 (S3 정책 검증 포함, 실패 시 403 대신 예외)"""
+        self.faults.sync_call("s3.post_object")
+        policy = json.loads(fields["policy"])
+        if time.time() > policy["expires"]:
+            raise FakeServiceError("presigned POST expired")
+        if policy["max"] is not None and len(body) > policy["max"]:
+            raise FakeServiceError("EntityTooLarge")
+        self._store(fields["key"], body, fields.get("Content-Type"))
+
+    def object_count(self) -> int:
+        return len(self._objects)
+
+
+# 3. Supabase(PostgREST) 대역
+def _to_geojson(location):
+    if isinstance(location, str) and location.startswith("POINT"):
+        lon, lat = map(float, location[6:-1].split())
+        return {"type": "Point", "coordinates": [lon, lat]}
+    return location
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _split_top_level(expr: str) -> list[str]:
+    parts, depth, quoted, buf = [], 0, False, ""
+    for ch in expr:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0 and not quoted:
+            parts.append(buf)
+            buf = ""
+        else:
+            buf += ch
+    if buf:
+        parts.append(buf)
+    return parts
+
+
+_OPS = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "gt": lambda a, b: a is not None and a > b,
+    "gte": lambda a, b: a is not None and a >= b,
+    "lt": lambda a, b: a is not None and a < b,
+    "lte": lambda a, b: a is not None and a <= b,
+}
+
+
+def _coerce(row_value, raw: str):
+    raw = raw.strip('"')
+    if isinstance(row_value, bool):
+        return raw == "true"
+    if isinstance(row_value, (int, float)) and not isinstance(row_value, bool):
+        try:
+            return type(row_value)(raw)
+        except ValueError:
+            return raw
+    return raw
+
+
+def _parse_logic(expr: str):
+    # 예) created_at.gt."ts",and(created_at.eq."ts",item_id.gt.abc)  (or_ 인자)
+    terms = []
+    for term in _split_top_level(expr):
+        m = re.match(r"^(and|or)\((.*)\)$", term)
+        if m:
+            terms.append((m.group(1), _parse_logic(m.group(2))))
+        else:
+            col, op, value = term.split(".", 2)
+            terms.append(("cmp", (col, op, value)))
+    return terms
+
+
+def _eval_logic(row, terms, mode="or") -> bool:
+    results = []
+    for kind, payload in terms:
+        if kind == "cmp":
+            col, op, raw = payload
+            value = row.get(col)
+            results.append(_OPS[op](value, _coerce(value, raw)))
+        else:
+            results.append(_eval_logic(row, payload, kind))
+    return any(results) if mode == "or" else all(results)
+
+
+class _Result:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    def __init__(self, db: "FakeSupabaseClient", table: str):
+        self.db = db
+        self.table = table
+        self.action = "select"
+        self.columns = "*"
+        self.count = None
+        self.payload = None
+        self.filters = []
+        self.orders = []
+        self.offset = 0
+        self.max_rows = None
+        self._negate = False
+
+    # --- 동작 ---
+    def select(self, columns="*", count=None):
+        self.action, self.columns, self.count = "select", columns, count
+        return self
+
+    def insert(self, payload):
+        self.action, self.payload = "insert", payload
+        return self
+
+    def upsert(self, payload, on_conflict=None, ignore_duplicates=False):
+        self.action, self.payload = "upsert", payload
+        return self
+
+    def update(self, payload):
+        self.action, self.payload = "update", payload
+        return self
+
+    def delete(self):
+        self.action = "delete"
+        return self
+
+    # --- 필터 ---
+    def _filter(self, fn):
+        if self._negate:
+            self._negate = False
+            self.filters.append(lambda r: not fn(r))
+        else:
+            self.filters.append(fn)
+        return self
+
+    @property
+    def not_(self):
+        # 바로 다음 필터 하나를 부정 (.not_.is_("col", "null") -> col IS NOT NULL)
+        self._negate = True
+        return self
+
+    def eq(self, col, value):
+        return self._filter(lambda r: r.get(col) == value)
+
+    def neq(self, col, value):
+        return self._filter(lambda r: r.get(col) != value)
+
+    def gt(self, col, value):
+        return self._filter(lambda r: r.get(col) is not None and r.get(col) > value)
+
+    def gte(self, col, value):
+        return self._filter(lambda r: r.get(col) is not None and r.get(col) >= value)
+
+    def lt(self, col, value):
+        return self._filter(lambda r: r.get(col) is not None and r.get(col) < value)
+
+    def lte(self, col, value):
+        return self._filter(lambda r: r.get(col) is not None and r.get(col) <= value)
+
+    def in_(self, col, values):
+        values = set(values)
+        return self._filter(lambda r: r.get(col) in values)
+
+    def is_(self, col, value):
+        expected = {"null": None, "true": True, "false": False}[str(value).lower()]
+        return self._filter(lambda r: r.get(col) is expected)
+
+    def or_(self, expr):
+        terms = _parse_logic(expr)
+        return self._filter(lambda r: _eval_logic(r, terms))
+
+    def order(self, col, desc=False):
+        self.orders.append((col, desc))
+        return self
+
+    def range(self, start, end):
+        self.offset, self.max_rows = start, end - start + 1
+        return self
+
+    def limit(self, n):
+        self.max_rows = n
+        return self
+
+    def _project(self, row):
+        if self.columns.strip() == "*":
+            return dict(row)
+        out = {}
+        for c in self.columns.split(","):
+            alias, _, col = c.strip().rpartition(":")  # "updated_at:deleted_at" 같은 별칭
+            col = col.strip()
+            out[alias.strip() or col] = row.get(col)
+        return out
+
+    def execute(self):
+        self.db.faults.sync_call(f"supabase.{self.action}")
+        return self.db._execute(self)
+
+
+class FakeRpc:
+    def __init__(self, db, name, params):
+        self.db, self.name, self.params = db, name, params
+
+    def execute(self):
+        self.db.faults.sync_call(f"supabase.rpc.{self.name}")
+        fn = self.db.rpc_functions.get(self.name)
+        if fn is None:
+            raise FakeAPIError(f"function {self.name} does not exist", "PGRST202")
+        return _Result(fn(self.db, **self.params))
+
+
+def _rpc_reports_in_bbox(db, min_lon, min_lat, max_lon, max_lat):
+    # 실제 DB 함수(get_reports_in_bbox)의 반환 형태: lat, lng, distance, direction
+    out = []
+    for row in db.rows("reports"):
+        lon, lat = row["location"]["coordinates"]
+        if min_lon <= lon <= max_lon and min_lat <= lat <= max_lat and row.get("status") not in ("done", "hidden"):
+            out.append({"lat": lat, "lng": lon, "distance": row.get("distance"), "direction": row.get("direction")})
+    return out
+
+
+def _rpc_bulk_update_report_status(db, new_status, min_lon=None, min_lat=None, max_lon=None, max_lat=None,
+                                   filter_hazard=None, created_before=None):
+    # sql/bulk_update_report_status.sql 과 같은 조건
+    out = []
+    with db._lock:
+        for row in db._tables.setdefault("reports", {}).values():
+            lon, lat = row["location"]["coordinates"]
+            if min_lon is not None and not (min_lon <= lon <= max_lon and min_lat <= lat <= max_lat):
+                continue
+            if filter_hazard is not None and row.get("hazard_type") != filter_hazard:
+                continue
+            if created_before is not None and not (
+                datetime.fromisoformat(row["created_at"]) < datetime.fromisoformat(created_before)
+            ):
+                continue
+            if row.get("status") == new_status:
+                continue
+            row["status"] = new_status
+            db._touch("reports", row)
+            out.append({"item_id": row["item_id"]})
+    return out
+
+
+def _parse_iso(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _rpc_hotspot_dirty_tiles(db, since, tile_deg, halo_deg):
+    # sql/report_hotspots.sql 의 hotspot_dirty_tiles 와 같은 결과 (watermark + halo 를 포함한 tile 목록)
+    since_ts = _parse_iso(since) if since else None
+    watermark, tiles = None, set()
+    for row in db.rows("reports"):
+        if not row.get("location"):
+            continue
+        updated = _parse_iso(row["updated_at"])
+        if since_ts and updated <= since_ts:
+            continue
+        watermark = max(watermark or updated, updated)
+        lng, lat = row["location"]["coordinates"]
+        for dy in (-halo_deg, halo_deg):
+            for dx in (-halo_deg, halo_deg):
+                tiles.add((math.floor((lat + dy) / tile_deg), math.floor((lng + dx) / tile_deg)))
+    return {"watermark": watermark.isoformat() if watermark else None, "tiles": [list(t) for t in sorted(tiles)]}
+
+
+def _rpc_hotspot_points(db, min_lat, min_lng, max_lat, max_lng, after_id=None, page_size=1000):
+    out = []
+    for row in db.rows("reports"):
+        lng, lat = row["location"]["coordinates"]
+        if not (min_lng <= lng <= max_lng and min_lat <= lat <= max_lat) or row.get("status") in ("done", "hidden"):
+            continue
+        if after_id is not None and str(row["item_id"]) <= after_id:
+            continue
+        out.append({
+            "item_id": str(row["item_id"]), "latitude": lat, "longitude": lng,
+            "hazard_type": row.get("hazard_type"), "risk_level": row.get("risk_level"), "created_at": row.get("created_at"),
+        })
+    out.sort(key=lambda r: r["item_id"])
+    return out[:page_size]
+
+
+def _rpc_replace_hotspots(db, tiles, hotspots):
+    # 삭제 + 삽입을 잠금 하나로 (DB 함수의 한 트랜잭션과 같음)
+    tiles = set(tiles)
+    with db._lock:
+        store = db._tables.setdefault("report_hotspots", {})
+        for key in [k for k, h in store.items() if h["tile"] in tiles]:
+            del store[key]
+        for h in hotspots:
+            store[h["hotspot_id"]] = {**h, "computed_at": _now_iso()}
+    return len(hotspots)
+
+
+class FakeSupabaseClient:
+    def __init__(self, faults: FaultInjector | None = None):
+        self.faults = faults or FaultInjector()
+        self._tables = {"reports": {}}
+        self._lock = threading.Lock()
+        self._change_version = 0  # reports_change_version_seq
+        self.primary_keys = {"reports": "item_id", "report_hotspots": "hotspot_id"}
+        self.rpc_functions = {
+            "get_reports_in_bbox": _rpc_reports_in_bbox,
+            "bulk_update_report_status": _rpc_bulk_update_report_status,
+            "hotspot_dirty_tiles": _rpc_hotspot_dirty_tiles,
+            "hotspot_points": _rpc_hotspot_points,
+            "replace_hotspots": _rpc_replace_hotspots,
+        }
+
+    def _touch(self, table: str, row: dict):
+        # reports 의 INSERT / UPDATE 트리거 흉내 (sql/report_hotspots.sql, sql/report_change_version.sql)
+        # 호출하는 쪽이 self._lock 을 잡고 있어야 함
+        if table == "reports":
+            self._change_version += 1
+            row["change_version"] = self._change_version
+            row["updated_at"] = _now_iso()
+
+    def _tombstone(self, table: str, row: dict):
+        if table == "reports":
+            self._change_version += 1
+            self._tables.setdefault("report_tombstones", {})[uuid.uuid4().hex] = {
+                "item_id": str(row["item_id"]), "change_version": self._change_version, "deleted_at": _now_iso(),
+            }
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def rpc(self, name: str, params: dict | None = None) -> FakeRpc:
+        return FakeRpc(self, name, params or {})
+
+    def rows(self, table: str) -> list[dict]:
+        with self._lock:
+            return list(self._tables.setdefault(table, {}).values())
+
+    def seed(self, table: str, rows: list[dict]):
+        # 대량 적재 (지연 주입 없음)
+        pk = self.primary_keys.get(table, "id")
+        with self._lock:
+            store = self._tables.setdefault(table, {})
+            for row in rows:
+                row = dict(row)
+                row["location"] = _to_geojson(row.get("location"))
+                self._touch(table, row)
+                store[row.get(pk) or uuid.uuid4().hex] = row
+
+    def _execute(self, q: FakeQuery) -> _Result:
+        pk = self.primary_keys.get(q.table, "id")
+        with self._lock:
+            store = self._tables.setdefault(q.table, {})
+
+            if q.action in ("insert", "upsert"):
+                payload = q.payload if isinstance(q.payload, list) else [q.payload]
+                inserted = []
+                for item in payload:
+                    row = {"created_at": _now_iso(), **item}
+                    if "location" in row:
+                        row["location"] = _to_geojson(row["location"])
+                    key = row.get(pk) or uuid.uuid4().hex
+                    if key in store and q.action == "insert":
+                        raise FakeAPIError(f'duplicate key value violates unique constraint "{q.table}_pkey"', "23505")
+                    row.setdefault(pk, key)
+                    self._touch(q.table, row)
+                    store[key] = row
+                    inserted.append(dict(row))
+                return _Result(inserted)
+
+            matched = [r for r in store.values() if all(f(r) for f in q.filters)]
+
+            if q.action == "update":
+                for r in matched:
+                    r.update(q.payload)
+                    self._touch(q.table, r)
+                return _Result([dict(r) for r in matched])
+
+            if q.action == "delete":
+                for r in matched:
+                    store.pop(r.get(pk), None)
+                    self._tombstone(q.table, r)
+                return _Result([dict(r) for r in matched])
+
+            for col, desc in reversed(q.orders):
+                matched.sort(key=lambda r: (r.get(col) is None, r.get(col)), reverse=desc)
+            total = len(matched) if q.count else None
+            end = None if q.max_rows is None else q.offset + q.max_rows
+            page = matched[q.offset:end]
+            return _Result([q._project(r) for r in page], total)
+
+
+# 4. TMAP 대역 (httpx.MockTransport)
+def _fake_route(req: dict) -> dict:
+    sx, sy, ex, ey = float(req["startX"]), float(req["startY"]), float(req["endX"]), float(req["endY"])
+    n = 12
+    coords = [[sx + (ex - sx) * i / n, sy + (ey - sy) * i / n] for i in range(n + 1)]
+    features = []
+    for i in range(0, n + 1, 4):
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": coords[i]},
+            "properties": {"description": f"{i * 10}m 직진", "pointType": "GP"},
+        })
+        if i < n:
+            features.append({
+                "type": "Feature",
+                "geometry": {"type": "LineString", "coordinates": coords[i:i + 5]},
+                "properties": {"description": "보행자도로", "distance": 40},
+            })
+    total = int(((ex - sx) ** 2 + (ey - sy) ** 2) ** 0.5 * 111_000)
+    features[0]["properties"].update({"totalDistance": total, "totalTime": int(total / 1.2)})
+    return {"type": "FeatureCollection", "features": features}
+
+
+class FakeTmap:
+    def __init__(self, faults: FaultInjector | None = None):
+        self.faults = faults or FaultInjector()
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        failed = await self.faults.async_call()
+        if failed:
+            return httpx.Response(500, json={"error": {"code": "9999", "message": "injected failure"}})
+        return httpx.Response(200, json=_fake_route(json.loads(request.content)))
+
+    def async_client_factory(self):
+        real_async_client = httpx.AsyncClient
+
+        def factory(*args, **kwargs):
+            kwargs["transport"] = httpx.MockTransport(self.handler)
+            return real_async_client(*args, **kwargs)
+
+        return factory
+
+
+# 5. 앱에 대역 설치
+class Fakes:
+    def __init__(self, s3: FakeS3Client, db: FakeSupabaseClient, tmap: FakeTmap):
+        self.s3, self.db, self.tmap = s3, db, tmap
+
+
+def prepare_env():
+    # app.core.* 가 import 시점에 환경변수를 검사하므로 먼저 더미 값을 채워둠
+    os.environ.setdefault("SUPABASE_URL", "http://fake-supabase.local")
+    os.environ.setdefault("SUPABASE_KEY", "fake.header.signature")
+    os.environ.setdefault("AWS_BUCKET_NAME", "fake-bucket")
+    os.environ.setdefault("AWS_REGION", "ap-northeast-2")
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "fake")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "fake")
+    os.environ.setdefault("TMAP_API_KEY", "fake")
+
+
+def install_fakes(s3_faults=None, db_faults=None, tmap_faults=None, s3_root=None) -> Fakes:
+    prepare_env()
+    import app.core.database as database
+    import app.services.s3_uploader as s3_module
+    import app.services.tmap_service as tmap_service
+
+    fakes = Fakes(FakeS3Client(s3_faults, root=s3_root), FakeSupabaseClient(db_faults), FakeTmap(tmap_faults))
+
+    database.set_db_client(fakes.db)
+    s3_module.s3_uploader.s3_client = fakes.s3
+    tmap_service.httpx = SimpleNamespace(
+        AsyncClient=fakes.tmap.async_client_factory(),
+        HTTPStatusError=httpx.HTTPStatusError,
+        RequestError=httpx.RequestError,
+    )
+    return fakes
@@ -0,0 +1,309 @@
+import argparse
+import bisect
+import csv
+import io
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 대용량 신고 데이터 생성기 (지도/히트맵/관리자 조회 규모 테스트용)
+#
+# - 보도(도로 양옆)를 따라 몰려 있는 위치 분포, 일부 구간에 신고가 집중되는 인기도 분포
+# - 출퇴근/점심 시간대에 몰리는 시간 분포, 주말 감소
+# - 위험물 종류 비율, 종류별 위험도, 오래된 신고일수록 processing/done 으로 넘어간 상태
+# - S3 업로더와 같은 형식의 image_url (옵션으로 실제 플레이스홀더 이미지 파일 생성)
+#
+# 같은 --seed 이면 항상 같은 데이터가 나오므로 쿼리 벤치마크를 재현할 수 있습니다.
+#
+# 예) python -m loadtest.generate_reports --rows 1000000 --out reports.csv
+#     python -m loadtest.generate_reports --rows 10000000 --dsn postgresql://... (COPY로 바로 적재)
+#     psql -c "\copy reports(item_id,user_id,...) FROM 'reports.csv' CSV HEADER"
+
+CENTER = (37.2887309, 127.047446)  # 수원 (temp.json 샘플 기준)
+KST = timezone(timedelta(hours=9))
+BUCKET_URL = "https://fake-bucket.s3.ap-northeast-2.amazonaws.com"
+
+COLUMNS = [
+    "item_id", "user_id", "created_at", "location", "hazard_type", "distance", "direction",
+    "x", "y", "w", "h", "risk_level", "image_url", "description", "status",
+]
+
+# 위험물 종류별 (비율, 기본 위험도)
+HAZARD_MIX = {
+    "킥보드": (0.30, 3),
+    "자전거": (0.20, 2),
+    "불법 주정차": (0.15, 4),
+    "볼라드": (0.12, 3),
+    "공사장": (0.08, 5),
+    "쓰레기": (0.15, 1),
+}
+
+# 시간대별 상대 빈도 (KST 0~23시): 출근 / 점심 / 퇴근 시간대에 집중
+HOUR_WEIGHTS = [
+    0.2, 0.1, 0.1, 0.1, 0.1, 0.3, 0.8, 1.8, 2.6, 1.6, 1.0, 1.2,
+    1.9, 1.5, 1.0, 1.0, 1.2, 1.9, 2.7, 2.0, 1.3, 0.9, 0.6, 0.4,
+]
+WEEKEND_FACTOR = 0.6
+
+# 1x1 JPEG (플레이스홀더 이미지)
+TINY_JPEG = bytes.fromhex(
+    "ffd8ffe000104a46494600010100000100010000ffdb004300080606070605080707070909080a0c140d0c0b0b0c1912130f"
+    "141d1a1f1e1d1a1c1c20242e2720222c231c1c2837292c30313434341f27393d38323c2e333432ffc0000b080001000101011100"
+    "ffc4001f0000010501010101010100000000000000000102030405060708090a0bffda0008010100003f00fbd3ffd9"
+)
+
+M_PER_DEG_LAT = 111_320.0
+
+
+# 1. 보도 모델: 도로 구간 + 양옆 보도 오프셋
+class Sidewalks:
+    def __init__(self, rng: random.Random, segments: int, spread_m: float):
+        self.rng = rng
+        self.m_per_deg_lon = M_PER_DEG_LAT * math.cos(math.radians(CENTER[0]))
+        self.segments = []
+        weights = []
+        for _ in range(segments):
+            # 도시 격자에 가깝게 대부분 남북/동서 방향, 약간씩 틀어짐
+            bearing = rng.choice([0.0, 90.0]) + rng.gauss(0, 12)
+            length = rng.uniform(100, 800)
+            half_width = rng.uniform(4, 12)  # 도로 중심선 ~ 보도까지 거리
+            start = (rng.gauss(0, spread_m), rng.gauss(0, spread_m))  # (동, 북) m
+            self.segments.append((start, math.radians(bearing), length, half_width))
+            # 유동인구가 많은 일부 구간에 신고가 몰림 (파레토 분포)
+            weights.append(rng.paretovariate(1.2))
+
+        total = sum(weights)
+        acc = 0.0
+        self.cum_weights = []
+        for w in weights:
+            acc += w / total
+            self.cum_weights.append(acc)
+
+    def sample(self) -> tuple[float, float]:
+        rng = self.rng
+        idx = min(bisect.bisect_left(self.cum_weights, rng.random()), len(self.segments) - 1)
+        (sx, sy), bearing, length, half_width = self.segments[idx]
+        t = rng.random() * length
+        side = rng.choice((-1.0, 1.0)) * (half_width + rng.gauss(0, 1.5))
+        # 진행 방향 벡터(sin, cos) 와 그 법선 방향으로 보도 오프셋
+        east = sx + t * math.sin(bearing) + side * math.cos(bearing)
+        north = sy + t * math.cos(bearing) - side * math.sin(bearing)
+        return CENTER[0] + north / M_PER_DEG_LAT, CENTER[1] + east / self.m_per_deg_lon
+
+
+# 2. 신고 1건 생성
+class ReportGenerator:
+    def __init__(self, seed: int = 42, days: int = 180, end: datetime | None = None,
+                 segments: int = 2000, spread_m: float = 3000, users: int = 5000,
+                 bucket_url: str = BUCKET_URL):
+        self.rng = random.Random(seed)
+        self.sidewalks = Sidewalks(self.rng, segments, spread_m)
+        self.end = (end or datetime(2026, 3, 1, tzinfo=KST)).astimezone(KST)
+        self.days = days
+        self.bucket_url = bucket_url.rstrip("/")
+        self.user_ids = [self._uuid() for _ in range(users)]
+
+        self.hazards = list(HAZARD_MIX)
+        self.hazard_weights = [HAZARD_MIX[h][0] for h in self.hazards]
+
+    def _uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def _created_at(self) -> datetime:
+        rng = self.rng
+        while True:
+            day = self.end - timedelta(days=rng.randrange(self.days) + 1)
+            if day.weekday() < 5 or rng.random() < WEEKEND_FACTOR:
+                break
+        hour = rng.choices(range(24), weights=HOUR_WEIGHTS)[0]
+        return day.replace(hour=hour, minute=rng.randrange(60), second=rng.randrange(60), microsecond=0)
+
+    def _status(self, age_days: float) -> str:
+        # 오래된 신고일수록 처리 단계가 진행되어 있음 (new -> processing -> done)
+        r = self.rng.random()
+        if r < 1 - math.exp(-age_days / 20):
+            return "done"
+        if r < 1 - math.exp(-age_days / 5):
+            return "processing"
+        return "new"
+
+    def row(self) -> dict:
+        rng = self.rng
+        lat, lng = self.sidewalks.sample()
+        created_at = self._created_at()
+        age_days = (self.end - created_at).total_seconds() / 86400
+
+        hazard = rng.choices(self.hazards, weights=self.hazard_weights)[0]
+        risk = min(5, max(1, HAZARD_MIX[hazard][1] + rng.choice((-1, 0, 0, 0, 1))))
+
+        # 가까울수록 화면에서 박스가 크게 잡힘 (YOLO 정규화 중심 좌표)
+        distance = round(rng.lognormvariate(1.0, 0.5), 2)
+        direction = rng.choices(("L", "C", "R"), weights=(0.4, 0.2, 0.4))[0]
+        size = min(0.9, 0.6 / max(distance, 0.3))
+        w = round(size * rng.uniform(0.6, 1.2), 4)
+        h = round(size * rng.uniform(0.6, 1.4), 4)
+        cx = {"L": 0.2, "C": 0.5, "R": 0.8}[direction] + rng.gauss(0, 0.08)
+        x = round(min(1 - w / 2, max(w / 2, cx)), 4)
+        y = round(min(1 - h / 2, max(h / 2, rng.uniform(0.55, 0.85))), 4)
+
+        item_id = self._uuid()
+        return {
+            "item_id": item_id,
+            "user_id": rng.choice(self.user_ids),
+            "created_at": created_at.isoformat(),
+            "location": f"POINT({lng:.7f} {lat:.7f})",
+            "hazard_type": hazard,
+            "distance": distance,
+            "direction": direction,
+            "x": x, "y": y, "w": min(w, 1.0), "h": min(h, 1.0),
+            "risk_level": risk,
+            "image_url": f"{self.bucket_url}/{item_id}.jpg",
+            "description": None,
+            "status": self._status(age_days),
+        }
+
+    def rows(self, n: int):
+        for _ in range(n):
+            yield self.row()
+
+
+def generate_reports(n: int, seed: int = 42, **kwargs) -> list[dict]:
+    """소량 생성용 (부하 테스트 대역 DB 시딩 등)"""
+    return list(ReportGenerator(seed=seed, **kwargs).rows(n))
+
+
+# 3. COPY 형식 스트림 (CSV, location은 EWKT)
+class CopyStream(io.TextIOBase):
+    """
+    행 제너레이터를 COPY ... FROM STDIN (FORMAT csv) 입력으로 흘려보내는 파일 객체.
+    전체를 메모리에 올리지 않고 read() 호출 때마다 필요한 만큼만 직렬화합니다.
+    """
+
+    def __init__(self, rows, header: bool = False, on_row=None):
+        self._rows = iter(rows)
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf, lineterminator="\n")
+        self._pending = ""
+        self._on_row = on_row
+        if header:
+            self._writer.writerow(COLUMNS)
+
+    def readable(self):
+        return True
+
+    def _fill(self, size: int):
+        while len(self._pending) < size:
+            chunk = self._buf.getvalue()
+            if chunk:
+                self._pending += chunk
+                self._buf.seek(0)
+                self._buf.truncate()
+                continue
+            row = next(self._rows, None)
+            if row is None:
+                break
+            if self._on_row:
+                self._on_row(row)
+            self._writer.writerow([_copy_value(c, row[c]) for c in COLUMNS])
+
+    def read(self, size: int = -1) -> str:
+        if size is None or size < 0:
+            size = 1 << 62
+        self._fill(size)
+        out, self._pending = self._pending[:size], self._pending[size:]
+        return out
+
+
+def _copy_value(column: str, value):
+    if value is None:
+        return ""  # CSV 모드에서 따옴표 없는 빈 값 = NULL
+    if column == "location":
+        return f"SRID=4326;{value}"
+    return value
+
+
+# 4. 적재 대상
+def copy_to_postgres(dsn: str, rows, table: str = "reports", on_row=None):
+    try:
+        import psycopg2
+    except ImportError:
+        sys.exit("❌ psycopg2가 필요합니다: pip install psycopg2-binary")
+
+    with psycopg2.connect(dsn) as conn, conn.cursor() as cur:
+        cur.copy_expert(
+            f"COPY {table} ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            CopyStream(rows, on_row=on_row),
+            size=1 << 16,
+        )
+
+
+def write_csv(path: str, rows, on_row=None):
+    stream = CopyStream(rows, header=True, on_row=on_row)
+    out = sys.stdout if path == "-" else open(path, "w", encoding="utf-8", newline="")
+    try:
+        while True:
+            chunk = stream.read(1 << 16)
+            if not chunk:
+                break
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WalkMate 대용량 신고 데이터 생성기")
+    parser.add_argument("--rows", type=int, default=100_000, help="생성할 신고 수")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드 (같으면 같은 데이터)")
+    parser.add_argument("--days", type=int, default=180, help="생성 기간 (종료일로부터 과거 N일)")
+    parser.add_argument("--end", default="2026-03-01", help="기간 종료일 (YYYY-MM-DD, KST)")
+    parser.add_argument("--segments", type=int, default=2000, help="보도 구간 수 (클수록 덜 몰림)")
+    parser.add_argument("--spread-m", type=float, default=3000, help="중심점으로부터 분포 반경(m)")
+    parser.add_argument("--users", type=int, default=5000, help="신고자(user_id) 수")
+    parser.add_argument("--bucket-url", default=BUCKET_URL, help="image_url 접두사")
+    parser.add_argument("--images-dir", default=None,
+                        help="지정 시 image_url 키마다 플레이스홀더 JPEG 생성 (export_dataset --s3-root 용)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", help="COPY 형식 CSV 파일 경로 ('-' 이면 stdout)")
+    target.add_argument("--dsn", help="PostgreSQL 접속 문자열 (COPY FROM STDIN 으로 바로 적재)")
+    parser.add_argument("--table", default="reports")
+    args = parser.parse_args()
+
+    gen = ReportGenerator(
+        seed=args.seed, days=args.days,
+        end=datetime.strptime(args.end, "%Y-%m-%d").replace(tzinfo=KST),
+        segments=args.segments, spread_m=args.spread_m, users=args.users, bucket_url=args.bucket_url,
+    )
+
+    count = 0
+    started = time.perf_counter()
+
+    def on_row(row):
+        nonlocal count
+        count += 1
+        if args.images_dir:
+            with open(os.path.join(args.images_dir, f"{row['item_id']}.jpg"), "wb") as f:
+                f.write(TINY_JPEG)
+        if count % 100_000 == 0:
+            print(f"⏳ {count:,} rows ({count / (time.perf_counter() - started):,.0f} rows/s)", file=sys.stderr)
+
+    if args.images_dir:
+        os.makedirs(args.images_dir, exist_ok=True)
+
+    rows = gen.rows(args.rows)
+    if args.dsn:
+        copy_to_postgres(args.dsn, rows, table=args.table, on_row=on_row)
+    else:
+        write_csv(args.out, rows, on_row=on_row)
+
+    print(f"✅ {count:,} rows 생성 완료 ({time.perf_counter() - started:.1f}s, seed={args.seed})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
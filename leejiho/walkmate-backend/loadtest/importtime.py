@@ -0,0 +1,106 @@
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loadtest.fakes import prepare_env
+
+# 기동 시간 측정 (python -X importtime)
+#
+# 새 프로세스에서 `import app.main` 을 --runs 번 반복해 import 누적 시간과 프로세스 전체 시간의
+# 중앙값, 그리고 가장 오래 걸린 모듈을 출력합니다. --baseline REV 를 주면 해당 커밋을 임시 디렉터리에
+# 풀어 같은 방식으로 측정한 뒤 나란히 비교합니다.
+#
+# 예) python -m loadtest.importtime --runs 5
+#     python -m loadtest.importtime --baseline HEAD~1 --top 15
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def measure_once(root: str) -> tuple[float, float, dict[str, int]]:
+    """(app.main import 누적 ms, 프로세스 전체 ms, 모듈별 누적 us)"""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=root, env=os.environ.copy(), capture_output=True, text=True,
+    )
+    wall = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        m = LINE.match(line)
+        if m:
+            modules[m.group(4)] = int(m.group(2))
+    return modules.get("app.main", 0) / 1000, wall, modules
+
+
+def measure(root: str, runs: int) -> dict:
+    imports, walls, per_module = [], [], {}
+    for _ in range(runs):
+        total, wall, modules = measure_once(root)
+        imports.append(total)
+        walls.append(wall)
+        for name, us in modules.items():
+            per_module.setdefault(name, []).append(us)
+    return {
+        "import_ms": statistics.median(imports),
+        "wall_ms": statistics.median(walls),
+        "modules": {name: statistics.median(v) / 1000 for name, v in per_module.items()},
+    }
+
+
+def checkout(rev: str, dest: str) -> str:
+    # git archive 로 해당 커밋의 백엔드 디렉터리만 풀어냄 (작업 트리는 건드리지 않음)
+    prefix = subprocess.run(
+        ["git", "rev-parse", "--show-prefix"], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout.strip()
+    archive = os.path.join(dest, "src.tar")
+    subprocess.run(["git", "archive", "-o", archive, f"{rev}:{prefix}"], cwd=ROOT, check=True)
+    with tarfile.open(archive) as tar:
+        tar.extractall(dest)
+    return dest
+
+
+def top_modules(result: dict, n: int) -> list[tuple[str, float]]:
+    # app.* 자체와 최상위 패키지 위주로 (하위 모듈은 부모 누적 시간에 포함)
+    mods = [(k, v) for k, v in result["modules"].items() if "." not in k or k.startswith("app.")]
+    return sorted(mods, key=lambda kv: kv[1], reverse=True)[:n]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="app.main import 시간 측정 (python -X importtime)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="누적 시간이 큰 모듈 몇 개를 보여줄지")
+    parser.add_argument("--baseline", default=None, help="비교할 git 커밋 (예: HEAD~1)")
+    args = parser.parse_args()
+
+    prepare_env()
+    current = measure(ROOT, args.runs)
+
+    baseline = None
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = measure(checkout(args.baseline, tmp), args.runs)
+
+    print(f"{'':24}{'import(ms)':>12}{'process(ms)':>13}")
+    if baseline:
+        print(f"{args.baseline:24}{baseline['import_ms']:>12.1f}{baseline['wall_ms']:>13.1f}")
+    print(f"{'current':24}{current['import_ms']:>12.1f}{current['wall_ms']:>13.1f}")
+    if baseline:
+        saved = baseline["import_ms"] - current["import_ms"]
+        print(f"{'diff':24}{-saved:>+12.1f}{current['wall_ms'] - baseline['wall_ms']:>+13.1f}")
+
+    print(f"\nTop {args.top} modules by cumulative import time (current, ms)")
+    for name, ms in top_modules(current, args.top):
+        before = f"  (baseline {baseline['modules'][name]:.1f})" if baseline and name in baseline["modules"] else ""
+        print(f"  {ms:>9.1f}  {name}{before}")
@@ -0,0 +1,339 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loadtest.fakes import FAKE_S3_URL, FaultInjector, install_fakes
+from loadtest.generate_reports import TINY_JPEG, generate_reports
+
+# 부하 테스트 실행기
+#
+# 외부 서비스(S3 / Supabase / TMAP)를 로컬 대역으로 바꾼 상태에서
+# 실제 사용 패턴(신고 업로드 폭주, 지도/히트맵 폴링, 길찾기)을 동시에 재현하고
+# 엔드포인트별 처리량과 지연시간 백분위수(p50/p90/p99)를 출력합니다.
+#
+# 예) python -m loadtest.run --duration 30 --upload-clients 16 --s3-latency 120 --db-latency 40
+#     python -m loadtest.run --base-url http://127.0.0.1:8000   (loadtest.serve 로 띄운 서버 대상)
+
+CENTER = (37.2887309, 127.047446)  # 기본 좌표 (수원, temp.json 샘플 기준)
+HAZARDS = ["킥보드", "자전거", "볼라드", "공사장", "불법 주정차", "쓰레기"]
+
+
+# 1. 결과 집계
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.status_counts = defaultdict(lambda: defaultdict(int))
+
+    def record(self, name: str, seconds: float, status: int | None):
+        self.latencies[name].append(seconds)
+        self.status_counts[name][status or "exc"] += 1
+        if status is None or status >= 400:
+            self.errors[name] += 1
+
+    @staticmethod
+    def percentile(sorted_values, p):
+        if not sorted_values:
+            return 0.0
+        idx = min(int(round(p / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+        return sorted_values[idx]
+
+    def summary(self, elapsed: float) -> list[dict]:
+        rows = []
+        for name in sorted(self.latencies):
+            values = sorted(self.latencies[name])
+            rows.append({
+                "endpoint": name,
+                "requests": len(values),
+                "errors": self.errors[name],
+                "rps": round(len(values) / elapsed, 2),
+                "p50_ms": round(self.percentile(values, 50) * 1000, 2),
+                "p90_ms": round(self.percentile(values, 90) * 1000, 2),
+                "p99_ms": round(self.percentile(values, 99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2),
+                "status": {str(k): v for k, v in self.status_counts[name].items()},
+            })
+        return rows
+
+
+def print_table(rows: list[dict], elapsed: float):
+    print(f"\n📊 부하 테스트 결과 ({elapsed:.1f}s)")
+    header = f"{'endpoint':<22}{'req':>8}{'err':>7}{'rps':>9}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{r['endpoint']:<22}{r['requests']:>8}{r['errors']:>7}{r['rps']:>9}"
+              f"{r['p50_ms']:>10}{r['p90_ms']:>10}{r['p99_ms']:>10}{r['max_ms']:>10}")
+
+
+# 2. 요청 1건
+async def timed_request(client, stats, name, method, url, **kwargs):
+    start = time.perf_counter()
+    status = None
+    try:
+        response = await client.request(method, url, **kwargs)
+        status = response.status_code
+    except Exception:
+        pass
+    stats.record(name, time.perf_counter() - start, status)
+
+
+def random_point(spread_m: float = 1500):
+    lat = CENTER[0] + random.gauss(0, spread_m) / 111_000
+    lng = CENTER[1] + random.gauss(0, spread_m) / 88_000
+    return lat, lng
+
+
+def report_form():
+    lat, lng = random_point()
+    data = {
+        "item_id": str(uuid.uuid4()),
+        "user_id": str(uuid.uuid4()),
+        "latitude": f"{lat:.7f}",
+        "longitude": f"{lng:.7f}",
+        "distance": f"{random.uniform(0.5, 6):.2f}",
+        "direction": random.choice(["L", "C", "R"]),
+        "x": f"{random.random():.4f}",
+        "y": f"{random.random():.4f}",
+        "w": f"{random.uniform(0.05, 0.5):.4f}",
+        "h": f"{random.uniform(0.05, 0.5):.4f}",
+        "hazard_type": random.choice(HAZARDS),
+        "risk_level": str(random.randint(1, 5)),
+        "description": "loadtest",
+    }
+    return data, {"file": ("hazard.jpg", TINY_JPEG, "image/jpeg")}
+
+
+# 3. 시나리오
+async def upload_bursts(client, stats, deadline, burst_size, burst_pause):
+    # 여러 건을 연달아 보내고 잠시 쉼 (탐지가 몰릴 때의 앱 동작)
+    while time.perf_counter() < deadline:
+        for _ in range(burst_size):
+            data, files = report_form()
+            await timed_request(client, stats, "POST /reports", "POST", "/api/v1/reports/", data=data, files=files)
+        await asyncio.sleep(burst_pause * random.uniform(0.5, 1.5))
+
+
+async def direct_uploads(client, stats, deadline, burst_size, burst_pause, fake_s3):
+    # presigned POST 흐름: upload-url 발급 -> 스토리지에 직접 업로드 -> 메타데이터만 submit
+    storage = httpx.AsyncClient(timeout=30)
+    try:
+        while time.perf_counter() < deadline:
+            for _ in range(burst_size):
+                start = time.perf_counter()
+                try:
+                    r = await client.post("/api/v1/reports/upload-url", json={"content_type": "image/jpeg"})
+                    stats.record("POST /upload-url", time.perf_counter() - start, r.status_code)
+                    if r.status_code != 200:
+                        continue
+                    post = r.json()
+
+                    start = time.perf_counter()
+                    if post["url"].startswith(FAKE_S3_URL) and fake_s3 is not None:
+                        await asyncio.to_thread(fake_s3.receive_post, post["fields"], TINY_JPEG)
+                        status = 204
+                    else:
+                        up = await storage.post(post["url"], data=post["fields"], files={"file": ("hazard.jpg", TINY_JPEG, "image/jpeg")})
+                        status = up.status_code
+                    stats.record("(storage direct upload)", time.perf_counter() - start, status)
+                except Exception:
+                    stats.record("(storage direct upload)", time.perf_counter() - start, None)
+                    continue
+
+                data, _ = report_form()
+                body = {**data, "image_key": post["key"]}
+                await timed_request(client, stats, "POST /submit", "POST", "/api/v1/reports/submit", json=body)
+            await asyncio.sleep(burst_pause * random.uniform(0.5, 1.5))
+    finally:
+        await storage.aclose()
+
+
+async def map_polling(client, stats, deadline, interval):
+    while time.perf_counter() < deadline:
+        await timed_request(client, stats, "GET /reports/map", "GET", "/api/v1/reports/map")
+        lat, lng = random_point(500)
+        params = {"min_lat": lat - 0.01, "max_lat": lat + 0.01, "min_lng": lng - 0.012, "max_lng": lng + 0.012}
+        await timed_request(client, stats, "GET /reports/heatmap", "GET", "/api/v1/reports/heatmap", params=params)
+        await asyncio.sleep(interval)
+
+
+async def map_sync_polling(client, stats, deadline, interval):
+    # 증분 동기화: 처음엔 전체(next_cursor 로 페이지 이어 받기), 이후 since=version 으로 변경분만
+    version = None
+    while time.perf_counter() < deadline:
+        cursor = None
+        while True:
+            params = {"cursor": cursor} if cursor else ({"since": version} if version else {})
+            start = time.perf_counter()
+            try:
+                r = await client.get("/api/v1/reports/map/changes", params=params)
+                status = r.status_code
+            except Exception:
+                status = None
+            stats.record("GET /map/changes", time.perf_counter() - start, status)
+            if status != 200:
+                break
+            body = r.json()
+            cursor = body.get("next_cursor")
+            if not cursor:
+                version = body["version"]
+                break
+        await asyncio.sleep(interval)
+
+
+async def walking(client, stats, deadline, interval):
+    # 보행 중 주변 위험물 폴링 (한 방향으로 걸으며 1~2초 간격)
+    lat, lng = random_point(800)
+    heading = random.uniform(0, 360)
+    while time.perf_counter() < deadline:
+        params = {"lat": lat, "lng": lng, "heading": round(heading, 1), "radius": 100, "k": 5, "ahead": "true"}
+        await timed_request(client, stats, "GET /reports/nearby", "GET", "/api/v1/reports/nearby", params=params)
+        step = 1.3 * interval  # 약 1.3m/s
+        lat += step * math.cos(math.radians(heading)) / 111_000
+        lng += step * math.sin(math.radians(heading)) / 88_000
+        heading = (heading + random.gauss(0, 10)) % 360
+        await asyncio.sleep(interval * random.uniform(0.8, 1.2))
+
+
+async def admin_polling(client, stats, deadline, interval):
+    while time.perf_counter() < deadline:
+        skip = random.choice([0, 0, 0, 20, 40, 100])
+        await timed_request(client, stats, "GET /reports (admin)", "GET", "/api/v1/reports/",
+                            params={"skip": skip, "limit": 20})
+        await asyncio.sleep(interval)
+
+
+async def navigation(client, stats, deadline, interval):
+    while time.perf_counter() < deadline:
+        (slat, slng), (elat, elng) = random_point(800), random_point(800)
+        body = {"start_lat": slat, "start_lon": slng, "end_lat": elat, "end_lon": elng}
+        await timed_request(client, stats, "POST /navigation/path", "POST", "/api/v1/navigation/path/", json=body)
+        await asyncio.sleep(interval)
+
+
+async def safe_navigation(client, stats, deadline, interval):
+    while time.perf_counter() < deadline:
+        (slat, slng), (elat, elng) = random_point(800), random_point(800)
+        body = {"start_lat": slat, "start_lon": slng, "end_lat": elat, "end_lon": elng}
+        await timed_request(client, stats, "POST /navigation/safe", "POST", "/api/v1/navigation/safe-path/", json=body)
+        await asyncio.sleep(interval)
+
+
+# 4. 초기 데이터 (generate_reports 와 같은 분포, 시드 고정)
+def seed_reports(db, n: int, seed: int = 42):
+    db.seed("reports", generate_reports(n, seed=seed))
+
+
+def add_fault_args(parser):
+    for name, latency in (("s3", 80), ("db", 40), ("tmap", 150)):
+        parser.add_argument(f"--{name}-latency", type=float, default=latency, help=f"{name} 평균 지연(ms)")
+        parser.add_argument(f"--{name}-jitter", type=float, default=latency / 4, help=f"{name} 지연 편차(ms)")
+        parser.add_argument(f"--{name}-error-rate", type=float, default=0.0, help=f"{name} 실패 비율 (0~1)")
+    parser.add_argument("--seed-reports", type=int, default=2000, help="미리 넣어둘 신고 수")
+
+
+def install_from_args(args):
+    fakes = install_fakes(
+        s3_faults=FaultInjector(args.s3_latency, args.s3_jitter, args.s3_error_rate),
+        db_faults=FaultInjector(args.db_latency, args.db_jitter, args.db_error_rate),
+        tmap_faults=FaultInjector(args.tmap_latency, args.tmap_jitter, args.tmap_error_rate),
+    )
+    seed_reports(fakes.db, args.seed_reports)
+    return fakes
+
+
+async def wait_ready(client, timeout: float = 60):
+    # 주변 위험물 인덱스 적재 전에는 /nearby, /safe-path 가 503 이므로 준비될 때까지 기다림
+    until = time.perf_counter() + timeout
+    while time.perf_counter() < until:
+        try:
+            if (await client.get("/ready")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    print("⚠️ /ready 가 200이 되지 않은 채로 시작합니다")
+
+
+async def main(args):
+    fake_s3 = None
+    lifespan = contextlib.nullcontext()
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=30)
+    else:
+        fake_s3 = install_from_args(args).s3
+        from app.main import app
+        # ASGITransport 는 startup / shutdown 을 실행하지 않으므로 직접 실행 (워밍업, 인덱스 갱신 등)
+        lifespan = app.router.lifespan_context(app)
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        client = httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=30)
+
+    headers = {"User-Agent": "WalkMate-LoadTest"}
+    client.headers.update(headers)
+    async with lifespan, client:
+        await wait_ready(client)
+        await run_scenarios(client, args, fake_s3)
+
+
+async def run_scenarios(client, args, fake_s3):
+    stats = Stats()
+    start = time.perf_counter()
+    deadline = start + args.duration
+
+    tasks = []
+    tasks += [upload_bursts(client, stats, deadline, args.burst_size, args.burst_pause) for _ in range(args.upload_clients)]
+    tasks += [direct_uploads(client, stats, deadline, args.burst_size, args.burst_pause, fake_s3)
+              for _ in range(args.direct_upload_clients)]
+    tasks += [map_polling(client, stats, deadline, args.map_interval) for _ in range(args.map_clients)]
+    tasks += [admin_polling(client, stats, deadline, args.admin_interval) for _ in range(args.admin_clients)]
+    tasks += [map_sync_polling(client, stats, deadline, args.map_sync_interval) for _ in range(args.map_sync_clients)]
+    tasks += [walking(client, stats, deadline, args.walk_interval) for _ in range(args.walk_clients)]
+    tasks += [navigation(client, stats, deadline, args.nav_interval) for _ in range(args.nav_clients)]
+    tasks += [safe_navigation(client, stats, deadline, args.nav_interval) for _ in range(args.safe_nav_clients)]
+
+    await asyncio.gather(*tasks)
+
+    elapsed = time.perf_counter() - start
+    rows = stats.summary(elapsed)
+    print_table(rows, elapsed)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"elapsed_s": round(elapsed, 2), "config": vars(args), "results": rows}, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="WalkMate 백엔드 부하 테스트 (외부 서비스 로컬 대역 사용)")
+    parser.add_argument("--base-url", default=None, help="지정 시 해당 서버로 요청 (미지정 시 앱을 프로세스 내에서 실행)")
+    parser.add_argument("--duration", type=float, default=20.0, help="테스트 시간(초)")
+    parser.add_argument("--upload-clients", type=int, default=8)
+    parser.add_argument("--burst-size", type=int, default=5)
+    parser.add_argument("--burst-pause", type=float, default=1.0)
+    parser.add_argument("--direct-upload-clients", type=int, default=0,
+                        help="presigned POST 직접 업로드 흐름 클라이언트 수 (--upload-clients 와 비교용)")
+    parser.add_argument("--map-clients", type=int, default=4)
+    parser.add_argument("--map-interval", type=float, default=1.0)
+    parser.add_argument("--map-sync-clients", type=int, default=2, help="/map/changes 증분 동기화 클라이언트 수")
+    parser.add_argument("--map-sync-interval", type=float, default=2.0)
+    parser.add_argument("--walk-clients", type=int, default=8, help="보행 중 /nearby 폴링 클라이언트 수")
+    parser.add_argument("--walk-interval", type=float, default=1.5)
+    parser.add_argument("--admin-clients", type=int, default=1)
+    parser.add_argument("--admin-interval", type=float, default=2.0)
+    parser.add_argument("--nav-clients", type=int, default=2)
+    parser.add_argument("--safe-nav-clients", type=int, default=1, help="/safe-path 안전 경로 클라이언트 수")
+    parser.add_argument("--nav-interval", type=float, default=2.0)
+    parser.add_argument("--json", default=None, help="결과를 JSON 파일로 저장 (릴리즈 간 비교용)")
+    add_fault_args(parser)
+    asyncio.run(main(parser.parse_args()))
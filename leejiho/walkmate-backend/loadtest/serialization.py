@@ -0,0 +1,106 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from typing import List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core.responses import FastJSONResponse
+from app.models.schemas import HeatmapResponse
+
+# 응답 직렬화 비용 측정 (마커 N건짜리 응답 1개 기준)
+#
+#   before : (/heatmap 은 response_model 검증 ->) jsonable_encoder -> 표준 json  (FastAPI 기본 경로)
+#   default: jsonable_encoder -> orjson                             (기본 응답 클래스만 교체)
+#   bypass : FastJSONResponse(rows) 직접 반환                        (검증 / 인코더 생략)
+#
+# 예) python -m loadtest.serialization --markers 10000 --repeat 20
+
+CENTER = (37.2887309, 127.047446)
+HAZARDS = ["킥보드", "자전거", "볼라드", "공사장", "불법 주정차", "쓰레기"]
+
+
+def make_markers(n: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "item_id": f"{rng.getrandbits(128):032x}",
+            "latitude": CENTER[0] + rng.uniform(-0.05, 0.05),
+            "longitude": CENTER[1] + rng.uniform(-0.05, 0.05),
+            "hazard_type": rng.choice(HAZARDS),
+            "distance": round(rng.uniform(1, 30), 2),
+            "direction": rng.choice("LCR"),
+            "risk_level": rng.randint(1, 5),
+            "status": rng.choice(["new", "processing"]),
+        }
+        for _ in range(n)
+    ]
+
+
+def make_heatmap(markers: list[dict]) -> list[dict]:
+    return [
+        {"lat": m["latitude"], "lng": m["longitude"], "distance": m["distance"], "direction": m["direction"]}
+        for m in markers
+    ]
+
+
+def validated_path(model):
+    adapter = TypeAdapter(List[model])
+
+    def render(rows):
+        content = adapter.dump_python(adapter.validate_python(rows), mode="json")
+        return JSONResponse(jsonable_encoder(content)).body
+    return render
+
+
+def stdlib_path(rows):
+    return JSONResponse(jsonable_encoder(rows)).body
+
+
+def default_path(rows):
+    return FastJSONResponse(jsonable_encoder(rows)).body
+
+
+def bypass_path(rows):
+    return FastJSONResponse(rows).body
+
+
+def bench(fn, rows, repeat: int) -> tuple[float, float, int]:
+    fn(rows)  # 예열
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn(rows)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), min(times), len(body)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="마커 응답 직렬화 비용 비교 (표준 json vs orjson)")
+    parser.add_argument("--markers", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    markers = make_markers(args.markers)
+    heatmap = make_heatmap(markers)
+    cases = [
+        ("/map      before", stdlib_path, markers),
+        ("/map      default", default_path, markers),
+        ("/map      bypass", bypass_path, markers),
+        ("/heatmap  before", validated_path(HeatmapResponse), heatmap),
+        ("/heatmap  default", default_path, heatmap),
+        ("/heatmap  bypass", bypass_path, heatmap),
+    ]
+
+    print(f"{args.markers} rows per response, {args.repeat} runs")
+    print(f"{'':20}{'median(ms)':>12}{'min(ms)':>10}{'bytes':>10}")
+    for name, fn, rows in cases:
+        median, best, size = bench(fn, rows, args.repeat)
+        print(f"{name:20}{median:>12.2f}{best:>10.2f}{size:>10}")
@@ -0,0 +1,28 @@
+import argparse
+import os
+import sys
+
+import uvicorn
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loadtest.run import add_fault_args, install_from_args
+
+# 외부 서비스 대역을 설치한 상태로 실제 uvicorn 서버를 띄웁니다.
+# (별도 프로세스/장비에서 loadtest.run --base-url 로 부하를 줄 때 사용)
+#
+# 예) python -m loadtest.serve --port 8000 --s3-latency 120   (대역이 프로세스 메모리에 있으므로 워커는 항상 1개)
+#     python -m loadtest.run --base-url http://127.0.0.1:8000 --duration 60
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 대역(S3/Supabase/TMAP)을 사용하는 WalkMate 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    add_fault_args(parser)
+    args = parser.parse_args()
+
+    install_from_args(args)
+    from app.main import app
+
+    # 대역은 이 프로세스 메모리에 있으므로 워커는 1개로 고정
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
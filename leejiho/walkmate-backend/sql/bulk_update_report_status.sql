@@ -0,0 +1,25 @@
+-- 조건(bbox / 위험물 종류 / 기간)에 맞는 신고의 상태를 한 번에 변경 (관리자 일괄 처리용)
+-- crud.report.bulk_update_report_status() 가 item_id 목록 없이 필터로 호출할 때 사용합니다.
+-- Supabase SQL Editor 에서 실행해 함수를 등록하세요.
+
+create or replace function public.bulk_update_report_status(
+    new_status       text,
+    min_lon          double precision default null,
+    min_lat          double precision default null,
+    max_lon          double precision default null,
+    max_lat          double precision default null,
+    filter_hazard    text             default null,
+    created_before   timestamptz      default null
+)
+returns table (item_id text)
+language sql
+as $$
+    update public.reports r
+    set status = new_status
+    where (min_lon is null
+           or r.location::geometry && ST_MakeEnvelope(min_lon, min_lat, max_lon, max_lat, 4326))
+      and (filter_hazard is null or r.hazard_type = filter_hazard)
+      and (created_before is null or r.created_at < created_before)
+      and r.status is distinct from new_status
+    returning r.item_id::text;
+$$;
@@ -0,0 +1,56 @@
+-- 지도 마커 증분 동기화(GET /api/v1/reports/map/changes)용 변경 버전
+-- Supabase SQL Editor 에서 한 번 실행하세요. (sql/report_hotspots.sql 의 updated_at 이 먼저 있어야 합니다)
+--
+-- 신고가 INSERT / UPDATE 될 때마다 전역 시퀀스에서 새 change_version 을 받습니다.
+-- 삭제된 신고는 report_tombstones 에 같은 시퀀스 번호로 남겨 클라이언트가 지울 수 있게 합니다.
+
+create sequence if not exists public.reports_change_version_seq;
+
+alter table public.reports
+    add column if not exists change_version bigint;
+
+create or replace function public.bump_reports_change_version()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.change_version := nextval('public.reports_change_version_seq');
+    return new;
+end;
+$$;
+
+drop trigger if exists reports_bump_change_version on public.reports;
+create trigger reports_bump_change_version
+    before insert or update on public.reports
+    for each row execute function public.bump_reports_change_version();
+
+-- 기존 행 채우기 (트리거가 번호를 매김)
+update public.reports set change_version = null where change_version is null;
+
+create index if not exists reports_change_version_idx on public.reports (change_version);
+
+
+-- 삭제 기록
+create table if not exists public.report_tombstones (
+    item_id        text not null,
+    change_version bigint not null,
+    deleted_at     timestamptz not null default now()
+);
+
+create index if not exists report_tombstones_change_version_idx on public.report_tombstones (change_version);
+
+create or replace function public.record_report_tombstone()
+returns trigger
+language plpgsql
+as $$
+begin
+    insert into public.report_tombstones (item_id, change_version)
+    values (old.item_id::text, nextval('public.reports_change_version_seq'));
+    return old;
+end;
+$$;
+
+drop trigger if exists reports_record_tombstone on public.reports;
+create trigger reports_record_tombstone
+    after delete on public.reports
+    for each row execute function public.record_report_tombstone();
@@ -0,0 +1,159 @@
+-- 위험물 밀집 구역(hotspot) 테이블과 집계 작업(app/services/hotspots.py)이 쓰는 함수
+-- Supabase SQL Editor 에서 한 번 실행하세요. (여러 번 실행해도 안전)
+--
+-- 작업은 위경도 격자(tile) 단위로 돌며, 지난 실행 이후 바뀐 신고가 있는 tile만 다시 계산합니다.
+-- "바뀐 신고"는 reports.updated_at 으로 찾습니다 (INSERT 기본값 + UPDATE 트리거).
+
+-- 1. reports.updated_at (상태 변경도 잡기 위해)
+alter table public.reports
+    add column if not exists updated_at timestamptz not null default now();
+
+create or replace function public.touch_reports_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_at := now();
+    return new;
+end;
+$$;
+
+drop trigger if exists reports_touch_updated_at on public.reports;
+create trigger reports_touch_updated_at
+    before update on public.reports
+    for each row execute function public.touch_reports_updated_at();
+
+create index if not exists reports_updated_at_idx on public.reports (updated_at);
+
+-- hotspot_points 의 location::geometry && envelope 조건용 (없으면 tile마다 전체 스캔)
+create index if not exists reports_location_geom_gist on public.reports using gist ((location::geometry));
+
+
+-- 2. 결과 테이블
+create table if not exists public.report_hotspots (
+    hotspot_id       text primary key,              -- '{tile}:{n}'
+    tile             text not null,                 -- '{ty}_{tx}' (중심점이 속한 tile)
+    report_count     integer not null,
+    dominant_hazard  text,
+    hazard_counts    jsonb not null default '{}'::jsonb,
+    risk_score       double precision not null,     -- 계산 시점의 위험 점수 (참고용)
+    risk_log2        double precision,              -- log2(sum(risk_level x 2^((created_at - 2026-01-01) / 반감기))), 조회 시 감쇠
+    center_lat       double precision not null,
+    center_lng       double precision not null,
+    polygon          jsonb not null,                -- GeoJSON Polygon (볼록 껍질)
+    first_reported_at timestamptz,
+    last_reported_at  timestamptz,
+    computed_at      timestamptz not null default now()
+);
+
+-- 이전 버전에서 만든 테이블: risk_log2 추가 후 기존 risk_score(computed_at 기준)에서 환산
+-- (반감기 14일 = HOTSPOT_HALF_LIFE_DAYS 기본값 기준, 값을 바꿨다면 python -m app.services.hotspots --full)
+alter table public.report_hotspots add column if not exists risk_log2 double precision;
+update public.report_hotspots
+   set risk_log2 = log(2, greatest(risk_score, 1e-9)::numeric)
+                 + extract(epoch from computed_at - timestamptz '2026-01-01 00:00:00+00') / 86400 / 14
+ where risk_log2 is null;
+
+create index if not exists report_hotspots_tile_idx on public.report_hotspots (tile);
+create index if not exists report_hotspots_risk_idx on public.report_hotspots (risk_log2 desc);
+create index if not exists report_hotspots_center_idx on public.report_hotspots (center_lat, center_lng);
+
+create table if not exists public.report_hotspot_runs (
+    id          integer primary key default 1 check (id = 1),  -- 한 행만 유지
+    watermark   timestamptz,                                    -- 마지막으로 반영한 reports.updated_at
+    tiles       integer,
+    hotspots    integer,
+    finished_at timestamptz
+);
+
+
+-- 3. since 이후 바뀐 신고가 영향을 주는 tile 목록
+-- 신고 주변 halo_deg 사각형이 걸치는 tile을 모두 포함 (경계 근처 군집이 이웃 tile 소속일 수 있으므로)
+create or replace function public.hotspot_dirty_tiles(
+    since     timestamptz,
+    tile_deg  double precision,
+    halo_deg  double precision
+)
+returns jsonb
+language sql
+stable
+as $$
+    with touched as (
+        select ST_Y(location::geometry) as lat, ST_X(location::geometry) as lng, updated_at
+        from public.reports
+        where location is not null and (since is null or updated_at > since)
+    )
+    select jsonb_build_object(
+        'watermark', (select max(updated_at) from touched),
+        'tiles', coalesce((
+            select jsonb_agg(jsonb_build_array(ty, tx))
+            from (
+                select distinct floor((t.lat + o.dy) / tile_deg)::int as ty,
+                                floor((t.lng + o.dx) / tile_deg)::int as tx
+                from touched t
+                cross join (values (-halo_deg, -halo_deg), (-halo_deg, halo_deg),
+                                   (halo_deg, -halo_deg), (halo_deg, halo_deg)) as o(dy, dx)
+            ) tiles
+        ), '[]'::jsonb)
+    );
+$$;
+
+
+-- 4. 범위 안의 활성(new / processing) 신고 좌표 (item_id 순 페이지, PostgREST max-rows 에 잘리지 않도록)
+drop function if exists public.hotspot_points(double precision, double precision, double precision, double precision);
+
+create or replace function public.hotspot_points(
+    min_lat   double precision,
+    min_lng   double precision,
+    max_lat   double precision,
+    max_lng   double precision,
+    after_id  text default null,
+    page_size integer default 1000
+)
+returns table (
+    item_id     text,
+    latitude    double precision,
+    longitude   double precision,
+    hazard_type text,
+    risk_level  integer,
+    created_at  timestamptz
+)
+language sql
+stable
+as $$
+    select r.item_id::text, ST_Y(r.location::geometry), ST_X(r.location::geometry),
+           r.hazard_type, r.risk_level, r.created_at
+    from public.reports r
+    where r.location::geometry && ST_MakeEnvelope(min_lng, min_lat, max_lng, max_lat, 4326)
+      and r.status not in ('done', 'hidden')
+      and (after_id is null or r.item_id::text > after_id)
+    order by r.item_id::text
+    limit page_size;
+$$;
+
+
+-- 5. tile 단위 교체 (삭제 + 삽입을 한 트랜잭션으로)
+create or replace function public.replace_hotspots(tiles text[], hotspots jsonb)
+returns integer
+language plpgsql
+as $$
+declare
+    inserted integer;
+begin
+    delete from public.report_hotspots h where h.tile = any(tiles);
+
+    insert into public.report_hotspots (
+        hotspot_id, tile, report_count, dominant_hazard, hazard_counts, risk_score, risk_log2,
+        center_lat, center_lng, polygon, first_reported_at, last_reported_at
+    )
+    select hotspot_id, tile, report_count, dominant_hazard, hazard_counts, risk_score, risk_log2,
+           center_lat, center_lng, polygon, first_reported_at, last_reported_at
+    from jsonb_to_recordset(hotspots) as x(
+        hotspot_id text, tile text, report_count integer, dominant_hazard text, hazard_counts jsonb,
+        risk_score double precision, risk_log2 double precision, center_lat double precision, center_lng double precision,
+        polygon jsonb, first_reported_at timestamptz, last_reported_at timestamptz
+    );
+    get diagnostics inserted = row_count;
+    return inserted;
+end;
+$$;
@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loadtest.fakes import install_fakes, prepare_env
+
+# app.core.* 가 import 시점에 환경변수를 검사하므로 테스트 모듈 import 전에 채워둠
+prepare_env()
+
+
+@pytest.fixture
+def fakes():
+    """S3 / Supabase / TMAP 대역을 앱에 설치 (테스트마다 빈 상태)"""
+    return install_fakes()
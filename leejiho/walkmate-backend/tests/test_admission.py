@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.services import admission
+from app.services.admission import IngestAdmission, IngestGate, TokenBucketLimiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(admission.time, "monotonic", clock)
+    return clock
+
+
+def test_token_bucket_burst_then_refill(clock):
+    limiter = TokenBucketLimiter(rate=2.0, burst=3, idle_ttl=600)
+    assert [limiter.acquire("a") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire("a") == pytest.approx(0.5)  # 토큰 1개가 차는 데 1 / rate 초
+    assert limiter.acquire("b") == 0.0  # 기기별로 따로
+
+    clock.now += 0.5
+    assert limiter.acquire("a") == 0.0
+
+
+def test_token_bucket_sweeps_idle_devices(clock):
+    limiter = TokenBucketLimiter(rate=1.0, burst=1, idle_ttl=120)
+    limiter.acquire("old")
+    clock.now += admission.BUCKET_SWEEP_INTERVAL
+    limiter.acquire("new")
+    assert len(limiter) == 2
+
+    clock.now += 120
+    limiter.acquire("new")
+    assert len(limiter) == 1
+
+
+def test_gate_shrinks_limit_when_over_budget():
+    gate = IngestGate(max_concurrency=8, latency_budget=1.0)
+    assert all(gate.try_enter() for _ in range(8))
+    assert not gate.try_enter()
+    for _ in range(8):
+        gate.leave(None)
+
+    gate.latency_ewma = 2.0
+    assert gate.over_budget and gate.limit() == 2
+    assert gate.try_enter() and gate.try_enter()
+    assert not gate.try_enter()
+
+
+def _request(device: str | None = None) -> Request:
+    headers = [(b"x-device-id", device.encode())] if device else []
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": headers})
+
+
+@pytest.fixture
+def ingest():
+    ingest = IngestAdmission()
+    ingest.limiter = TokenBucketLimiter(rate=1000, burst=1000, idle_ttl=600)
+    ingest.gate = IngestGate(max_concurrency=4, latency_budget=0)
+    return ingest
+
+
+async def _admit(ingest, *, work: bool, error: BaseException | None = None):
+    try:
+        async with ingest.admit(_request(), "user") as ticket:
+            if work:
+                ticket.mark_work()
+            await asyncio.sleep(0.01)
+            if error is not None:
+                raise error
+    except BaseException as e:
+        if e is not error:
+            raise
+
+
+@pytest.mark.parametrize("work, error, recorded", [
+    (True, None, True),                                    # 실제 처리
+    (False, None, False),                                  # 멱등 재전송 (캐시 응답)
+    (True, HTTPException(status_code=400), False),         # 빠른 4xx
+    (False, HTTPException(status_code=503), True),         # 5xx
+    (True, RuntimeError("S3 timeout"), True),              # 하류 예외
+])
+def test_admit_records_latency(ingest, work, error, recorded):
+    asyncio.run(_admit(ingest, work=work, error=error))
+    assert (ingest.gate.latency_ewma > 0) is recorded
+    assert ingest.gate.in_flight == 0
+
+
+def test_admit_rejects_device_over_rate(ingest):
+    ingest.limiter = TokenBucketLimiter(rate=0.1, burst=1, idle_ttl=600)
+
+    async def run():
+        async with ingest.admit(_request("dev-1"), "user"):
+            pass
+        async with ingest.admit(_request("dev-1"), "user"):
+            pass
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(run())
+    assert exc.value.status_code == 429
+    assert int(exc.value.headers["Retry-After"]) >= 1
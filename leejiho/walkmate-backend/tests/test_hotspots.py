@@ -0,0 +1,36 @@
+import random
+
+from app.services.hotspots import dbscan
+
+
+def _blob(cx: float, cy: float, n: int, spread: float, rng: random.Random):
+    return [(cx + rng.uniform(-spread, spread), cy + rng.uniform(-spread, spread)) for _ in range(n)]
+
+
+def test_dbscan_separates_dense_groups_from_noise():
+    rng = random.Random(7)
+    xy = _blob(0, 0, 12, 5, rng) + _blob(500, 500, 8, 5, rng) + [(250, -300), (-400, 400)]
+    labels = dbscan(xy, eps=20, min_samples=4)
+
+    assert len(set(labels[:12])) == 1 and labels[0] != -1
+    assert len(set(labels[12:20])) == 1 and labels[12] not in (-1, labels[0])
+    assert labels[20:] == [-1, -1]
+
+
+def test_dbscan_chains_through_neighbouring_grid_cells():
+    # eps 간격으로 이어진 점들은 격자 칸 경계를 넘어도 한 군집
+    xy = [(i * 15.0, 0.0) for i in range(10)]
+    labels = dbscan(xy, eps=20, min_samples=2)
+    assert set(labels) == {0}
+
+
+def test_dbscan_border_point_joins_cluster():
+    core = [(0, 0), (1, 0), (0, 1), (1, 1)]
+    border = [(0, 18)]  # 핵심점 (0, 1) 과만 eps 안 -> 자기는 핵심점이 아니어도 군집에 포함
+    labels = dbscan(border + core, eps=18, min_samples=4)
+    assert labels == [0, 0, 0, 0, 0]
+
+
+def test_dbscan_min_samples_counts_the_point_itself():
+    labels = dbscan([(0, 0), (5, 0), (100, 100)], eps=10, min_samples=2)
+    assert labels == [0, 0, -1]
@@ -0,0 +1,39 @@
+import base64
+import json
+
+import pytest
+
+from app.services import image_catalog
+
+ITEM_ID = "0f8fad5b-d9cb-469f-a165-70867728950e"
+
+
+def _raw_cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode("utf-8")).decode("ascii")
+
+
+def test_cursor_round_trip():
+    row = {"created_at": "2026-03-01T10:00:00.123456+00:00", "item_id": ITEM_ID}
+    assert image_catalog.decode_cursor(image_catalog.encode_cursor(row)) == (row["created_at"], ITEM_ID)
+
+
+def test_cursor_accepts_z_suffix_and_undashed_uuid():
+    cursor = _raw_cursor(["2026-03-01T10:00:00Z", ITEM_ID.replace("-", "")])
+    assert image_catalog.decode_cursor(cursor)[1] == ITEM_ID.replace("-", "")
+
+
+@pytest.mark.parametrize("value", [
+    ["2026-03-01T10:00:00Z", "abc,item_id.gt.0"],          # or_ 필터 주입
+    ["2026-03-01T10:00:00Z", f"urn:uuid:{ITEM_ID}"],
+    ['2026-03-01",status.eq."x', ITEM_ID],                  # 시각 자리 주입
+    [1700000000, ITEM_ID],
+    ["2026-03-01T10:00:00Z"],
+])
+def test_cursor_rejects_malformed_values(value):
+    with pytest.raises((ValueError, TypeError)):
+        image_catalog.decode_cursor(_raw_cursor(value))
+
+
+def test_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        image_catalog.decode_cursor("not a cursor")
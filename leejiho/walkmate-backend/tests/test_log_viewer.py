@@ -0,0 +1,63 @@
+from datetime import datetime
+
+import pytest
+
+from app.services import log_viewer
+from app.services.log_viewer import LogFilter
+
+ROTATED = [
+    "2026-03-02 09:00:00,000 - INFO - ➡️ [요청 시작] GET /api/v1/reports/map | Device: app | ID: aaa111",
+    "2026-03-02 09:00:00,050 - INFO - ⬅️ [요청 완료] GET /api/v1/reports/map 200 | 소요시간: 50ms | ID: aaa111",
+    "2026-03-02 23:59:59,000 - ERROR - ❌ DB Insert Error: boom",
+    "Traceback (most recent call last):",
+    '  File "app/crud/report.py", line 1, in create_report',
+    "RuntimeError: boom",
+]
+CURRENT = [
+    "2026-03-03 10:00:00,000 - INFO - ➡️ [요청 시작] GET /api/v1/reports/map/changes | Device: app | ID: bbb222",
+    "2026-03-03 10:00:00,020 - INFO - ⬅️ [요청 완료] GET /api/v1/reports/map/changes 200 | 소요시간: 20ms | ID: bbb222",
+    "2026-03-03 10:00:01,000 - WARNING - ⚠️ Slow request GET /api/v1/reports/map",
+]
+
+
+@pytest.fixture
+def logs(tmp_path, monkeypatch):
+    log_file = tmp_path / "app.log"
+    log_file.write_text("\n".join(CURRENT) + "\n", encoding="utf-8")
+    (tmp_path / "app.log.2026-03-02").write_text("\n".join(ROTATED) + "\n", encoding="utf-8")
+    monkeypatch.setattr(log_viewer, "LOG_FILE", str(log_file))
+    # 블록 경계에서 줄이 잘리는 경우도 지나가도록 작게
+    monkeypatch.setattr(log_viewer, "BLOCK_SIZE", 64)
+    return tmp_path
+
+
+def test_tail_reads_back_across_rotated_files(logs):
+    records = log_viewer.tail(4)
+    assert records[0] == "\n".join(ROTATED[2:])  # Traceback 은 헤더 줄과 한 레코드
+    assert records[1:] == CURRENT
+
+
+def test_tail_zero_returns_nothing(logs):
+    assert log_viewer.tail(0) == []
+    assert list(log_viewer.search(LogFilter(), limit=0)) == []
+
+
+def test_route_filter_matches_exact_path_token(logs):
+    records = log_viewer.tail(10, LogFilter(route="/api/v1/reports/map"))
+    assert records == ROTATED[:2] + CURRENT[2:]
+
+
+def test_request_id_and_level_filters(logs):
+    assert log_viewer.tail(10, LogFilter(request_id="bbb222")) == CURRENT[:2]
+    assert log_viewer.tail(10, LogFilter(level="warning")) == ["\n".join(ROTATED[2:]), CURRENT[2]]
+
+
+def test_since_skips_older_rotated_files(logs):
+    since = datetime(2026, 3, 3, 10, 0, 1)  # 로그 시각은 초 단위로 비교
+    assert log_viewer.log_files_newest_first(since) == [log_viewer.LOG_FILE]
+    assert log_viewer.tail(10, LogFilter(since=since)) == CURRENT[2:]
+
+
+def test_search_streams_oldest_first_with_limit(logs):
+    records = list(log_viewer.search(LogFilter(q="GET"), limit=3))
+    assert records == ROTATED[:2] + CURRENT[:1]
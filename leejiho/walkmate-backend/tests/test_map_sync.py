@@ -0,0 +1,96 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.crud import report as crud_report
+from app.services import map_sync
+
+
+def _iso(seconds_ago: float) -> str:
+    return (datetime.now(timezone.utc) - timedelta(seconds=seconds_ago)).isoformat()
+
+
+def _report(i: int, status: str = "new") -> dict:
+    return {
+        "item_id": str(uuid.UUID(int=i)),
+        "location": f"POINT(127.0{i % 10} 37.5{i % 10})",
+        "hazard_type": "pothole",
+        "distance": 3.0,
+        "direction": "front",
+        "risk_level": 2,
+        "status": status,
+        "created_at": _iso(1000 - i),
+    }
+
+
+@pytest.fixture
+def map_db(fakes, monkeypatch):
+    # 버전 기준점은 단순하게 고정 (get_recent_change_versions 는 fakes 가 아니라 여기서 대체)
+    monkeypatch.setattr(crud_report, "get_recent_change_versions",
+                        lambda limit=100: [{"change_version": 40, "updated_at": _iso(60)}])
+    return fakes.db
+
+
+def test_settled_version_stops_before_unsettled_change():
+    entries = [(11, _iso(60)), (12, _iso(30)), (13, _iso(0)), (14, _iso(60))]
+    assert map_sync.settled_version(entries, 10) == 12
+    assert map_sync.settled_version([], 10) == 10
+
+
+def test_full_sync_pages_with_cursor(map_db, monkeypatch):
+    monkeypatch.setattr(map_sync, "MAP_FULL_PAGE_SIZE", 3)
+    map_db.seed("reports", [_report(i) for i in range(7)] + [_report(100, "done"), _report(101, "hidden")])
+
+    pages = [map_sync.changes_since(None)]
+    while pages[-1]["next_cursor"]:
+        pages.append(map_sync.changes_since(None, pages[-1]["next_cursor"]))
+
+    assert [len(p["markers"]) for p in pages] == [3, 3, 1]
+    assert {p["version"] for p in pages} == {40}
+    item_ids = [m["item_id"] for p in pages for m in p["markers"]]
+    assert item_ids == [str(uuid.UUID(int=i)) for i in range(7)]
+    assert set(pages[0]["markers"][0]) == set(map_sync.MARKER_FIELDS)
+
+
+def test_delta_overflow_falls_back_to_first_full_page(map_db, monkeypatch):
+    monkeypatch.setattr(map_sync, "MAP_DELTA_MAX_CHANGES", 2)
+    monkeypatch.setattr(map_sync, "MAP_FULL_PAGE_SIZE", 2)
+    map_db.seed("reports", [_report(i) for i in range(5)])
+
+    requested = []
+
+    def get_map_changes(since, limit):
+        requested.append(limit)
+        rows = [{**_report(i), "change_version": 50 + i, "updated_at": _iso(60)} for i in range(limit)]
+        return rows, []
+
+    monkeypatch.setattr(crud_report, "get_map_changes", get_map_changes)
+
+    result = map_sync.changes_since(45)
+    assert requested == [3]
+    assert result["mode"] == "full"
+    assert len(result["markers"]) == 2
+    assert result["next_cursor"] is not None
+
+
+def test_delta_keeps_last_state_and_settles_version(monkeypatch):
+    rows = [
+        {**_report(1), "change_version": 51, "updated_at": _iso(60)},
+        {**_report(2, "done"), "change_version": 52, "updated_at": _iso(60)},
+        {**_report(3), "change_version": 54, "updated_at": _iso(0)},
+    ]
+    tombstones = [{"item_id": str(uuid.UUID(int=4)), "change_version": 53, "updated_at": _iso(60)}]
+    monkeypatch.setattr(crud_report, "get_map_changes", lambda since, limit: (rows, tombstones))
+
+    result = map_sync.changes_since(50)
+    assert result["mode"] == "delta"
+    assert [m["item_id"] for m in result["upserts"]] == [str(uuid.UUID(int=1)), str(uuid.UUID(int=3))]
+    assert set(result["removed"]) == {str(uuid.UUID(int=2)), str(uuid.UUID(int=4))}
+    assert result["version"] == 53  # 54 는 아직 settle 전
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "W10", map_sync.encode_cursor(1, {"created_at": "x", "item_id": "y"})])
+def test_invalid_cursor_rejected(cursor):
+    with pytest.raises((ValueError, TypeError)):
+        map_sync.decode_cursor(cursor)
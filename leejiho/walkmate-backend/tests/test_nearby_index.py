@@ -0,0 +1,63 @@
+import pytest
+
+from app.services.nearby_index import METERS_PER_DEG_LAT, NearbyIndex
+
+LAT, LNG = 37.2887, 127.0474
+
+
+def _row(item_id: str, north_m: float = 0.0, east_m: float = 0.0, status: str = "new", hazard: str = "킥보드"):
+    lat = LAT + north_m / METERS_PER_DEG_LAT
+    lng = LNG + east_m / 88_460.0  # 위도 37.29도에서 경도 1도 ~ 88.46km
+    return {
+        "item_id": item_id, "latitude": lat, "longitude": lng, "hazard_type": hazard,
+        "risk_level": 2, "status": status, "created_at": "2026-03-01T10:00:00+00:00",
+    }
+
+
+@pytest.fixture
+def index():
+    index = NearbyIndex()
+    index.load([
+        _row("north-30", north_m=30),
+        _row("east-60", east_m=60),
+        _row("south-20", north_m=-20),
+        _row("west-90", east_m=-90),
+        _row("far-500", north_m=500),
+        _row("done-10", north_m=10, status="done"),
+    ])
+    return index
+
+
+def test_query_returns_nearest_k_within_radius(index):
+    results = index.query(LAT, LNG, None, radius_m=100, k=3)
+    assert [r["item_id"] for r in results] == ["south-20", "north-30", "east-60"]
+    assert [r["distance"] for r in results] == pytest.approx([20, 30, 60], abs=1)
+    assert "side" not in results[0]
+
+
+def test_query_skips_inactive_and_out_of_radius(index):
+    ids = {r["item_id"] for r in index.query(LAT, LNG, None, radius_m=100, k=50)}
+    assert ids == {"north-30", "east-60", "south-20", "west-90"}
+
+
+def test_query_side_and_ahead_filter(index):
+    # 북쪽으로 걷는 중: 뒤쪽(south-20)은 빠지고 바로 옆(±90도)까지는 포함
+    results = index.query(LAT, LNG, heading=0.0, radius_m=100, k=5, ahead_only=True)
+    assert [r["item_id"] for r in results] == ["north-30", "east-60", "west-90"]
+    assert results[0]["side"] == "C"
+
+    assert [r["item_id"] for r in index.query(LAT, LNG, heading=0.0, radius_m=100, k=1, ahead_only=True)] == ["north-30"]
+
+    sides = {r["item_id"]: r["side"] for r in index.query(LAT, LNG, heading=0.0, radius_m=100, k=5)}
+    assert sides["east-60"] == "R" and sides["west-90"] == "L"
+
+
+def test_on_change_adds_and_removes(index):
+    index.on_change("created", ["new-5"], rows=[{
+        "item_id": "new-5", "location": f"POINT({LNG} {LAT + 5 / METERS_PER_DEG_LAT})",
+        "hazard_type": "볼라드", "risk_level": 3,
+    }])
+    assert index.query(LAT, LNG, None, radius_m=100, k=1)[0]["item_id"] == "new-5"
+
+    index.on_change("status", ["new-5", "south-20"], status="hidden")
+    assert index.query(LAT, LNG, None, radius_m=100, k=1)[0]["item_id"] == "north-30"
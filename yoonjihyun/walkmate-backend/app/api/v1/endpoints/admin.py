@@ -1,20 +1,59 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 from uuid import UUID
+from datetime import datetime
 
 from app.core.database import get_db
-from app.crud.report import count_reports, list_reports_admin, patch_status, delete_report
+from app.crud.report import (
+    count_reports, list_reports_admin, patch_status, delete_report, bulk_patch_status, bulk_delete_reports,
+)
 
 router = APIRouter(prefix="/reports", tags=["admin"])
 
+
+class BulkFilter(BaseModel):
+    min_lat: float | None = None
+    min_lng: float | None = None
+    max_lat: float | None = None
+    max_lng: float | None = None
+    hazard_type: str | None = None
+    older_than: datetime | None = None  # 이 시각 이전에 생성된 신고만
+
+
+class BulkRequest(BaseModel):
+    item_ids: list[UUID] | None = Field(None, max_length=1000)
+    filter: BulkFilter | None = None
+
+
+def _bulk_filters(body: BulkRequest) -> dict:
+    """item_ids 또는 filter 중 하나만 허용 (조건 없이 전체 테이블이 바뀌는 것 방지)"""
+    if bool(body.item_ids) == bool(body.filter):
+        raise HTTPException(status_code=400, detail="provide either item_ids or filter")
+
+    f = body.filter or BulkFilter()
+    bbox = (f.min_lat, f.min_lng, f.max_lat, f.max_lng)
+    if any(v is not None for v in bbox) and any(v is None for v in bbox):
+        raise HTTPException(status_code=400, detail="min_lat, min_lng, max_lat, max_lng must be given together")
+    if body.filter and bbox[0] is None and not f.hazard_type and not f.older_than:
+        raise HTTPException(status_code=400, detail="filter must have at least one condition")
+
+    return {
+        "item_ids": body.item_ids,
+        "bbox": bbox if bbox[0] is not None else None,
+        "hazard_type": f.hazard_type,
+        "older_than": f.older_than,
+    }
+
 @router.get("/", summary="📋 관리자 전체 목록 조회 (Admin)")
 def get_reports_admin(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=200),
+    include_archived: bool = Query(False, description="보관(archive)된 오래된 처리완료 신고까지 포함"),
     db: Session = Depends(get_db),
 ):
-    total = count_reports(db)
-    data = list_reports_admin(db, skip=skip, limit=limit)
+    total = count_reports(db, include_archived=include_archived)
+    data = list_reports_admin(db, skip=skip, limit=limit, include_archived=include_archived)
     return {"total": total, "data": data}
 
 
@@ -50,3 +89,25 @@ def soft_delete_report(
     except Exception as e:
         print(f"❌ Delete Failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to delete report: {str(e)}")
+
+
+@router.post("/bulk/status", summary="✅ 처리 상태 일괄 변경 (Admin)")
+def bulk_patch_report_status(
+    body: BulkRequest,
+    status: str = Query(..., description="new|processing|done"),
+    db: Session = Depends(get_db),
+):
+    if status not in ("new", "processing", "done"):
+        raise HTTPException(status_code=400, detail="status must be one of new, processing, done")
+
+    item_ids = bulk_patch_status(db, status=status, **_bulk_filters(body))
+    return {"success": True, "count": len(item_ids), "item_ids": item_ids}
+
+
+@router.post("/bulk/delete", summary="🗑️ 일괄 삭제 (Admin - 숨김 처리)")
+def bulk_soft_delete_reports(
+    body: BulkRequest,
+    db: Session = Depends(get_db),
+):
+    item_ids = bulk_delete_reports(db, **_bulk_filters(body))
+    return {"success": True, "count": len(item_ids), "item_ids": item_ids}
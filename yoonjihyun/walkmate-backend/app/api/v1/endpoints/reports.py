@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from uuid import uuid4, UUID
 import shutil
 import os
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.crud import report as crud_report
 
 router = APIRouter()
@@ -24,7 +26,7 @@ async def create_report(
     risk_level: int = Form(...),
     description: str = Form(None),
     file: UploadFile = File(...),  # 앱에서 보낸 이미지 파일
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
         # 1. 고유한 파일명 생성 (중복 방지)
@@ -50,9 +52,9 @@ async def create_report(
             await file.seek(0)
             content = await file.read()
             
-            # S3 업로드
+            # S3 업로드 (boto3는 동기 호출이므로 스레드풀에서 실행해 이벤트 루프를 막지 않음)
             s3_key = f"uploads/{saved_filename}"
-            full_s3_url = upload_image_to_s3(content, s3_key, file.content_type)
+            full_s3_url = await run_in_threadpool(upload_image_to_s3, content, s3_key, file.content_type)
             image_url = full_s3_url
             print(f"✅ S3 Upload Success: {image_url}")
 
@@ -60,8 +62,8 @@ async def create_report(
             print(f"❌ S3 Upload Failed: {s3_error}")
             raise HTTPException(status_code=500, detail=f"S3 Upload Failed: {str(s3_error)}")
 
-        # 3. DB에 정보 저장 (CRUD 호출)
-        report = crud_report.create_report(
+        # 3. DB에 정보 저장 (CRUD 호출, async 세션)
+        report = await crud_report.create_report_async(
             db=db,
             item_id=UUID(item_id),
             user_id=UUID(user_id),
@@ -84,4 +86,40 @@ async def create_report(
         # 에러 내용을 더 자세히 보기 위해 출력
         import traceback
         traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/map", summary="🗺️ 지도 마커 조회 (영역 / 반경)")
+def get_map_markers(
+    min_lat: float | None = Query(None, ge=-90, le=90),
+    min_lng: float | None = Query(None, ge=-180, le=180),
+    max_lat: float | None = Query(None, ge=-90, le=90),
+    max_lng: float | None = Query(None, ge=-180, le=180),
+    lat: float | None = Query(None, ge=-90, le=90, description="반경 검색 중심 위도"),
+    lng: float | None = Query(None, ge=-180, le=180, description="반경 검색 중심 경도"),
+    radius_m: float = Query(500, gt=0, le=20000, description="반경(m), lat/lng 와 함께 사용"),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+):
+    """
+    - min_lat/min_lng/max_lat/max_lng 를 모두 주면 화면 영역(bbox) 안의 마커 (최신순)
+    - lat/lng 를 주면 반경 radius_m 안의 마커 (가까운 순, distance_m 포함)
+    - 둘 다 없으면 최신 마커 limit 개
+    """
+    bbox = (min_lat, min_lng, max_lat, max_lng)
+    if any(v is not None for v in bbox):
+        if any(v is None for v in bbox):
+            raise HTTPException(status_code=400, detail="min_lat, min_lng, max_lat, max_lng must be given together")
+        if min_lat > max_lat or min_lng > max_lng:
+            raise HTTPException(status_code=400, detail="min values must be less than max values")
+        data = crud_report.get_map_markers_in_bbox(
+            db, min_lat=min_lat, min_lng=min_lng, max_lat=max_lat, max_lng=max_lng, limit=limit
+        )
+    elif lat is not None or lng is not None:
+        if lat is None or lng is None:
+            raise HTTPException(status_code=400, detail="lat and lng must be given together")
+        data = crud_report.get_map_markers_nearby(db, latitude=lat, longitude=lng, radius_m=radius_m, limit=limit)
+    else:
+        data = crud_report.get_map_markers(db, limit=limit)
+
+    return {"count": len(data), "data": data}
@@ -12,3 +12,15 @@ S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME", "")
 S3_PUBLIC_BASE_URL = os.getenv("S3_PUBLIC_BASE_URL", "")
 
 CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "").split(",") if o.strip()]
+
+# DB 커넥션 풀 설정 (sync / async 엔진 공통)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))      # 풀이 가득 찼을 때 대기 시간(초)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))      # 커넥션 재생성 주기(초)
+# asyncpg prepared statement 캐시 크기 (Supabase pooler 등 pgbouncer transaction 모드면 0)
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+# 보관(archive): 처리 완료/숨김 후 N일이 지난 신고를 reports_archive 로 이동
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
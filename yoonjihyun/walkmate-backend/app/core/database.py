@@ -1,16 +1,82 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from app.core.config import DATABASE_URL
+from app.core.config import (
+    DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_STATEMENT_CACHE_SIZE,
+)
 
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL is missing")
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+
+def to_async_url(url: str) -> str:
+    """
+    postgresql:// (psycopg2) 주소를 asyncpg 드라이버 주소로 변환합니다.
+    asyncpg는 libpq 옵션 sslmode를 모르므로 ssl로 바꿔 전달합니다.
+    """
+    parts = urlsplit(url)
+    scheme = "postgresql+asyncpg"
+    query = []
+    for key, value in parse_qsl(parts.query):
+        if key == "sslmode":
+            key = "ssl"
+        query.append((key, value))
+    query.append(("prepared_statement_cache_size", str(DB_STATEMENT_CACHE_SIZE)))
+    return urlunsplit((scheme, parts.netloc, parts.path, urlencode(query), parts.fragment))
+
+
+POOL_OPTIONS = dict(
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+)
+
+# 1. 동기 엔진 (관리자 API, migrate.py 등 def 라우트 -> 스레드풀에서 실행)
+engine = create_engine(DATABASE_URL, **POOL_OPTIONS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 2. 비동기 엔진 (async def 라우트 전용, 이벤트 루프를 막지 않음)
+async_engine = create_async_engine(
+    to_async_url(DATABASE_URL),
+    connect_args={"statement_cache_size": DB_STATEMENT_CACHE_SIZE},
+    **POOL_OPTIONS,
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# 3. 풀 사용률 (모니터링용)
+def _pool_stats(pool) -> dict:
+    capacity = pool.size() + DB_MAX_OVERFLOW
+    in_use = pool.checkedout()
+    return {
+        "size": pool.size(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "checked_out": in_use,
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "utilization": round(in_use / capacity, 3) if capacity else 0.0,
+    }
+
+
+def pool_status() -> dict:
+    return {
+        "sync": _pool_stats(engine.pool),
+        "async": _pool_stats(async_engine.sync_engine.pool),
+    }
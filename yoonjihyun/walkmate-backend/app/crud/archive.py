@@ -0,0 +1,112 @@
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# ------------------------------------------------------------------
+# 보관(archive) - 오래된 처리 완료(done) / 숨김(Hidden) 신고를
+# public.reports (hot) -> public.reports_archive (월별 파티션, cold) 로 이동
+# 테이블 정의: migrations/0005_reports_archive.sql, 실행: archive.py
+# ------------------------------------------------------------------
+def _month_start(d: date) -> date:
+    return d.replace(day=1)
+
+
+def _next_month(d: date) -> date:
+    return date(d.year + (d.month == 12), d.month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"reports_archive_{month:%Y_%m}"
+
+
+# ------------------------------------------------------------------
+# 1. 옮길 대상이 있는 월의 파티션 미리 생성
+# ------------------------------------------------------------------
+def pending_months(db: Session, cutoff: datetime) -> list[date]:
+    q = text("""
+        SELECT DISTINCT date_trunc('month', created_at)::date AS month
+        FROM public.reports
+        WHERE status IN ('done', 'Hidden') AND created_at < :cutoff
+        ORDER BY month
+    """)
+    return list(db.execute(q, {"cutoff": cutoff}).scalars().all())
+
+
+def ensure_partition(db: Session, month: date) -> str:
+    month = _month_start(month)
+    name = partition_name(month)
+    db.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS public.{name}
+        PARTITION OF public.reports_archive
+        FOR VALUES FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')
+    """))
+    db.commit()
+    return name
+
+
+# ------------------------------------------------------------------
+# 2. 배치 이동 (DELETE ... RETURNING -> INSERT 를 한 문장으로, 배치마다 커밋)
+# ------------------------------------------------------------------
+def _report_columns(db: Session) -> list[str]:
+    q = text("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = 'reports'
+        ORDER BY ordinal_position
+    """)
+    return list(db.execute(q).scalars().all())
+
+
+def move_batch(db: Session, cutoff: datetime, batch_size: int, columns: list[str] | None = None) -> list:
+    """
+    cutoff 이전에 생성된 처리 완료/숨김 신고를 최대 batch_size 건 옮기고 옮긴 행의 created_at 목록을 반환합니다.
+    SKIP LOCKED 로 앱이 수정 중인 행은 건너뛰므로 운영 중에도 실행할 수 있습니다.
+    """
+    cols = ", ".join(columns or _report_columns(db))
+    q = text(f"""
+        WITH moved AS (
+            DELETE FROM public.reports
+            WHERE item_id IN (
+                SELECT item_id FROM public.reports
+                WHERE status IN ('done', 'Hidden') AND created_at < :cutoff
+                ORDER BY created_at
+                LIMIT :batch_size
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING {cols}
+        )
+        INSERT INTO public.reports_archive ({cols})
+        SELECT {cols} FROM moved
+        RETURNING created_at
+    """)
+
+    try:
+        rows = db.execute(q, {"cutoff": cutoff, "batch_size": batch_size}).scalars().all()
+        db.commit()
+        return rows
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Archive Move Error: {e}")
+        raise e
+
+
+# ------------------------------------------------------------------
+# 3. 월 파티션 -> Parquet (선택, pyarrow 필요)
+# ------------------------------------------------------------------
+def partition_rows(db: Session, month: date):
+    q = text(f"""
+        SELECT *, ST_Y(location) AS latitude, ST_X(location) AS longitude
+        FROM public.{partition_name(month)}
+        ORDER BY created_at
+    """)
+    for row in db.execute(q).mappings():
+        out = {}
+        for key, value in row.items():
+            if key == "location":
+                continue
+            if isinstance(value, Decimal):
+                value = float(value)
+            elif not isinstance(value, (str, int, float, bool, date, type(None))):
+                value = str(value)  # uuid 등 pyarrow가 모르는 타입은 문자열로
+            out[key] = value
+        yield out
@@ -1,47 +1,47 @@
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from uuid import UUID
+from datetime import datetime
 
 # ------------------------------------------------------------------
 # 1. 신고 생성 (Create)
 # ------------------------------------------------------------------
-def create_report(
-    db: Session,
+CREATE_REPORT_SQL = text("""
+    INSERT INTO public.reports
+        (item_id, location, device_id, hazard_type, risk_level, image_url, description)
+    VALUES
+        (
+            :item_id,
+            ST_SetSRID(ST_MakePoint(:longitude, :latitude), 4326),
+            :device_id,
+            :hazard_type,
+            :risk_level,
+            :image_url,
+            :description
+        )
+    RETURNING
+        item_id,
+        hazard_type,
+        risk_level,
+        image_url,
+        status,
+        created_at
+""")
+
+
+def _create_report_params(
     *,
     item_id: UUID,
-    user_id: UUID,         # API user_id (UUID)
+    user_id: UUID,
     latitude: float,
     longitude: float,
     hazard_type: str,
     risk_level: int,
     image_url: str,
     description: str | None
-):
-    # SQL 쿼리 작성 (PostGIS 함수 사용)
-    q = text("""
-        INSERT INTO public.reports
-            (item_id, location, device_id, hazard_type, risk_level, image_url, description)
-        VALUES
-            (
-                :item_id,
-                ST_SetSRID(ST_MakePoint(:longitude, :latitude), 4326),
-                :device_id,
-                :hazard_type,
-                :risk_level,
-                :image_url,
-                :description
-            )
-        RETURNING
-            item_id,
-            hazard_type,
-            risk_level,
-            image_url,
-            status,
-            created_at
-    """)
-
-    # 파라미터 바인딩 및 실행
-    params = {
+) -> dict:
+    return {
         "item_id": str(item_id),
         "device_id": str(user_id),  # DB 컬럼명 device_id에 user_id 저장
         "latitude": latitude,
@@ -52,9 +52,13 @@ def create_report(
         "description": description or "" # None이면 빈 문자열로 처리
     }
 
+
+def create_report(db: Session, **fields):
+    params = _create_report_params(**fields)
+
     try:
         # execute() 실행 후 .mappings().first()로 결과 가져오기
-        result = db.execute(q, params)
+        result = db.execute(CREATE_REPORT_SQL, params)
         row = result.mappings().first()
         db.commit()
         return row
@@ -64,30 +68,105 @@ def create_report(
         raise e
 
 
+# 비동기 버전 (async 라우트용, AsyncSession)
+async def create_report_async(db: AsyncSession, **fields):
+    params = _create_report_params(**fields)
+
+    try:
+        result = await db.execute(CREATE_REPORT_SQL, params)
+        row = result.mappings().first()
+        await db.commit()
+        return row
+    except Exception as e:
+        await db.rollback()
+        print(f"❌ DB Insert Error: {e}")
+        raise e
+
+
 # ------------------------------------------------------------------
 # 2. 지도 마커 조회 (Read - Map)
 # ------------------------------------------------------------------
-def get_map_markers(db: Session):
-    q = text("""
-        SELECT
-            item_id,
-            ST_Y(location) as latitude,
-            ST_X(location) as longitude,
-            hazard_type,
-            risk_level,
-            status
-        FROM public.reports
-        WHERE status != 'Hidden'
-        ORDER BY created_at DESC
-    """)
-    return db.execute(q).mappings().all()
+MAP_MARKER_COLUMNS = """
+    item_id,
+    ST_Y(location) as latitude,
+    ST_X(location) as longitude,
+    hazard_type,
+    risk_level,
+    status
+"""
+
+# 반경 검색 기준점 (geography 로 변환해야 미터 단위 거리 계산)
+_CENTER_GEOG = "ST_SetSRID(ST_MakePoint(:longitude, :latitude), 4326)::geography"
+
+# bbox: location && envelope -> GiST(location) 인덱스 사용
+MAP_MARKERS_BBOX_SQL = text(f"""
+    SELECT {MAP_MARKER_COLUMNS}
+    FROM public.reports
+    WHERE location && ST_MakeEnvelope(:min_lng, :min_lat, :max_lng, :max_lat, 4326)
+      AND status != 'Hidden'
+    ORDER BY created_at DESC
+    LIMIT :limit
+""")
+
+# 반경: ST_DWithin(geography) + KNN(<->) 정렬 -> GiST((location::geography)) 인덱스 사용
+MAP_MARKERS_NEARBY_SQL = text(f"""
+    SELECT {MAP_MARKER_COLUMNS},
+        ST_Distance(location::geography, {_CENTER_GEOG}) as distance_m
+    FROM public.reports
+    WHERE ST_DWithin(location::geography, {_CENTER_GEOG}, :radius_m)
+      AND status != 'Hidden'
+    ORDER BY location::geography <-> {_CENTER_GEOG}
+    LIMIT :limit
+""")
+
+
+# 최신순: status != 'Hidden' ORDER BY created_at DESC -> reports_created_at_visible (부분 인덱스)
+MAP_MARKERS_LATEST_SQL = text(f"""
+    SELECT {MAP_MARKER_COLUMNS}
+    FROM public.reports
+    WHERE status != 'Hidden'
+    ORDER BY created_at DESC
+    LIMIT :limit
+""")
+
+
+def get_map_markers(db: Session, limit: int = 1000):
+    return db.execute(MAP_MARKERS_LATEST_SQL, {"limit": limit}).mappings().all()
+
+
+# 지도 화면 영역(bbox) 안의 마커 (최신순)
+def get_map_markers_in_bbox(
+    db: Session, *, min_lat: float, min_lng: float, max_lat: float, max_lng: float, limit: int = 1000
+):
+    params = {"min_lat": min_lat, "min_lng": min_lng, "max_lat": max_lat, "max_lng": max_lng, "limit": limit}
+    return db.execute(MAP_MARKERS_BBOX_SQL, params).mappings().all()
+
+
+# 특정 지점 반경(m) 안의 마커 (가까운 순)
+def get_map_markers_nearby(db: Session, *, latitude: float, longitude: float, radius_m: float, limit: int = 200):
+    params = {"latitude": latitude, "longitude": longitude, "radius_m": radius_m, "limit": limit}
+    return db.execute(MAP_MARKERS_NEARBY_SQL, params).mappings().all()
 
 
 # ------------------------------------------------------------------
 # 3. 전체 신고 개수 조회 (Read - Count)
 # ------------------------------------------------------------------
-def count_reports(db: Session) -> int:
-    q = text("SELECT count(*) as cnt FROM public.reports WHERE status != 'Hidden'")
+_ADMIN_SOURCE_COLUMNS = "item_id, hazard_type, image_url, description, status, created_at, risk_level, device_id, location"
+
+
+def _reports_source(include_archived: bool) -> str:
+    # include_archived 이면 보관 테이블(reports_archive, archive.py 참고)까지 합쳐서 조회
+    if not include_archived:
+        return "(SELECT *, false AS archived FROM public.reports) AS r"
+    return f"""(
+        SELECT {_ADMIN_SOURCE_COLUMNS}, false AS archived FROM public.reports
+        UNION ALL
+        SELECT {_ADMIN_SOURCE_COLUMNS}, true AS archived FROM public.reports_archive
+    ) AS r"""
+
+
+def count_reports(db: Session, include_archived: bool = False) -> int:
+    q = text(f"SELECT count(*) as cnt FROM {_reports_source(include_archived)} WHERE status != 'Hidden'")
     result = db.execute(q).mappings().first()
     return int(result["cnt"]) if result else 0
 
@@ -96,8 +175,8 @@ def count_reports(db: Session) -> int:
 # 4. 관리자용 목록 조회 (Read - Admin List)
 # ★ 실시간 모니터링 페이지에서 사용하는 함수입니다.
 # ------------------------------------------------------------------
-def list_reports_admin(db: Session, skip: int, limit: int):
-    q = text("""
+def admin_list_sql(include_archived: bool = False):
+    return text(f"""
         SELECT
             item_id,
             hazard_type,
@@ -108,16 +187,19 @@ def list_reports_admin(db: Session, skip: int, limit: int):
             risk_level,
             device_id,
             ST_Y(location) as latitude,
-            ST_X(location) as longitude
-        FROM public.reports
+            ST_X(location) as longitude,
+            archived
+        FROM {_reports_source(include_archived)}
         WHERE status != 'Hidden'
         ORDER BY created_at DESC
         OFFSET :skip
         LIMIT :limit
     """)
 
+
+def list_reports_admin(db: Session, skip: int, limit: int, include_archived: bool = False):
     params = {"skip": skip, "limit": limit}
-    return db.execute(q, params).mappings().all()
+    return db.execute(admin_list_sql(include_archived), params).mappings().all()
 
 
 # ------------------------------------------------------------------
@@ -148,7 +230,7 @@ def patch_status(db: Session, item_id: UUID, status: str):
 def delete_report(db: Session, item_id: UUID):
     q = text("""
         UPDATE public.reports
-        SET status = 'Hidden'
+        SET status = 'Hidden', deleted_at = now()
         WHERE item_id = :item_id
         RETURNING item_id
     """)
@@ -162,4 +244,69 @@ def delete_report(db: Session, item_id: UUID):
     except Exception as e:
         db.rollback()
         print(f"❌ DB Delete Error: {e}")
-        raise e
\ No newline at end of file
+        raise e
+
+
+# ------------------------------------------------------------------
+# 7. 일괄 상태 변경 / 일괄 삭제 (Bulk)
+# item_id 목록 또는 필터(bbox / hazard_type / older_than) 조건으로 한 번의 UPDATE 실행
+# ------------------------------------------------------------------
+def _bulk_where(
+    item_ids: list[UUID] | None,
+    bbox: tuple[float, float, float, float] | None,
+    hazard_type: str | None,
+    older_than: datetime | None,
+) -> tuple[str, dict]:
+    clauses = ["status != 'Hidden'"]
+    params = {}
+    if item_ids:
+        clauses.append("item_id = ANY(CAST(:item_ids AS uuid[]))")
+        params["item_ids"] = [str(i) for i in item_ids]
+    if bbox:
+        clauses.append("location && ST_MakeEnvelope(:min_lng, :min_lat, :max_lng, :max_lat, 4326)")
+        params.update(dict(zip(("min_lat", "min_lng", "max_lat", "max_lng"), bbox)))
+    if hazard_type:
+        clauses.append("hazard_type = :hazard_type")
+        params["hazard_type"] = hazard_type
+    if older_than:
+        clauses.append("created_at < :older_than")
+        params["older_than"] = older_than
+    return " AND ".join(clauses), params
+
+
+def bulk_patch_status(db: Session, status: str, **filters) -> list:
+    where, params = _bulk_where(**filters)
+    q = text(f"""
+        UPDATE public.reports
+        SET status = :status
+        WHERE {where} AND status != :status
+        RETURNING item_id
+    """)
+
+    try:
+        rows = db.execute(q, {**params, "status": status}).scalars().all()
+        db.commit()
+        return rows
+    except Exception as e:
+        db.rollback()
+        print(f"❌ DB Bulk Update Error: {e}")
+        raise e
+
+
+def bulk_delete_reports(db: Session, **filters) -> list:
+    where, params = _bulk_where(**filters)
+    q = text(f"""
+        UPDATE public.reports
+        SET status = 'Hidden', deleted_at = now()
+        WHERE {where}
+        RETURNING item_id
+    """)
+
+    try:
+        rows = db.execute(q, params).scalars().all()
+        db.commit()
+        return rows
+    except Exception as e:
+        db.rollback()
+        print(f"❌ DB Bulk Delete Error: {e}")
+        raise e
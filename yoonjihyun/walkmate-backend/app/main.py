@@ -4,6 +4,7 @@ from fastapi.middleware.cors import CORSMiddleware
 import os # ★ [추가 2] 폴더 생성용
 
 from app.core.config import CORS_ORIGINS
+from app.core.database import async_engine, pool_status
 from app.api.v1.endpoints.reports import router as reports_router
 from app.api.v1.endpoints.admin import router as admin_router
 
@@ -25,6 +26,15 @@ app.add_middleware(
 def health():
     return {"ok": True}
 
+# DB 커넥션 풀 사용률 (checked_out / (pool_size + max_overflow))
+@app.get("/health/db-pool")
+def db_pool():
+    return pool_status()
+
+@app.on_event("shutdown")
+async def close_db():
+    await async_engine.dispose()
+
 app.include_router(reports_router, prefix="/api/v1/reports")
 app.include_router(admin_router, prefix="/api/v1")
 
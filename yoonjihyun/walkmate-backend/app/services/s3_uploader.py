@@ -1,3 +1,5 @@
+import threading
+
 import boto3
 from botocore.exceptions import ClientError
 from app.core.config import (
@@ -5,13 +7,23 @@ from app.core.config import (
     S3_BUCKET_NAME, S3_PUBLIC_BASE_URL
 )
 
+_s3 = None
+_s3_lock = threading.Lock()
+
 def _client():
-    return boto3.client(
-        "s3",
-        region_name=AWS_REGION,
-        aws_access_key_id=AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-    )
+    # 업로드가 스레드풀에서 동시에 실행되므로 클라이언트는 한 번만 생성해 공유
+    # (boto3 client는 스레드 안전하지만, 생성 과정의 기본 Session은 그렇지 않음)
+    global _s3
+    if _s3 is None:
+        with _s3_lock:
+            if _s3 is None:
+                _s3 = boto3.client(
+                    "s3",
+                    region_name=AWS_REGION,
+                    aws_access_key_id=AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+                )
+    return _s3
 
 def upload_image_to_s3(file_bytes: bytes, key: str, content_type: str) -> str:
     if not S3_BUCKET_NAME:
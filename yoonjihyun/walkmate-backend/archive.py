@@ -0,0 +1,91 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.core.config import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE
+from app.core.database import SessionLocal, engine
+from app.crud import archive as crud_archive
+
+# 오래된 처리 완료(done) / 숨김(Hidden) 신고를 reports -> reports_archive(월별 파티션)로 옮깁니다.
+# hot 테이블(reports)을 작게 유지해 지도/관리자 쿼리와 인덱스가 커지지 않도록 하는 배치 작업입니다.
+# (cron 등으로 하루 한 번 실행 권장, 먼저 python migrate.py 로 0005 마이그레이션 적용 필요)
+#
+#   python archive.py                         ARCHIVE_AFTER_DAYS(기본 90일) 지난 신고 이동
+#   python archive.py --days 30 --batch-size 5000
+#   python archive.py --parquet-dir archive/  이동한 월 파티션을 zstd Parquet 파일로도 저장 (pyarrow 필요)
+#   python archive.py --dry-run               옮길 대상 월만 출력
+
+
+def write_parquet(db, month, out_dir: str) -> str:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        sys.exit("❌ Parquet 저장에는 pyarrow가 필요합니다: pip install pyarrow")
+
+    rows = list(crud_archive.partition_rows(db, month))
+    path = os.path.join(out_dir, f"{crud_archive.partition_name(month)}.parquet")
+    tmp = path + ".tmp"
+    # 같은 달을 다시 옮기면 파일 전체를 새로 씀 (임시 파일 -> rename 으로 원자적 교체)
+    pq.write_table(pa.Table.from_pylist(rows), tmp, compression="zstd")
+    os.replace(tmp, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WalkMate 신고 보관(archive) 작업")
+    parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS, help="생성 후 N일 지난 처리 완료/숨김 신고 이동")
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--pause", type=float, default=0.1, help="배치 사이 대기(초), 운영 부하 완화용")
+    parser.add_argument("--parquet-dir", default=None, help="지정 시 이동한 월 파티션을 Parquet로 저장")
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--no-vacuum", action="store_true", help="이동 후 VACUUM ANALYZE reports 생략")
+    args = parser.parse_args()
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=args.days)
+    db = SessionLocal()
+    try:
+        months = crud_archive.pending_months(db, cutoff)
+        db.rollback()
+        print(f"📦 cutoff={cutoff:%Y-%m-%d}, 대상 월: {[m.strftime('%Y-%m') for m in months] or '없음'}")
+        if args.dry_run or not months:
+            return
+
+        for month in months:
+            crud_archive.ensure_partition(db, month)
+
+        columns = crud_archive._report_columns(db)
+        total = 0
+        started = time.perf_counter()
+        while True:
+            moved = crud_archive.move_batch(db, cutoff, args.batch_size, columns)
+            if not moved:
+                break
+            total += len(moved)
+            print(f"   ↳ {total} rows 이동 ({total / (time.perf_counter() - started):.0f} rows/s)")
+            time.sleep(args.pause)
+
+        print(f"✅ {total} rows 보관 완료 ({time.perf_counter() - started:.1f}s)")
+
+        if args.parquet_dir and total:
+            os.makedirs(args.parquet_dir, exist_ok=True)
+            for month in months:
+                print(f"💾 {write_parquet(db, month, args.parquet_dir)}")
+            db.rollback()
+    finally:
+        db.close()
+
+    if total and not args.no_vacuum:
+        # 삭제된 행 공간을 바로 재사용하고 플래너 통계를 갱신 (VACUUM 은 트랜잭션 밖에서 실행)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM (ANALYZE) public.reports"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+
+from app.core.database import SessionLocal
+from app.crud.report import (
+    MAP_MARKERS_BBOX_SQL,
+    MAP_MARKERS_LATEST_SQL,
+    MAP_MARKERS_NEARBY_SQL,
+    admin_list_sql,
+)
+
+# 지도 마커 쿼리 실행 계획 점검 (인덱스 회귀 확인용)
+# 쿼리나 인덱스 정의를 바꾼 뒤 실행해서, 기대한 인덱스를 여전히 쓸 수 있는지 확인합니다.
+# crud 가 실제로 보내는 SQL 객체를 그대로 EXPLAIN 합니다. (점검용으로 조건을 덧붙이지 않음)
+# 테이블이 작으면 플래너가 순차 스캔을 고르므로 enable_seqscan 을 끄고 "사용 가능 여부"를 봅니다.
+#   python explain_check.py          (실패 시 종료 코드 1)
+#   pytest tests/test_explain_check.py (DB 에 연결할 수 없으면 skip)
+
+CASES = [
+    (
+        "bbox (location && envelope)",
+        MAP_MARKERS_BBOX_SQL,
+        {"min_lat": 37.28, "min_lng": 127.03, "max_lat": 37.30, "max_lng": 127.06, "limit": 500},
+        "reports_location_gist",
+    ),
+    (
+        "radius (ST_DWithin geography + KNN)",
+        MAP_MARKERS_NEARBY_SQL,
+        {"latitude": 37.2887, "longitude": 127.0474, "radius_m": 500, "limit": 200},
+        "reports_location_geog_gist",
+    ),
+    (
+        "map latest (get_map_markers)",
+        MAP_MARKERS_LATEST_SQL,
+        {"limit": 1000},
+        "reports_created_at_visible",
+    ),
+    (
+        "admin list (list_reports_admin)",
+        admin_list_sql(include_archived=False),
+        {"skip": 0, "limit": 50},
+        "reports_created_at_visible",
+    ),
+]
+
+
+def index_names(plan: dict) -> set[str]:
+    names = set()
+    if "Index Name" in plan:
+        names.add(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        names |= index_names(child)
+    return names
+
+
+def explain(db, query, params) -> dict:
+    compiled = text(f"EXPLAIN (FORMAT JSON) {query.text}")
+    row = db.execute(compiled, params).scalar()
+    return row[0]["Plan"]
+
+
+def main() -> int:
+    db = SessionLocal()
+    failed = 0
+    try:
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        for name, query, params, expected in CASES:
+            used = index_names(explain(db, query, params))
+            if expected in used:
+                print(f"✅ {name}: {expected}")
+            else:
+                failed += 1
+                print(f"❌ {name}: expected {expected}, plan uses {sorted(used) or 'no index'}")
+    finally:
+        db.rollback()
+        db.close()
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,16 +2,290 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from app.core.database import SessionLocal
+import argparse
+import hashlib
+import importlib.util
+import re
+import time
+
 from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.database import engine
+
+# 버전 관리 마이그레이션 실행기
+#
+# migrations/ 폴더의 NNNN_이름.sql / NNNN_이름.py 파일을 번호 순서대로 한 번씩 적용하고
+# public.schema_migrations 테이블에 기록합니다.
+#
+# - 일반 SQL 파일: 파일 전체를 하나의 트랜잭션으로 실행 (실패 시 전부 롤백)
+# - CONCURRENTLY 가 들어간 SQL 파일: 트랜잭션 없이(autocommit) 한 문장씩 실행
+#   (실패로 남은 INVALID 인덱스는 다시 만들기 전에 자동으로 DROP)
+# - .py 파일: up(ctx) 함수 실행. ctx.backfill() 로 작은 배치 단위 UPDATE 가능
+# - 모든 문장에 lock_timeout 을 걸어, 운영 중인 reports 테이블 락을 오래 기다리지 않고 재시도
+#
+#   python migrate.py            미적용 마이그레이션 전부 적용
+#   python migrate.py --status   적용 현황 출력
+#   python migrate.py --target 0002
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+LOCK_TIMEOUT = os.getenv("MIGRATION_LOCK_TIMEOUT", "5s")
+LOCK_RETRIES = int(os.getenv("MIGRATION_LOCK_RETRIES", "5"))
+ADVISORY_LOCK_ID = 7_202_602  # 여러 인스턴스가 동시에 마이그레이션하지 않도록
+
+FILE_RE = re.compile(r"^(\d{4})_([\w-]+)\.(sql|py)$")
+CONCURRENT_INDEX_RE = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", re.IGNORECASE
+)
+
+
+# ------------------------------------------------------------------
+# 1. 마이그레이션 파일 목록
+# ------------------------------------------------------------------
+class Migration:
+    def __init__(self, path: str):
+        match = FILE_RE.match(os.path.basename(path))
+        self.path = path
+        self.version, self.name, self.kind = match.groups()
+        with open(path, "rb") as f:
+            self.source = f.read()
+        self.checksum = hashlib.sha256(self.source).hexdigest()
+
+    @property
+    def sql(self) -> str:
+        return self.source.decode("utf-8")
+
+    @property
+    def needs_autocommit(self) -> bool:
+        if self.kind == "py":
+            return True  # 배치 backfill 은 배치마다 커밋
+        return bool(re.search(r"\bCONCURRENTLY\b", _strip_comments(self.sql), re.IGNORECASE))
+
+
+def discover() -> list[Migration]:
+    migrations = [
+        Migration(os.path.join(MIGRATIONS_DIR, f))
+        for f in sorted(os.listdir(MIGRATIONS_DIR))
+        if FILE_RE.match(f)
+    ]
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration version in {MIGRATIONS_DIR}")
+    return migrations
+
+
+def _strip_comments(sql: str) -> str:
+    return "\n".join(line for line in sql.splitlines() if not line.strip().startswith("--"))
+
+
+def split_statements(sql: str) -> list[str]:
+    # 함수 본문($$) 없는 단순 DDL 전용 분리기
+    return [s.strip() for s in _strip_comments(sql).split(";") if s.strip()]
+
+
+# ------------------------------------------------------------------
+# 2. 실행 도우미
+# ------------------------------------------------------------------
+def _is_lock_timeout(e: Exception) -> bool:
+    return getattr(getattr(e, "orig", None), "pgcode", None) == "55P03"
+
+
+def with_lock_retry(fn, *args):
+    for attempt in range(1, LOCK_RETRIES + 1):
+        try:
+            return fn(*args)
+        except OperationalError as e:
+            if not _is_lock_timeout(e) or attempt == LOCK_RETRIES:
+                raise
+            wait = min(2 ** attempt, 30)
+            print(f"⏳ lock_timeout ({LOCK_TIMEOUT}), {wait}s 후 재시도 ({attempt}/{LOCK_RETRIES})")
+            time.sleep(wait)
+
+
+def drop_invalid_index(conn, statement: str):
+    """CREATE INDEX CONCURRENTLY 가 중간에 실패하면 INVALID 인덱스가 남아 IF NOT EXISTS 를 막으므로 먼저 제거"""
+    match = CONCURRENT_INDEX_RE.search(statement)
+    if not match:
+        return
+    invalid = conn.execute(text("""
+        SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = :name AND NOT i.indisvalid
+    """), {"name": match.group(1)}).first()
+    if invalid:
+        print(f"⚠️ INVALID 인덱스 {match.group(1)} 제거 후 다시 생성")
+        conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {match.group(1)}")
+
+
+def create_concurrently(conn, statement: str):
+    # lock_timeout 으로 실패한 시도도 INVALID 인덱스를 남기므로, 재시도마다 먼저 정리
+    drop_invalid_index(conn, statement)
+    conn.exec_driver_sql(statement)
+
+
+def assert_index_valid(conn, statement: str):
+    """재시도가 끝난 뒤 인덱스가 실제로 VALID 인지 확인 (아니면 기록하지 않고 실패)"""
+    match = CONCURRENT_INDEX_RE.search(statement)
+    if not match:
+        return
+    valid = conn.execute(text("""
+        SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = :name
+    """), {"name": match.group(1)}).scalar()
+    if not valid:
+        raise RuntimeError(f"Index {match.group(1)} is missing or INVALID after CREATE INDEX CONCURRENTLY")
+
+
+class MigrationContext:
+    """.py 마이그레이션의 up(ctx) 에 전달되는 객체 (autocommit 커넥션)"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql: str, params: dict | None = None):
+        return with_lock_retry(lambda: self.conn.execute(text(sql), params or {}))
+
+    def backfill(self, table: str, set_sql: str, where_sql: str, key: str = "item_id",
+                 batch_size: int = 1000, pause: float = 0.05) -> int:
+        """
+        WHERE 조건에 맞는 행을 batch_size 개씩 나눠 UPDATE 합니다. (배치마다 커밋)
+        SKIP LOCKED 로 앱이 잡고 있는 행은 건너뛰었다가 다음 배치에서 처리합니다.
+        where_sql 은 UPDATE 후 거짓이 되는 조건이어야 합니다. (예: deleted_at IS NULL)
+        배치가 0건이어도 잠긴 행만 남았을 수 있으므로, 조건에 맞는 행이 하나도 없을 때만 끝냅니다.
+        """
+        q = text(f"""
+            UPDATE {table} SET {set_sql}
+            WHERE {key} IN (
+                SELECT {key} FROM {table}
+                WHERE {where_sql}
+                LIMIT :batch_size
+                FOR UPDATE SKIP LOCKED
+            )
+        """)
+        remaining = text(f"SELECT 1 FROM {table} WHERE {where_sql} LIMIT 1")
+        total = 0
+        while True:
+            updated = with_lock_retry(lambda: self.conn.execute(q, {"batch_size": batch_size}).rowcount)
+            total += updated
+            if updated:
+                print(f"   ↳ {table}: {total} rows")
+            elif self.conn.execute(remaining).first() is None:
+                break
+            else:
+                print(f"   ↳ {table}: 잠긴 행만 남음, 대기 후 재시도")
+                time.sleep(max(pause, 1.0))
+                continue
+            time.sleep(pause)
+        return total
+
+
+# ------------------------------------------------------------------
+# 3. 적용
+# ------------------------------------------------------------------
+def ensure_tracking_table():
+    with engine.begin() as conn:
+        conn.exec_driver_sql("""
+            CREATE TABLE IF NOT EXISTS public.schema_migrations (
+                version     text PRIMARY KEY,
+                name        text NOT NULL,
+                checksum    text NOT NULL,
+                applied_at  timestamptz NOT NULL DEFAULT now(),
+                duration_ms integer
+            )
+        """)
+
+
+def applied_migrations(conn) -> dict:
+    rows = conn.execute(text("SELECT version, checksum FROM public.schema_migrations")).mappings().all()
+    return {r["version"]: r["checksum"] for r in rows}
+
+
+def record(conn, m: Migration, duration_ms: int):
+    conn.execute(text("""
+        INSERT INTO public.schema_migrations (version, name, checksum, duration_ms)
+        VALUES (:version, :name, :checksum, :duration_ms)
+    """), {"version": m.version, "name": m.name, "checksum": m.checksum, "duration_ms": duration_ms})
+
+
+def run_transactional(m: Migration, duration_start: float):
+    def attempt():
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+            for statement in split_statements(m.sql):
+                conn.exec_driver_sql(statement)
+            record(conn, m, int((time.perf_counter() - duration_start) * 1000))
+
+    with_lock_retry(attempt)
+
+
+def run_autocommit(m: Migration, duration_start: float):
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+        if m.kind == "py":
+            spec = importlib.util.spec_from_file_location(f"migration_{m.version}", m.path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            module.up(MigrationContext(conn))
+        else:
+            for statement in split_statements(m.sql):
+                with_lock_retry(create_concurrently, conn, statement)
+                assert_index_valid(conn, statement)
+        record(conn, m, int((time.perf_counter() - duration_start) * 1000))
+
+
+def migrate(target: str | None = None):
+    ensure_tracking_table()
+    with engine.connect() as lock_conn:
+        if not lock_conn.execute(text("SELECT pg_try_advisory_lock(:id)"), {"id": ADVISORY_LOCK_ID}).scalar():
+            print("❌ 다른 마이그레이션이 실행 중입니다.")
+            return 1
+        try:
+            applied = applied_migrations(lock_conn)
+            lock_conn.commit()
+            pending = 0
+            for m in discover():
+                if target and m.version > target:
+                    break
+                if m.version in applied:
+                    if applied[m.version] != m.checksum:
+                        print(f"⚠️ {m.version}_{m.name}: 적용 후 파일이 변경됨 (재적용하지 않음)")
+                    continue
+
+                pending += 1
+                mode = "autocommit" if m.needs_autocommit else "transaction"
+                print(f"▶️ {m.version}_{m.name} ({mode})")
+                start = time.perf_counter()
+                if m.needs_autocommit:
+                    run_autocommit(m, start)
+                else:
+                    run_transactional(m, start)
+                print(f"✅ {m.version}_{m.name} ({time.perf_counter() - start:.1f}s)")
+
+            if not pending:
+                print("✅ 이미 최신 상태입니다.")
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": ADVISORY_LOCK_ID})
+            lock_conn.commit()
+    return 0
+
+
+def status():
+    ensure_tracking_table()
+    with engine.connect() as conn:
+        applied = applied_migrations(conn)
+    for m in discover():
+        if m.version not in applied:
+            mark = "⬜ pending"
+        elif applied[m.version] != m.checksum:
+            mark = "⚠️ changed"
+        else:
+            mark = "✅ applied"
+        print(f"{mark:<12} {m.version}_{m.name}.{m.kind}")
+    return 0
+
 
-db = SessionLocal()
-try:
-    db.execute(text("ALTER TABLE public.reports ADD COLUMN deleted_at TIMESTAMP WITH TIME ZONE NULL;"))
-    db.commit()
-    print("Column added successfully.")
-except Exception as e:
-    db.rollback()
-    print("Failed or already added:", e)
-finally:
-    db.close()
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="WalkMate DB 마이그레이션")
+    parser.add_argument("--status", action="store_true", help="적용 현황만 출력")
+    parser.add_argument("--target", default=None, help="이 버전까지만 적용 (예: 0002)")
+    args = parser.parse_args()
+    sys.exit(status() if args.status else migrate(args.target))
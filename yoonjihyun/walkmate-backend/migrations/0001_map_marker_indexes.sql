@@ -0,0 +1,20 @@
+-- 지도 마커 조회용 인덱스
+--   - bbox 조회:   location && ST_MakeEnvelope(...)            -> reports_location_gist
+--   - 반경 조회:   ST_DWithin(location::geography, ...) / <->  -> reports_location_geog_gist
+--   - 최신순 목록: status != 'Hidden' ORDER BY created_at DESC -> reports_created_at_visible
+--
+-- CONCURRENTLY 는 트랜잭션 안에서 실행할 수 없으므로 migrate.py 가 autocommit 으로 한 문장씩 적용합니다.
+--   python migrate.py
+-- 적용 후 python explain_check.py (또는 pytest tests/test_explain_check.py) 로 실제 쿼리가 인덱스를 타는지 확인합니다.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS reports_location_gist
+    ON public.reports USING GIST (location);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS reports_location_geog_gist
+    ON public.reports USING GIST ((location::geography));
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS reports_created_at_visible
+    ON public.reports (created_at DESC)
+    WHERE status <> 'Hidden';
+
+ANALYZE public.reports;
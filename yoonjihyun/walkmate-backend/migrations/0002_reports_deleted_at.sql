@@ -0,0 +1,3 @@
+-- 숨김(soft delete) 시각 기록용 컬럼 (기존 일회성 migrate.py 스크립트가 하던 작업)
+-- NULL 허용 + 기본값 없음 -> 테이블 재작성 없이 메타데이터만 변경
+ALTER TABLE public.reports ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP WITH TIME ZONE NULL;
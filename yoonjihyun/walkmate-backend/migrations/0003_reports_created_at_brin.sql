@@ -0,0 +1,4 @@
+-- created_at 범위 조회(기간별 집계, 보관 이관 등)용 BRIN 인덱스
+-- 신고는 시간 순서대로 쌓이므로 B-tree 대비 수백 분의 1 크기로 범위 스캔을 줄일 수 있음
+CREATE INDEX CONCURRENTLY IF NOT EXISTS reports_created_at_brin
+    ON public.reports USING BRIN (created_at) WITH (pages_per_range = 32);
@@ -0,0 +1,12 @@
+# 이미 숨김 처리된 신고에 deleted_at 채우기
+# 실제 숨김 시각은 남아 있지 않으므로 마이그레이션 시각으로 기록합니다.
+# 배치마다 커밋하므로 운영 중인 reports 테이블을 오래 잠그지 않습니다.
+
+
+def up(ctx):
+    ctx.backfill(
+        table="public.reports",
+        set_sql="deleted_at = now()",
+        where_sql="status = 'Hidden' AND deleted_at IS NULL",
+        batch_size=1000,
+    )
@@ -0,0 +1,13 @@
+-- 처리 완료(done) / 숨김(Hidden) 된 오래된 신고를 옮겨 둘 보관 테이블 (created_at 기준 월별 파티션)
+-- 월 파티션(reports_archive_YYYY_MM)은 archive.py 가 옮길 데이터에 맞춰 필요할 때 생성합니다.
+-- reports 에 컬럼이 추가되면 이 테이블에도 같은 컬럼을 추가하는 마이그레이션을 함께 작성하세요.
+
+CREATE TABLE IF NOT EXISTS public.reports_archive (
+    LIKE public.reports INCLUDING DEFAULTS,
+    archived_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+) PARTITION BY RANGE (created_at);
+
+-- 파티션 테이블 인덱스 (각 월 파티션에 자동으로 생성됨)
+CREATE INDEX IF NOT EXISTS reports_archive_item_id ON public.reports_archive (item_id);
+CREATE INDEX IF NOT EXISTS reports_archive_created_at ON public.reports_archive (created_at DESC);
+CREATE INDEX IF NOT EXISTS reports_archive_location_gist ON public.reports_archive USING GIST (location);
@@ -0,0 +1,36 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.endpoints.admin import BulkFilter, BulkRequest, _bulk_filters
+
+
+def test_item_ids_only():
+    ids = [uuid.uuid4(), uuid.uuid4()]
+    assert _bulk_filters(BulkRequest(item_ids=ids)) == {
+        "item_ids": ids, "bbox": None, "hazard_type": None, "older_than": None,
+    }
+
+
+def test_filter_conditions():
+    older = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    body = BulkRequest(filter=BulkFilter(min_lat=37.2, min_lng=127.0, max_lat=37.3, max_lng=127.1,
+                                         hazard_type="킥보드", older_than=older))
+    assert _bulk_filters(body) == {
+        "item_ids": None, "bbox": (37.2, 127.0, 37.3, 127.1), "hazard_type": "킥보드", "older_than": older,
+    }
+
+
+@pytest.mark.parametrize("body", [
+    BulkRequest(),                                                        # 둘 다 없음
+    BulkRequest(item_ids=[]),                                             # 빈 목록 = 없음
+    BulkRequest(item_ids=[uuid.uuid4()], filter=BulkFilter(hazard_type="볼라드")),  # 둘 다 있음
+    BulkRequest(filter=BulkFilter()),                                     # 조건 없는 필터 -> 전체 테이블
+    BulkRequest(filter=BulkFilter(min_lat=37.2, max_lat=37.3)),           # bbox 일부만
+])
+def test_rejects_ambiguous_or_unbounded_requests(body):
+    with pytest.raises(HTTPException) as exc:
+        _bulk_filters(body)
+    assert exc.value.status_code == 400
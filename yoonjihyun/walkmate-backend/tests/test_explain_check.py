@@ -0,0 +1,31 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core import config
+
+# explain_check.py 와 같은 점검을 pytest 로 실행 (마이그레이션 적용된 DB 필요, 없으면 skip)
+if not config.DATABASE_URL:
+    pytest.skip("DATABASE_URL is not configured", allow_module_level=True)
+
+import explain_check  # noqa: E402
+from app.core.database import SessionLocal  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def db():
+    session = SessionLocal()
+    try:
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+    except OperationalError as e:
+        session.close()
+        pytest.skip(f"database unavailable: {e}")
+    yield session
+    session.rollback()
+    session.close()
+
+
+@pytest.mark.parametrize("name, query, params, expected", explain_check.CASES, ids=[c[0] for c in explain_check.CASES])
+def test_query_can_use_expected_index(db, name, query, params, expected):
+    used = explain_check.index_names(explain_check.explain(db, query, params))
+    assert expected in used, f"{name}: plan uses {sorted(used) or 'no index'}"